@@ -8,11 +8,23 @@ Author: InsureCove Team
 Date: July 8, 2025
 """
 
-from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, status, Query, Path
-from fastapi.responses import JSONResponse, StreamingResponse
-from typing import List, Optional, Dict, Any
+from fastapi import (
+    APIRouter, Depends, File, UploadFile, HTTPException, status, Query, Path, Header,
+    Request, Response, BackgroundTasks
+)
+from fastapi.responses import StreamingResponse, RedirectResponse
+from typing import List, Optional, Dict, Any, Literal, FrozenSet, Annotated
 import uuid
-from datetime import datetime
+from urllib.parse import quote
+
+from app.core.config import settings
+from app.core.exceptions import FileTooLargeError, ValidationError
+from app.core.logging_config import get_logger
+from app.models import DocumentListParams
+from app.utils.response_utils import (
+    ORJSONResponse, decode_cursor, build_next_link_header, etag_matches,
+    format_http_date, not_modified_since
+)
 
 # TODO: Import models
 # from app.models import (
@@ -30,10 +42,34 @@ from datetime import datetime
 
 # TODO: Import core utilities
 # from app.core.exceptions import DocumentNotFoundError, ValidationError
-# from app.core.logging_config import get_logger
 
-router = APIRouter()
-# logger = get_logger(__name__)
+router = APIRouter(default_response_class=ORJSONResponse)
+logger = get_logger(__name__)
+
+# Shared path parameter; the Annotated form is resolved once per route
+DocumentId = Annotated[uuid.UUID, Path(description="Document unique identifier")]
+
+
+def parse_tags(
+    tags: Annotated[Optional[str], Query(description="Comma-separated tags")] = None
+) -> FrozenSet[str]:
+    """Parse a comma-separated tags param into a normalized (stripped, casefolded) set"""
+    if not tags:
+        return frozenset()
+    return frozenset(filter(None, (tag.strip().casefold() for tag in tags.split(","))))
+
+
+def reject_oversized_upload(file: UploadFile) -> None:
+    """
+    Reject an upload on its declared size before any of the body is read.
+    
+    Raises the same FileTooLargeError that iter_upload_chunks raises
+    mid-stream for clients that under-declare, so both paths answer with
+    the same problem response.
+    """
+    max_size = settings.MAX_FILE_SIZE_MB * 1024 * 1024
+    if file.size is not None and file.size > max_size:
+        raise FileTooLargeError(file_size=file.size, max_size=max_size)
 
 
 # ============= DOCUMENT UPLOAD ENDPOINTS =============
@@ -47,9 +83,10 @@ router = APIRouter()
     tags=["documents"]
 )
 async def upload_document(
-    file: UploadFile = File(..., description="Document file to upload"),
-    auto_ocr: bool = Query(True, description="Automatically trigger OCR processing"),
-    tags: Optional[str] = Query(None, description="Comma-separated tags for the document"),
+    background_tasks: BackgroundTasks,
+    file: Annotated[UploadFile, File(description="Document file to upload")],
+    tags: Annotated[FrozenSet[str], Depends(parse_tags)],
+    auto_ocr: Annotated[bool, Query(description="Automatically trigger OCR processing")] = True,
     # current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
@@ -62,11 +99,18 @@ async def upload_document(
     - **Response**: Document metadata with upload confirmation
     """
     
+    reject_oversized_upload(file)
+    
     # TODO: Implement document upload logic
-    # TODO: Validate file type and size
-    # TODO: Store file securely
-    # TODO: Save document metadata
+    # TODO: Replace with DocumentService.upload_document(
+    #           iter_upload_chunks(file, max_size=settings.MAX_FILE_SIZE_MB * 1024 * 1024),
+    #           file.filename, ...,
+    #           file_size=file.size)
+    #       Never `await file.read()` - the upload is streamed to storage in chunks
     # TODO: Trigger OCR if requested
+    # TODO: background_tasks.add_task(DocumentService.generate_thumbnails, document["id"],
+    #           document["storage_key"], document["content_type"]) so thumbnails
+    #       are rendered after the response, never on the GET path
     # TODO: Return document response
     
     return {
@@ -77,7 +121,7 @@ async def upload_document(
             "size": file.size if hasattr(file, 'size') else "unknown"
         },
         "auto_ocr": auto_ocr,
-        "tags": tags.split(",") if tags else []
+        "tags": sorted(tags)
     }
 
 
@@ -90,8 +134,8 @@ async def upload_document(
     tags=["documents"]
 )
 async def upload_documents_batch(
-    files: List[UploadFile] = File(..., description="List of document files to upload"),
-    auto_ocr: bool = Query(True, description="Automatically trigger OCR processing"),
+    files: Annotated[List[UploadFile], File(description="List of document files to upload")],
+    auto_ocr: Annotated[bool, Query(description="Automatically trigger OCR processing")] = True,
     # current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
@@ -104,8 +148,19 @@ async def upload_documents_batch(
     - **OCR scheduling**: Batch OCR job creation
     """
     
+    # All-or-nothing: reject the whole batch on declared sizes before reading any body
+    max_size = settings.MAX_FILE_SIZE_MB * 1024 * 1024
+    oversized = [
+        {"index": i, "filename": f.filename, "reason": "File too large"}
+        for i, f in enumerate(files)
+        if f.size is not None and f.size > max_size
+    ]
+    if oversized:
+        raise ValidationError("Batch contains files over the size limit", errors=oversized)
+    
     # TODO: Implement batch upload logic
-    # TODO: Validate all files first
+    # TODO: Replace with DocumentService.upload_documents_batch(...), which sniffs
+    #       every file's header and rejects the batch before any storage I/O
     # TODO: Process uploads in parallel
     # TODO: Handle partial failures
     # TODO: Create batch OCR jobs
@@ -129,9 +184,11 @@ async def upload_documents_batch(
     tags=["documents"]
 )
 async def get_document(
-    document_id: uuid.UUID = Path(..., description="Document unique identifier"),
-    include_download_url: bool = Query(True, description="Include signed download URL"),
-    url_expires_in: int = Query(3600, description="Download URL expiry in seconds"),
+    response: Response,
+    document_id: DocumentId,
+    include_download_url: Annotated[bool, Query(description="Include signed download URL")] = True,
+    url_expires_in: Annotated[int, Query(description="Download URL expiry in seconds")] = 3600,
+    if_none_match: Annotated[Optional[str], Header(description="ETag from a previous response")] = None,
     # current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
@@ -146,17 +203,72 @@ async def get_document(
     
     # TODO: Implement document retrieval
     # TODO: Verify user access permissions
-    # TODO: Generate signed download URLs
     # TODO: Check OCR status
-    # TODO: Add ETag header for caching
-    # TODO: Return document response
-    
-    return {
+    # TODO: Replace placeholder with DocumentService.get_document(
+    #       ..., if_none_match=if_none_match), which returns
+    #       {"etag", "not_modified": True} before signing any download URL
+    document: Dict[str, Any] = {
         "message": "Get document endpoint - TODO: Implement",
         "document_id": document_id,
         "include_download_url": include_download_url,
-        "url_expires_in": url_expires_in
+        "url_expires_in": url_expires_in,
+        "etag": None
     }
+    
+    etag = document.get("etag")
+    if etag:
+        if document.get("not_modified"):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "private, max-age=0, must-revalidate"
+    
+    return document
+
+
+@router.head(
+    "/{document_id}",
+    summary="Check Document",
+    description="Return document validators (ETag, Last-Modified) without a body",
+    tags=["documents"]
+)
+async def head_document(
+    document_id: DocumentId,
+    if_none_match: Annotated[Optional[str], Header(description="ETag from a previous response")] = None,
+    if_modified_since: Annotated[Optional[str], Header(description="Last-Modified from a previous response")] = None,
+    # current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Cheap polling for metadata or OCR changes:
+    
+    - **Headers only**: No body serialization and no signed URL generation
+    - **Validators**: ETag and Last-Modified from updated_at
+    - **OCR status**: Exposed as X-OCR-Status
+    - **Conditional**: 304 on If-None-Match, or If-Modified-Since when no ETag is sent
+    """
+    
+    # TODO: Replace placeholder with DocumentService.get_document_headers(...)
+    document_headers: Optional[Dict[str, Any]] = None
+    
+    if document_headers is None:
+        return Response(status_code=status.HTTP_200_OK)
+    
+    headers = {
+        "ETag": document_headers["etag"],
+        "Last-Modified": format_http_date(document_headers["last_modified"]),
+        "X-OCR-Status": document_headers["ocr_status"],
+        "Cache-Control": "private, max-age=0, must-revalidate"
+    }
+    
+    # If-Modified-Since is only consulted when If-None-Match is absent (RFC 9110)
+    if if_none_match is not None:
+        not_modified = etag_matches(if_none_match, document_headers["etag"])
+    else:
+        not_modified = not_modified_since(if_modified_since, document_headers["last_modified"])
+    
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED if not_modified else status.HTTP_200_OK,
+        headers=headers
+    )
 
 
 @router.get(
@@ -167,62 +279,55 @@ async def get_document(
     tags=["documents"]
 )
 async def list_documents(
-    # Pagination
-    page: int = Query(1, ge=1, description="Page number"),
-    page_size: int = Query(20, ge=1, le=100, description="Items per page"),
-    cursor: Optional[str] = Query(None, description="Pagination cursor"),
-    
-    # Filtering
-    document_type: Optional[str] = Query(None, description="Filter by document type"),
-    status: Optional[str] = Query(None, description="Filter by processing status"),
-    tags: Optional[str] = Query(None, description="Filter by tags (comma-separated)"),
-    created_after: Optional[datetime] = Query(None, description="Filter by creation date"),
-    created_before: Optional[datetime] = Query(None, description="Filter by creation date"),
-    filename_contains: Optional[str] = Query(None, description="Filter by filename"),
-    has_ocr: Optional[bool] = Query(None, description="Filter by OCR completion status"),
-    
-    # Sorting
-    sort_by: str = Query("created_at", description="Sort field"),
-    sort_order: str = Query("desc", regex="^(asc|desc)$", description="Sort order"),
-    
+    request: Request,
+    response: Response,
+    params: Annotated[DocumentListParams, Depends()],
+    tags: Annotated[FrozenSet[str], Depends(parse_tags)],
     # current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
     List user documents with advanced filtering and pagination:
     
-    - **Pagination**: Cursor-based pagination for performance
+    - **Pagination**: Keyset cursor pagination; `page` is only a fallback when no cursor is given
     - **Filtering**: Multiple filter options for document discovery
     - **Sorting**: Flexible sorting by various fields
     - **Search**: Filename and content search capabilities
-    - **Performance**: Optimized queries with proper indexing
+    - **Performance**: Index seeks on (uploaded_by, created_at, id) instead of OFFSET scans
     """
     
+    # Reject malformed cursors before touching the database
+    if params.cursor:
+        try:
+            cursor_sort_by, cursor_sort_order, _, _ = decode_cursor(params.cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        if (cursor_sort_by, cursor_sort_order) != (params.sort_by, params.sort_order):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Pagination cursor does not match the requested sort order"
+            )
+    
     # TODO: Implement document listing
     # TODO: Apply user access filters
     # TODO: Apply search and filter criteria
-    # TODO: Implement cursor-based pagination
-    # TODO: Sort results
-    # TODO: Return paginated response
+    # TODO: Take next_cursor from DocumentService.list_documents
+    next_cursor: Optional[str] = None
+    
+    if next_cursor:
+        response.headers["Link"] = build_next_link_header(str(request.url), next_cursor)
     
     return {
         "message": "List documents endpoint - TODO: Implement",
         "pagination": {
-            "page": page,
-            "page_size": page_size,
-            "cursor": cursor
-        },
-        "filters": {
-            "document_type": document_type,
-            "status": status,
-            "tags": tags.split(",") if tags else None,
-            "created_after": created_after,
-            "created_before": created_before,
-            "filename_contains": filename_contains,
-            "has_ocr": has_ocr
+            "page": None if params.cursor else params.page,
+            "page_size": params.page_size,
+            "cursor": params.cursor,
+            "next_cursor": next_cursor
         },
+        "filters": {**params.filters(), "tags": sorted(tags) or None},
         "sorting": {
-            "sort_by": sort_by,
-            "sort_order": sort_order
+            "sort_by": params.sort_by,
+            "sort_order": params.sort_order
         }
     }
 
@@ -237,28 +342,29 @@ async def list_documents(
     tags=["documents"]
 )
 async def update_document(
-    document_id: uuid.UUID = Path(..., description="Document unique identifier"),
+    document_id: DocumentId,
+    response: Response,
+    if_match: Annotated[str, Header(alias="If-Match", description="ETag from a previous GET, for optimistic locking")],
     # document_update: DocumentUpdateRequest,
-    if_match: Optional[str] = Query(None, description="ETag for optimistic locking"),
     # current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
     Update document metadata with optimistic locking:
     
     - **Metadata updates**: Filename, tags, custom metadata
-    - **Optimistic locking**: ETag-based concurrency control
+    - **Optimistic locking**: Required If-Match header; 412 when the ETag is stale
     - **Access control**: User permission verification
     - **Audit trail**: Change tracking and logging
     - **Validation**: Input validation and sanitization
     """
     
-    # TODO: Implement document update
-    # TODO: Verify user access permissions
-    # TODO: Check ETag for optimistic locking
-    # TODO: Validate update data
-    # TODO: Update document metadata
-    # TODO: Log changes for audit trail
-    # TODO: Return updated document
+    # TODO: Replace with DocumentService.update_document(document_id, user_id, updates, if_match)
+    #       - raises PreconditionFailedError (412) on a stale If-Match before
+    #         any write; the UPDATE itself is a version compare-and-set
+    updated: Optional[Dict[str, Any]] = None
+    
+    if updated and updated.get("etag"):
+        response.headers["ETag"] = updated["etag"]
     
     return {
         "message": "Update document endpoint - TODO: Implement",
@@ -275,8 +381,8 @@ async def update_document(
     tags=["documents"]
 )
 async def delete_document(
-    document_id: uuid.UUID = Path(..., description="Document unique identifier"),
-    permanent: bool = Query(False, description="Permanently delete (default: soft delete)"),
+    document_id: DocumentId,
+    permanent: Annotated[bool, Query(description="Permanently delete (default: soft delete)")] = False,
     # current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
@@ -294,17 +400,64 @@ async def delete_document(
     # TODO: Perform soft or hard delete
     # TODO: Clean up associated data
     # TODO: Log deletion event
-    # TODO: Return appropriate response
     
-    return {
-        "message": "Delete document endpoint - TODO: Implement",
-        "document_id": document_id,
-        "permanent": permanent
-    }
+    logger.info("Document deletion requested", extra={"document_id": str(document_id), "permanent": permanent})
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 # ============= DOCUMENT DOWNLOAD ENDPOINTS =============
 
+def build_download_response(download: Dict[str, Any], disposition: str) -> StreamingResponse:
+    """
+    Wrap a DocumentService.stream_document result in a StreamingResponse.
+    
+    The body is the storage chunk generator itself, so nothing is buffered
+    and a Range request is answered with 206 and Content-Range.
+    """
+    file_size = download["file_size"]
+    byte_range = download.get("byte_range")
+    
+    headers = {
+        "Content-Disposition": f'{disposition}; filename="{download["filename"]}"',
+        "Accept-Ranges": "bytes"
+    }
+    if download.get("etag"):
+        headers["ETag"] = download["etag"]
+    
+    if byte_range:
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{file_size}"
+        headers["Content-Length"] = str(end - start + 1)
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+    else:
+        headers["Content-Length"] = str(file_size)
+        status_code = status.HTTP_200_OK
+    
+    return StreamingResponse(
+        download["stream"],
+        status_code=status_code,
+        media_type=download["mime_type"],
+        headers=headers
+    )
+
+
+def build_offload_response(download: Dict[str, Any], disposition: str) -> Response:
+    """
+    Hand a download off to the front proxy (X-Accel-Redirect / X-Sendfile).
+    
+    The app returns headers only; the proxy serves the bytes from its
+    internal location, including any Range handling.
+    """
+    headers = {
+        settings.DOWNLOAD_OFFLOAD_HEADER: settings.DOWNLOAD_OFFLOAD_PREFIX + quote(download["storage_key"]),
+        "Content-Disposition": f'{disposition}; filename="{download["filename"]}"'
+    }
+    if download.get("etag"):
+        headers["ETag"] = download["etag"]
+    
+    return Response(status_code=status.HTTP_200_OK, media_type=download["mime_type"], headers=headers)
+
+
 @router.get(
     "/{document_id}/download",
     summary="Download Document",
@@ -312,8 +465,9 @@ async def delete_document(
     tags=["documents"]
 )
 async def download_document(
-    document_id: uuid.UUID = Path(..., description="Document unique identifier"),
-    disposition: str = Query("attachment", regex="^(inline|attachment)$", description="Content disposition"),
+    document_id: DocumentId,
+    disposition: Annotated[Literal["inline", "attachment"], Query(description="Content disposition")] = "attachment",
+    range_header: Annotated[Optional[str], Header(alias="Range", description="Byte range for partial downloads")] = None,
     # current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
@@ -326,13 +480,19 @@ async def download_document(
     - **Usage tracking**: Download event logging
     """
     
+    # Behind nginx/Apache the proxy serves the bytes (and ranges) itself
+    offload = bool(settings.DOWNLOAD_OFFLOAD_HEADER)
+    
     # TODO: Implement document download
     # TODO: Verify user access permissions
-    # TODO: Get file from storage
-    # TODO: Stream file content
-    # TODO: Set appropriate headers
-    # TODO: Log download event
-    # TODO: Return streaming response
+    # TODO: Replace with DocumentService.stream_document(
+    #           document_id, user_id, None if offload else range_header)
+    download: Optional[Dict[str, Any]] = None
+    
+    if download is not None:
+        if offload:
+            return build_offload_response(download, disposition)
+        return build_download_response(download, disposition)
     
     return {
         "message": "Download document endpoint - TODO: Implement",
@@ -348,8 +508,8 @@ async def download_document(
     tags=["documents"]
 )
 async def get_document_thumbnail(
-    document_id: uuid.UUID = Path(..., description="Document unique identifier"),
-    size: str = Query("medium", regex="^(small|medium|large)$", description="Thumbnail size"),
+    document_id: DocumentId,
+    size: Annotated[Literal["small", "medium", "large"], Query(description="Thumbnail size")] = "medium",
     # current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
@@ -357,17 +517,24 @@ async def get_document_thumbnail(
     
     - **Size options**: Small, medium, large thumbnails
     - **Caching**: Aggressive caching for performance
-    - **Generation**: On-demand thumbnail creation
+    - **Generation**: Pre-rendered at upload time, never on this request path
     - **Fallbacks**: Default thumbnails for unsupported types
     - **Optimization**: Compressed images for web delivery
     """
     
-    # TODO: Implement thumbnail retrieval
-    # TODO: Verify user access permissions
-    # TODO: Check if thumbnail exists
-    # TODO: Generate thumbnail if needed
-    # TODO: Return thumbnail image
-    # TODO: Add caching headers
+    # Thumbnails are rendered at upload time (DocumentService.generate_thumbnails),
+    # so this handler only redirects to the stored WebP and does no image work
+    # TODO: Replace placeholder with DocumentService.get_thumbnail_url(...)
+    # TODO: Serve a default thumbnail for unsupported types
+    thumbnail_url: Optional[str] = None
+    
+    if thumbnail_url is not None:
+        # Cache the redirect well inside the URL's 24h expiry
+        return RedirectResponse(
+            thumbnail_url,
+            status_code=status.HTTP_307_TEMPORARY_REDIRECT,
+            headers={"Cache-Control": "private, max-age=3600"}
+        )
     
     return {
         "message": "Thumbnail endpoint - TODO: Implement",
@@ -385,7 +552,7 @@ async def get_document_thumbnail(
     tags=["documents"]
 )
 async def validate_document(
-    file: UploadFile = File(..., description="Document file to validate"),
+    file: Annotated[UploadFile, File(description="Document file to validate")],
     # current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
@@ -398,8 +565,12 @@ async def validate_document(
     - **Quota checking**: User storage quota verification
     """
     
+    reject_oversized_upload(file)
+    
     # TODO: Implement document validation
-    # TODO: Check file type and size
+    # TODO: Check file type on the first chunk only:
+    #       head, _ = await peek_stream(
+    #           iter_upload_chunks(file, max_size=settings.MAX_FILE_SIZE_MB * 1024 * 1024))
     # TODO: Scan for security threats
     # TODO: Validate document structure
     # TODO: Check user quotas
@@ -424,6 +595,7 @@ async def validate_document(
     tags=["documents"]
 )
 async def get_document_statistics(
+    response: Response,
     # current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
@@ -436,9 +608,10 @@ async def get_document_statistics(
     - **Quota information**: Limits and remaining capacity
     """
     
-    # TODO: Implement statistics calculation
-    # TODO: Get storage usage for user
-    # TODO: Count documents by various criteria
+    # Totals come from the document_stats roll-up; 30s staleness is fine here
+    response.headers["Cache-Control"] = "private, max-age=30"
+    
+    # TODO: Replace with DocumentService.get_document_statistics(user_id)
     # TODO: Calculate processing statistics
     # TODO: Generate usage trends
     # TODO: Return statistics response
@@ -454,30 +627,7 @@ async def get_document_statistics(
     }
 
 
-# ============= ERROR HANDLERS =============
-
-# TODO: Add exception handlers to main FastAPI app, not router
-# Exception handlers should be registered in app/main.py:
-# @app.exception_handler(DocumentNotFoundError)
-# async def document_not_found_handler(request, exc):
-#     return JSONResponse(status_code=404, content={"detail": str(exc)})
-
-async def document_exception_handler(request, exc):
-    """Handle document-specific exceptions"""
-    # TODO: Implement custom exception handling
-    # TODO: Log errors with context
-    # TODO: Return RFC 9457 compliant responses
-    
-    return JSONResponse(
-        status_code=500,
-        content={
-            "type": "https://insurecove.com/problems/internal-server-error",
-            "title": "Internal Server Error",
-            "status": 500,
-            "detail": "An unexpected error occurred",
-            "instance": str(request.url)
-        }
-    )
+# Error handlers are registered once on the app in app/main.py
 
 
 # TODO: Add document sharing endpoints
@@ -8,208 +8,492 @@ Production metrics collection:
 - GET /metrics/documents (document-specific metrics)
 """
 
+import asyncio
+import math
+import threading
 import time
+from array import array
+from collections import OrderedDict, defaultdict, deque
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 from fastapi import APIRouter, Response, Request
-from fastapi.responses import PlainTextResponse
-import psutil
 
+from app.core.config import settings
 from app.models import MetricsResponse
+from app.utils.response_utils import ORJSONResponse
+from app.utils.system_utils import get_system_metrics_snapshot
 
 # Initialize router
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+class StripedCounter:
+    """
+    Counter with one cell per writing thread, so concurrent writers never
+    update the same cell; the total is summed on read.
+    
+    Cells of exited threads are kept, so their counts stay in the total.
+    """
+
+    __slots__ = ("_local", "_cells", "_lock")
+
+    def __init__(self):
+        self._local = threading.local()
+        self._cells: List[List[int]] = []
+        self._lock = threading.Lock()
+
+    def increment(self, amount: int = 1) -> None:
+        try:
+            cell = self._local.cell
+        except AttributeError:
+            cell = self._add_cell()
+        cell[0] += amount
+
+    def _add_cell(self) -> List[int]:
+        # Once per thread; the lock only guards registration, not counting
+        cell = self._local.cell = [0]
+        with self._lock:
+            self._cells.append(cell)
+        return cell
+
+    @property
+    def value(self) -> int:
+        return sum(cell[0] for cell in self._cells)
+
+
+# Scrapers polling faster than this get the previously rendered body
+PROMETHEUS_CACHE_SECONDS = 1.0
+
+_prometheus_cache = {"ts": float("-inf"), "body": b""}
+
+# Standard Prometheus text exposition format content type
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Prometheus exposition body; values are filled in with one % format per scrape
+_PROMETHEUS_TEMPLATE = """# HELP document_service_requests_total Total number of requests
+# TYPE document_service_requests_total counter
+document_service_requests_total %d
+
+# HELP document_service_requests_per_minute Current requests per minute
+# TYPE document_service_requests_per_minute gauge
+document_service_requests_per_minute %s
+
+# HELP document_service_response_time_ms Average response time in milliseconds
+# TYPE document_service_response_time_ms gauge
+document_service_response_time_ms %s
+
+# HELP document_service_response_time_quantile_ms Response time percentiles over recent requests in milliseconds
+# TYPE document_service_response_time_quantile_ms gauge
+document_service_response_time_quantile_ms{quantile="0.5"} %s
+document_service_response_time_quantile_ms{quantile="0.95"} %s
+document_service_response_time_quantile_ms{quantile="0.99"} %s
+
+# HELP document_service_error_rate_percent Error rate percentage
+# TYPE document_service_error_rate_percent gauge
+document_service_error_rate_percent %s
+
+# HELP document_service_documents_total Total documents uploaded
+# TYPE document_service_documents_total counter
+document_service_documents_total %d
+
+# HELP document_service_storage_used_mb Total storage used in MB
+# TYPE document_service_storage_used_mb gauge
+document_service_storage_used_mb %s
+
+# HELP document_service_ocr_jobs_total Total OCR jobs processed
+# TYPE document_service_ocr_jobs_total counter
+document_service_ocr_jobs_total %d
+
+# HELP document_service_ocr_success_rate_percent OCR success rate percentage
+# TYPE document_service_ocr_success_rate_percent gauge
+document_service_ocr_success_rate_percent %s
+
+# HELP document_service_memory_usage_mb Memory usage in MB
+# TYPE document_service_memory_usage_mb gauge
+document_service_memory_usage_mb %s
+
+# HELP document_service_cpu_usage_percent CPU usage percentage
+# TYPE document_service_cpu_usage_percent gauge
+document_service_cpu_usage_percent %s
+
+# HELP document_service_uptime_seconds Service uptime in seconds
+# TYPE document_service_uptime_seconds gauge
+document_service_uptime_seconds %s
+"""
+
+# Guards metrics_store updates and multi-field reads; striped counters are
+# updated outside it. Plain dict/float read-modify-writes are not atomic
+# without the GIL.
+_metrics_lock = threading.Lock()
+
+# Default seconds between merges of buffered request records
+METRICS_FLUSH_INTERVAL_SECONDS = 0.5
+
+# record_request appends to a per-thread deque (no shared-state writes);
+# flush_request_metrics drains every registered deque under _metrics_lock
+_request_buffer = threading.local()
+_request_buffers: List[Tuple[threading.Thread, deque]] = []
+
+# Status group label by status_code // 100 (three-digit codes give 1-9)
+_STATUS_GROUPS = tuple(f"{bucket}xx" for bucket in range(10))
+
+# Number of most recent response times kept for the average and percentiles
+RESPONSE_TIME_WINDOW = 1000
+
+# Distinct endpoints counted individually; the least recently seen one is
+# folded into an "other" bucket when a new endpoint arrives past the cap
+MAX_TRACKED_ENDPOINTS = 512
+
+# Response time percentiles reported by /metrics and /metrics/prometheus
+RESPONSE_TIME_PERCENTILES = (50, 95, 99)
+
+# Storage and processing totals are kept as exact ints and converted on read
+BYTES_PER_MB = 1024 * 1024
+NS_PER_SECOND = 1_000_000_000
+
+
+@dataclass(slots=True)
+class DocumentEventMetrics:
+    """Document event counters, updated via slot attributes"""
+    uploads_total: int = 0
+    downloads_total: int = 0
+    deletions_total: int = 0
+    processing_failures: int = 0
+    total_storage_used_bytes: int = 0
+
+
+@dataclass(slots=True)
+class OCREventMetrics:
+    """OCR job counters, updated via slot attributes"""
+    jobs_total: int = 0
+    jobs_successful: int = 0
+    jobs_failed: int = 0
+    total_processing_time_ns: int = 0
+
+
+document_metrics = DocumentEventMetrics()
+ocr_metrics = OCREventMetrics()
+
 
 # Simple in-memory metrics store (in production, use Redis or similar)
 metrics_store = {
-    "requests_total": 0,
-    "requests_by_endpoint": {},
-    "requests_by_status": {},
-    "response_times": [],
-    "errors_total": 0,
-    "document_events": {
-        "uploads_total": 0,
-        "downloads_total": 0,
-        "deletions_total": 0,
-        "processing_failures": 0,
-        "total_storage_used_mb": 0.0
-    },
-    "ocr_events": {
-        "jobs_total": 0,
-        "jobs_successful": 0,
-        "jobs_failed": 0,
-        "total_processing_time": 0.0
-    },
-    "start_time": time.time()
+    "requests_total": StripedCounter(),
+    "requests_by_endpoint": OrderedDict(),  # Least recently seen first
+    "requests_by_endpoint_other": 0,  # Requests to endpoints evicted from the above
+    "requests_by_status": defaultdict(int),
+    # Ring of the last RESPONSE_TIME_WINDOW response times; the next write goes
+    # to response_time_count % RESPONSE_TIME_WINDOW
+    "response_times": array("d", bytes(8 * RESPONSE_TIME_WINDOW)),
+    "response_time_count": 0,  # Response times ever recorded
+    "response_time_sum": 0.0,  # Sum of the values currently in the window
+    "errors_total": StripedCounter(),
+    "start_ns": time.monotonic_ns()  # Monotonic, so uptime ignores wall-clock jumps
 }
 
 
+# (epoch second, datetime for that second); replaced as one tuple so readers
+# never pair a stale datetime with a new second
+_timestamp_cache = (-1, datetime.fromtimestamp(0))
+
+
+def get_timestamp() -> datetime:
+    """Current local time at one-second resolution, built once per second"""
+    global _timestamp_cache
+    
+    second = time.time_ns() // 1_000_000_000
+    if second != _timestamp_cache[0]:
+        _timestamp_cache = (second, datetime.fromtimestamp(second))
+    return _timestamp_cache[1]
+
+
+def get_uptime_seconds() -> float:
+    """Seconds since the metrics store was created"""
+    return (time.monotonic_ns() - metrics_store["start_ns"]) / NS_PER_SECOND
+
+
+def _apply_request_metrics(endpoint: str, status_code: int, response_time: float):
+    """Fold one request into metrics_store (caller holds _metrics_lock)"""
+    # Track by endpoint, bounded so per-ID paths cannot grow the map forever
+    endpoint_counts = metrics_store["requests_by_endpoint"]
+    if endpoint in endpoint_counts:
+        endpoint_counts[endpoint] += 1
+        endpoint_counts.move_to_end(endpoint)
+    else:
+        if len(endpoint_counts) >= MAX_TRACKED_ENDPOINTS:
+            _, evicted_count = endpoint_counts.popitem(last=False)
+            metrics_store["requests_by_endpoint_other"] += evicted_count
+        endpoint_counts[endpoint] = 1
+    
+    # Track by status code
+    metrics_store["requests_by_status"][_STATUS_GROUPS[status_code // 100]] += 1
+    
+    # Track response times, overwriting the oldest once the ring is full and
+    # keeping the window sum current so reads do not re-add it (unused slots
+    # hold 0.0, so subtracting them is a no-op)
+    response_times = metrics_store["response_times"]
+    slot = metrics_store["response_time_count"] % RESPONSE_TIME_WINDOW
+    metrics_store["response_time_sum"] += response_time - response_times[slot]
+    response_times[slot] = response_time
+    metrics_store["response_time_count"] += 1
+
+
 def update_request_metrics(endpoint: str, status_code: int, response_time: float):
     """Update request metrics"""
-    metrics_store["requests_total"] += 1
+    metrics_store["requests_total"].increment()
+    if status_code >= 400:
+        metrics_store["errors_total"].increment()
     
-    # Track by endpoint
-    if endpoint not in metrics_store["requests_by_endpoint"]:
-        metrics_store["requests_by_endpoint"][endpoint] = 0
-    metrics_store["requests_by_endpoint"][endpoint] += 1
+    with _metrics_lock:
+        _apply_request_metrics(endpoint, status_code, response_time)
+
+
+def flush_request_metrics():
+    """Apply request records buffered by record_request to metrics_store"""
+    requests = errors = 0
+    with _metrics_lock:
+        for registration in list(_request_buffers):
+            thread, buffer = registration
+            # Checked before draining so records appended just before exit are kept
+            alive = thread.is_alive()
+            while buffer:
+                endpoint, status_code, response_time = buffer.popleft()
+                _apply_request_metrics(endpoint, status_code, response_time)
+                requests += 1
+                if status_code >= 400:
+                    errors += 1
+            if not alive:
+                _request_buffers.remove(registration)
     
-    # Track by status code
-    status_group = f"{status_code // 100}xx"
-    if status_group not in metrics_store["requests_by_status"]:
-        metrics_store["requests_by_status"][status_group] = 0
-    metrics_store["requests_by_status"][status_group] += 1
+    if requests:
+        metrics_store["requests_total"].increment(requests)
+    if errors:
+        metrics_store["errors_total"].increment(errors)
+
+
+async def run_metrics_flusher(interval: float = METRICS_FLUSH_INTERVAL_SECONDS) -> None:
+    """
+    Flush buffered request records every `interval` seconds until cancelled.
     
-    # Track response times (keep last 1000)
-    metrics_store["response_times"].append(response_time)
-    if len(metrics_store["response_times"]) > 1000:
-        metrics_store["response_times"] = metrics_store["response_times"][-1000:]
+    Start once per worker at application startup.
     
-    # Track errors
-    if status_code >= 400:
-        metrics_store["errors_total"] += 1
+    Args:
+        interval: Seconds between flushes
+    """
+    while True:
+        await asyncio.sleep(interval)
+        flush_request_metrics()
+
+
+def _on_document_upload(file_size_bytes: Optional[int] = None, **kwargs):
+    document_metrics.uploads_total += 1
+    if file_size_bytes is not None:
+        document_metrics.total_storage_used_bytes += file_size_bytes
+
+
+def _on_document_download(**kwargs):
+    document_metrics.downloads_total += 1
+
+
+def _on_document_deletion(file_size_bytes: Optional[int] = None, **kwargs):
+    document_metrics.deletions_total += 1
+    if file_size_bytes is not None:
+        document_metrics.total_storage_used_bytes -= file_size_bytes
+
+
+def _on_document_processing_failure(**kwargs):
+    document_metrics.processing_failures += 1
+
+
+def _on_ocr_job_started(**kwargs):
+    ocr_metrics.jobs_total += 1
+
+
+def _on_ocr_job_completed(processing_time_ns: Optional[int] = None, **kwargs):
+    ocr_metrics.jobs_successful += 1
+    if processing_time_ns is not None:
+        ocr_metrics.total_processing_time_ns += processing_time_ns
+
+
+def _on_ocr_job_failed(**kwargs):
+    ocr_metrics.jobs_failed += 1
+
+
+# Event handlers by event_type; each runs with _metrics_lock held
+_DOCUMENT_EVENT_HANDLERS = {
+    "upload": _on_document_upload,
+    "download": _on_document_download,
+    "deletion": _on_document_deletion,
+    "processing_failure": _on_document_processing_failure
+}
+
+_OCR_EVENT_HANDLERS = {
+    "job_started": _on_ocr_job_started,
+    "job_completed": _on_ocr_job_completed,
+    "job_failed": _on_ocr_job_failed
+}
 
 
 def update_document_metrics(event_type: str, **kwargs):
-    """Update document-related metrics"""
-    if event_type == "upload":
-        metrics_store["document_events"]["uploads_total"] += 1
-        if "file_size_mb" in kwargs:
-            metrics_store["document_events"]["total_storage_used_mb"] += kwargs["file_size_mb"]
-    elif event_type == "download":
-        metrics_store["document_events"]["downloads_total"] += 1
-    elif event_type == "deletion":
-        metrics_store["document_events"]["deletions_total"] += 1
-        if "file_size_mb" in kwargs:
-            metrics_store["document_events"]["total_storage_used_mb"] -= kwargs["file_size_mb"]
-    elif event_type == "processing_failure":
-        metrics_store["document_events"]["processing_failures"] += 1
+    """Update document-related metrics (unknown event types are ignored)"""
+    handler = _DOCUMENT_EVENT_HANDLERS.get(event_type)
+    if handler:
+        with _metrics_lock:
+            handler(**kwargs)
 
 
 def update_ocr_metrics(event_type: str, **kwargs):
-    """Update OCR-related metrics"""
-    if event_type == "job_started":
-        metrics_store["ocr_events"]["jobs_total"] += 1
-    elif event_type == "job_completed":
-        metrics_store["ocr_events"]["jobs_successful"] += 1
-        if "processing_time" in kwargs:
-            metrics_store["ocr_events"]["total_processing_time"] += kwargs["processing_time"]
-    elif event_type == "job_failed":
-        metrics_store["ocr_events"]["jobs_failed"] += 1
+    """Update OCR-related metrics (unknown event types are ignored)"""
+    handler = _OCR_EVENT_HANDLERS.get(event_type)
+    if handler:
+        with _metrics_lock:
+            handler(**kwargs)
 
 
 def get_system_metrics() -> Dict[str, Any]:
-    """Get system resource metrics"""
-    try:
-        memory = psutil.virtual_memory()
-        cpu_percent = psutil.cpu_percent(interval=1)
-        
-        return {
-            "memory_usage_mb": round(memory.used / (1024 * 1024), 2),
-            "memory_usage_percent": memory.percent,
-            "cpu_usage_percent": cpu_percent,
-            "uptime_seconds": time.time() - metrics_store["start_time"]
-        }
-    except Exception:
-        return {
-            "memory_usage_mb": 0.0,
-            "memory_usage_percent": 0.0,
-            "cpu_usage_percent": 0.0,
-            "uptime_seconds": time.time() - metrics_store["start_time"]
-        }
+    """Get system resource metrics from the background snapshot"""
+    uptime_seconds = get_uptime_seconds()
+    
+    if settings.ENABLE_SYSTEM_METRICS:
+        try:
+            snapshot = get_system_metrics_snapshot()
+            
+            return {
+                "memory_usage_mb": snapshot["memory_usage_mb"],
+                "memory_usage_percent": snapshot["memory_usage_percent"],
+                "cpu_usage_percent": snapshot["cpu_usage_percent"],
+                "uptime_seconds": uptime_seconds
+            }
+        except Exception:
+            pass
+    
+    return {
+        "memory_usage_mb": 0.0,
+        "memory_usage_percent": 0.0,
+        "cpu_usage_percent": 0.0,
+        "uptime_seconds": uptime_seconds
+    }
 
 
 def calculate_metrics() -> Dict[str, Any]:
     """Calculate comprehensive metrics"""
-    uptime_seconds = time.time() - metrics_store["start_time"]
+    flush_request_metrics()
+    uptime_seconds = get_uptime_seconds()
+    requests_total = metrics_store["requests_total"].value
     
     # Request metrics
-    requests_per_minute = (metrics_store["requests_total"] / (uptime_seconds / 60)) if uptime_seconds > 0 else 0
+    requests_per_minute = (requests_total / (uptime_seconds / 60)) if uptime_seconds > 0 else 0.0
     
     # Average response time
-    avg_response_time = (
-        sum(metrics_store["response_times"]) / len(metrics_store["response_times"])
-        if metrics_store["response_times"] else 0
-    )
+    with _metrics_lock:
+        window_size = min(metrics_store["response_time_count"], RESPONSE_TIME_WINDOW)
+        avg_response_time = (
+            metrics_store["response_time_sum"] / window_size
+            if window_size else 0.0
+        )
+        # Slot order does not matter once sorted
+        window = sorted(metrics_store["response_times"][:window_size])
+    
+    # Nearest-rank percentiles over the window
+    response_time_percentiles = {
+        f"p{percentile}_response_time_ms": (
+            window[max(0, math.ceil(window_size * percentile / 100) - 1)]
+            if window_size else 0.0
+        )
+        for percentile in RESPONSE_TIME_PERCENTILES
+    }
     
     # Error rate
     error_rate_percent = (
-        (metrics_store["errors_total"] / metrics_store["requests_total"]) * 100
-        if metrics_store["requests_total"] > 0 else 0
+        (metrics_store["errors_total"].value / requests_total) * 100
+        if requests_total > 0 else 0.0
     )
     
     # OCR success rate
-    total_ocr_jobs = metrics_store["ocr_events"]["jobs_total"]
+    total_ocr_jobs = ocr_metrics.jobs_total
     ocr_success_rate = (
-        (metrics_store["ocr_events"]["jobs_successful"] / total_ocr_jobs) * 100
+        (ocr_metrics.jobs_successful / total_ocr_jobs) * 100
         if total_ocr_jobs > 0 else 100.0
     )
     
     # Average OCR processing time
     avg_ocr_time = (
-        metrics_store["ocr_events"]["total_processing_time"] / metrics_store["ocr_events"]["jobs_successful"]
-        if metrics_store["ocr_events"]["jobs_successful"] > 0 else 0
+        ocr_metrics.total_processing_time_ns / NS_PER_SECOND / ocr_metrics.jobs_successful
+        if ocr_metrics.jobs_successful > 0 else 0.0
     )
     
     # Documents processed today (simplified - in production, track by date)
-    documents_today = metrics_store["document_events"]["uploads_total"]
+    documents_today = document_metrics.uploads_total
     
     return {
-        "total_requests": metrics_store["requests_total"],
-        "requests_per_minute": round(requests_per_minute, 2),
-        "average_response_time_ms": round(avg_response_time, 2),
-        "error_rate_percent": round(error_rate_percent, 2),
-        "total_documents": metrics_store["document_events"]["uploads_total"],
+        "total_requests": requests_total,
+        "requests_per_minute": requests_per_minute,
+        "average_response_time_ms": avg_response_time,
+        **response_time_percentiles,
+        "error_rate_percent": error_rate_percent,
+        "total_documents": document_metrics.uploads_total,
         "documents_processed_today": documents_today,
-        "total_storage_used_mb": round(metrics_store["document_events"]["total_storage_used_mb"], 2),
+        "total_storage_used_mb": document_metrics.total_storage_used_bytes / BYTES_PER_MB,
         "total_ocr_jobs": total_ocr_jobs,
-        "ocr_success_rate_percent": round(ocr_success_rate, 2),
-        "average_ocr_time_seconds": round(avg_ocr_time, 2),
+        "ocr_success_rate_percent": ocr_success_rate,
+        "average_ocr_time_seconds": avg_ocr_time,
         **get_system_metrics()
     }
 
 
 @router.get(
     "",
-    response_model=MetricsResponse,
+    response_model=None,
+    responses={200: {"model": MetricsResponse}},
     summary="Get service metrics",
     description="Comprehensive service metrics in JSON format"
 )
-async def get_metrics(request: Request) -> MetricsResponse:
-    """Get comprehensive service metrics"""
+async def get_metrics(request: Request) -> ORJSONResponse:
+    """
+    Get comprehensive service metrics.
+    
+    Returns a plain dict shaped like MetricsResponse (which documents the
+    schema) so no model is validated and re-serialized per call.
+    """
     
     try:
         metrics_data = calculate_metrics()
         
-        return MetricsResponse(
-            total_requests=metrics_data["total_requests"],
-            requests_per_minute=metrics_data["requests_per_minute"],
-            average_response_time_ms=metrics_data["average_response_time_ms"],
-            error_rate_percent=metrics_data["error_rate_percent"],
-            total_documents=metrics_data["total_documents"],
-            documents_processed_today=metrics_data["documents_processed_today"],
-            total_storage_used_mb=metrics_data["total_storage_used_mb"],
-            total_ocr_jobs=metrics_data["total_ocr_jobs"],
-            ocr_success_rate_percent=metrics_data["ocr_success_rate_percent"],
-            average_ocr_time_seconds=metrics_data["average_ocr_time_seconds"],
-            timestamp=datetime.now()
-        )
+        return ORJSONResponse({
+            "total_requests": metrics_data["total_requests"],
+            "requests_per_minute": metrics_data["requests_per_minute"],
+            "average_response_time_ms": metrics_data["average_response_time_ms"],
+            "p50_response_time_ms": metrics_data["p50_response_time_ms"],
+            "p95_response_time_ms": metrics_data["p95_response_time_ms"],
+            "p99_response_time_ms": metrics_data["p99_response_time_ms"],
+            "error_rate_percent": metrics_data["error_rate_percent"],
+            "total_documents": metrics_data["total_documents"],
+            "documents_processed_today": metrics_data["documents_processed_today"],
+            "total_storage_used_mb": metrics_data["total_storage_used_mb"],
+            "total_ocr_jobs": metrics_data["total_ocr_jobs"],
+            "ocr_success_rate_percent": metrics_data["ocr_success_rate_percent"],
+            "average_ocr_time_seconds": metrics_data["average_ocr_time_seconds"],
+            "timestamp": get_timestamp()
+        })
         
     except Exception as e:
         # Return empty metrics in case of error
-        return MetricsResponse(
-            total_requests=0,
-            requests_per_minute=0.0,
-            average_response_time_ms=0.0,
-            error_rate_percent=0.0,
-            total_documents=0,
-            documents_processed_today=0,
-            total_storage_used_mb=0.0,
-            total_ocr_jobs=0,
-            ocr_success_rate_percent=0.0,
-            average_ocr_time_seconds=0.0,
-            timestamp=datetime.now()
-        )
+        return ORJSONResponse({
+            "total_requests": 0,
+            "requests_per_minute": 0.0,
+            "average_response_time_ms": 0.0,
+            "p50_response_time_ms": 0.0,
+            "p95_response_time_ms": 0.0,
+            "p99_response_time_ms": 0.0,
+            "error_rate_percent": 0.0,
+            "total_documents": 0,
+            "documents_processed_today": 0,
+            "total_storage_used_mb": 0.0,
+            "total_ocr_jobs": 0,
+            "ocr_success_rate_percent": 0.0,
+            "average_ocr_time_seconds": 0.0,
+            "timestamp": get_timestamp()
+        })
 
 
 @router.get(
@@ -224,7 +508,7 @@ async def get_metrics_summary():
     
     return {
         "service": "document-service",
-        "timestamp": datetime.now(),
+        "timestamp": get_timestamp(),
         "uptime_seconds": metrics_data["uptime_seconds"],
         "health": "healthy",
         "requests": {
@@ -251,61 +535,41 @@ async def get_metrics_summary():
 
 @router.get(
     "/prometheus",
-    response_class=PlainTextResponse,
+    response_class=Response,
     summary="Get Prometheus metrics",
     description="Metrics in Prometheus format for monitoring systems"
 )
-async def get_prometheus_metrics():
+async def get_prometheus_metrics() -> Response:
     """Get metrics in Prometheus format"""
     
+    now = time.monotonic()
+    if now - _prometheus_cache["ts"] < PROMETHEUS_CACHE_SECONDS:
+        return Response(_prometheus_cache["body"], media_type=PROMETHEUS_MEDIA_TYPE)
+    
     metrics_data = calculate_metrics()
     
-    prometheus_output = f"""# HELP document_service_requests_total Total number of requests
-# TYPE document_service_requests_total counter
-document_service_requests_total {metrics_data["total_requests"]}
-
-# HELP document_service_requests_per_minute Current requests per minute
-# TYPE document_service_requests_per_minute gauge
-document_service_requests_per_minute {metrics_data["requests_per_minute"]}
-
-# HELP document_service_response_time_ms Average response time in milliseconds
-# TYPE document_service_response_time_ms gauge
-document_service_response_time_ms {metrics_data["average_response_time_ms"]}
-
-# HELP document_service_error_rate_percent Error rate percentage
-# TYPE document_service_error_rate_percent gauge
-document_service_error_rate_percent {metrics_data["error_rate_percent"]}
-
-# HELP document_service_documents_total Total documents uploaded
-# TYPE document_service_documents_total counter
-document_service_documents_total {metrics_data["total_documents"]}
-
-# HELP document_service_storage_used_mb Total storage used in MB
-# TYPE document_service_storage_used_mb gauge
-document_service_storage_used_mb {metrics_data["total_storage_used_mb"]}
-
-# HELP document_service_ocr_jobs_total Total OCR jobs processed
-# TYPE document_service_ocr_jobs_total counter
-document_service_ocr_jobs_total {metrics_data["total_ocr_jobs"]}
-
-# HELP document_service_ocr_success_rate_percent OCR success rate percentage
-# TYPE document_service_ocr_success_rate_percent gauge
-document_service_ocr_success_rate_percent {metrics_data["ocr_success_rate_percent"]}
-
-# HELP document_service_memory_usage_mb Memory usage in MB
-# TYPE document_service_memory_usage_mb gauge
-document_service_memory_usage_mb {metrics_data["memory_usage_mb"]}
-
-# HELP document_service_cpu_usage_percent CPU usage percentage
-# TYPE document_service_cpu_usage_percent gauge
-document_service_cpu_usage_percent {metrics_data["cpu_usage_percent"]}
-
-# HELP document_service_uptime_seconds Service uptime in seconds
-# TYPE document_service_uptime_seconds gauge
-document_service_uptime_seconds {metrics_data["uptime_seconds"]}
-"""
+    prometheus_output = _PROMETHEUS_TEMPLATE % (
+        metrics_data["total_requests"],
+        metrics_data["requests_per_minute"],
+        metrics_data["average_response_time_ms"],
+        metrics_data["p50_response_time_ms"],
+        metrics_data["p95_response_time_ms"],
+        metrics_data["p99_response_time_ms"],
+        metrics_data["error_rate_percent"],
+        metrics_data["total_documents"],
+        metrics_data["total_storage_used_mb"],
+        metrics_data["total_ocr_jobs"],
+        metrics_data["ocr_success_rate_percent"],
+        metrics_data["memory_usage_mb"],
+        metrics_data["cpu_usage_percent"],
+        metrics_data["uptime_seconds"]
+    )
     
-    return prometheus_output
+    # Encoded once per render; cached scrapes reuse the bytes as-is
+    body = prometheus_output.encode("ascii")
+    _prometheus_cache["body"] = body
+    _prometheus_cache["ts"] = now
+    return Response(body, media_type=PROMETHEUS_MEDIA_TYPE)
 
 
 @router.get(
@@ -316,34 +580,60 @@ document_service_uptime_seconds {metrics_data["uptime_seconds"]}
 async def get_document_metrics():
     """Get detailed document processing metrics"""
     
+    flush_request_metrics()
+    
+    # Snapshot the per-key counters; writers may add keys during serialization
+    with _metrics_lock:
+        requests_by_endpoint = dict(metrics_store["requests_by_endpoint"])
+        if metrics_store["requests_by_endpoint_other"]:
+            requests_by_endpoint["other"] = (
+                requests_by_endpoint.get("other", 0) + metrics_store["requests_by_endpoint_other"]
+            )
+        requests_by_status = dict(metrics_store["requests_by_status"])
+    
     return {
         "documents": {
-            "uploads_total": metrics_store["document_events"]["uploads_total"],
-            "downloads_total": metrics_store["document_events"]["downloads_total"],
-            "deletions_total": metrics_store["document_events"]["deletions_total"],
-            "processing_failures": metrics_store["document_events"]["processing_failures"],
-            "total_storage_used_mb": round(metrics_store["document_events"]["total_storage_used_mb"], 2)
+            "uploads_total": document_metrics.uploads_total,
+            "downloads_total": document_metrics.downloads_total,
+            "deletions_total": document_metrics.deletions_total,
+            "processing_failures": document_metrics.processing_failures,
+            "total_storage_used_mb": document_metrics.total_storage_used_bytes / BYTES_PER_MB
         },
         "ocr": {
-            "jobs_total": metrics_store["ocr_events"]["jobs_total"],
-            "jobs_successful": metrics_store["ocr_events"]["jobs_successful"],
-            "jobs_failed": metrics_store["ocr_events"]["jobs_failed"],
-            "total_processing_time_seconds": round(metrics_store["ocr_events"]["total_processing_time"], 2),
-            "success_rate_percent": round(
-                (metrics_store["ocr_events"]["jobs_successful"] / metrics_store["ocr_events"]["jobs_total"]) * 100
-                if metrics_store["ocr_events"]["jobs_total"] > 0 else 100.0, 2
+            "jobs_total": ocr_metrics.jobs_total,
+            "jobs_successful": ocr_metrics.jobs_successful,
+            "jobs_failed": ocr_metrics.jobs_failed,
+            "total_processing_time_seconds": ocr_metrics.total_processing_time_ns / NS_PER_SECOND,
+            "success_rate_percent": (
+                (ocr_metrics.jobs_successful / ocr_metrics.jobs_total) * 100
+                if ocr_metrics.jobs_total > 0 else 100.0
             )
         },
-        "requests_by_endpoint": metrics_store["requests_by_endpoint"],
-        "requests_by_status": metrics_store["requests_by_status"],
-        "timestamp": datetime.now()
+        "requests_by_endpoint": requests_by_endpoint,
+        "requests_by_status": requests_by_status,
+        "timestamp": get_timestamp()
     }
 
 
 # Helper functions for other modules to update metrics
+def get_endpoint_label(request: Request) -> str:
+    """
+    Get the metrics label for a request: its route template (e.g.
+    /documents/{document_id}) when routed, so per-ID paths share one key.
+    """
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or request.url.path
+
+
 def record_request(endpoint: str, status_code: int, response_time: float):
-    """Record a request for metrics tracking"""
-    update_request_metrics(endpoint, status_code, response_time)
+    """Record a request for metrics tracking (applied on the next flush)"""
+    try:
+        buffer = _request_buffer.records
+    except AttributeError:
+        buffer = _request_buffer.records = deque()
+        with _metrics_lock:
+            _request_buffers.append((threading.current_thread(), buffer))
+    buffer.append((endpoint, status_code, response_time))
 
 
 def record_document_event(event_type: str, **kwargs):
@@ -8,12 +8,27 @@ Author: InsureCove Team
 Date: July 8, 2025
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, BackgroundTasks
-from fastapi.responses import JSONResponse
-from typing import List, Optional, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Header, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import List, Optional, Dict, Any, Annotated, Literal, AsyncIterator
+import asyncio
+import codecs
+import json
+import math
 import uuid
 from datetime import datetime
 
+import orjson
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.core.exceptions import OCRJobNotFoundError, RateLimitExceededError
+from app.models import BatchOCRRequest
+from app.utils.response_utils import ORJSONResponse, compute_etag, etag_matches
+from app.services.ocr_queue_service import OCRQueueService, get_ocr_queue_service
+from app.services.ocr_result_cache import OCRResultCache, get_ocr_result_cache
+from app.services.rate_limit_service import RateLimitService, get_rate_limit_service
+
 # TODO: Import models
 # from app.models import (
 #     OCRResultResponse, OCRProcessRequest, OCRJobResponse,
@@ -28,26 +43,197 @@ from datetime import datetime
 # from app.services.auth_client_service import get_current_user
 
 # TODO: Import core utilities
-# from app.core.exceptions import DocumentNotFoundError, OCRJobNotFoundError
-# from app.core.logging_config import get_logger
+# from app.core.exceptions import DocumentNotFoundError
+
+logger = get_logger(__name__)
+
+# Submissions and reads get separate per-worker concurrency budgets, so a
+# burst of OCR submissions cannot queue up status and result requests
+_write_slots = asyncio.Semaphore(settings.OCR_WRITE_MAX_CONCURRENCY)
+_read_slots = asyncio.Semaphore(settings.OCR_READ_MAX_CONCURRENCY)
+
+
+async def _hold_write_slot() -> AsyncIterator[None]:
+    async with _write_slots:
+        yield
+
+
+async def _hold_read_slot() -> AsyncIterator[None]:
+    async with _read_slots:
+        yield
+
+
+ocr_write_router = APIRouter(default_response_class=ORJSONResponse, dependencies=[Depends(_hold_write_slot)])
+ocr_read_router = APIRouter(default_response_class=ORJSONResponse, dependencies=[Depends(_hold_read_slot)])
+
+# OCR runs in queue workers; handlers only record and enqueue jobs
+OCRQueue = Annotated[OCRQueueService, Depends(get_ocr_queue_service)]
+OCRResults = Annotated[OCRResultCache, Depends(get_ocr_result_cache)]
+
+# Closed query value sets; Literal params are checked by set membership in the
+# compiled schema instead of a regex match per request
+OCRResultFormat = Literal["json", "txt", "markdown"]
+OCRAnalyticsPeriod = Literal["1d", "7d", "30d", "90d"]
+
+# Shared parameters; the Annotated form is resolved once per route and one
+# FieldInfo (and description string) serves every handler that uses it
+DocumentId = Annotated[uuid.UUID, Path(description="Document unique identifier")]
+OCRJobId = Annotated[uuid.UUID, Path(description="OCR job unique identifier")]
+ResultFormat = Annotated[OCRResultFormat, Query(description="Output format")]
+
+# Catalog payloads never change within a process, so they are serialized and
+# tagged once at import instead of per request
+_MODELS_BYTES = orjson.dumps({
+    "message": "OCR models endpoint - TODO: Implement",
+    "models": [
+        {
+            "id": "mistral-ocr-standard",
+            "name": "Mistral OCR Standard",
+            "capabilities": ["text", "tables"],
+            "languages": ["en", "es", "fr", "de"],
+            "accuracy": 0.95,
+            "speed": "fast"
+        }
+    ]
+})
+_MODELS_ETAG = compute_etag(_MODELS_BYTES, weak=False)
+
+_LANGS_BYTES = orjson.dumps({
+    "message": "Supported languages endpoint - TODO: Implement",
+    "languages": [
+        {"code": "en", "name": "English", "quality": "excellent"},
+        {"code": "es", "name": "Spanish", "quality": "excellent"},
+        {"code": "fr", "name": "French", "quality": "good"},
+        {"code": "de", "name": "German", "quality": "good"}
+    ]
+})
+_LANGS_ETAG = compute_etag(_LANGS_BYTES, weak=False)
+
+
+def _static_json_response(body: bytes, etag: str, if_none_match: Optional[str]) -> Response:
+    """Serve a pre-serialized payload, or 304 if the client already has it"""
+    headers = {"ETag": etag}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+# Media types for OCR result bodies; txt is the raw text, everything else
+# is the JSON result document
+_RESULT_MEDIA_TYPES = {
+    "txt": "text/plain; charset=utf-8",
+    "json": "application/json",
+    "markdown": "application/json",
+}
+
+
+async def _iter_ocr_text(document_id: str) -> AsyncIterator[bytes]:
+    """Yield a document's OCR text as UTF-8 byte chunks"""
+    # TODO: Stream the stored text via StorageService.stream_file(...),
+    #       which reads from S3 in DEFAULT_STREAM_CHUNK_SIZE pieces
+    yield b"Sample OCR text content..."
+
+
+async def _stream_ocr_json(fields: Dict[str, Any], text_chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Yield `fields` as a JSON object whose text_content is streamed.
+    
+    Each text chunk is escaped on its own, so only one chunk of the text
+    is held at a time. Chunks are decoded incrementally because a chunk
+    boundary can split a multi-byte UTF-8 character.
+    """
+    head = orjson.dumps(fields)[:-1]
+    yield head + (b',"text_content":"' if len(head) > 1 else b'"text_content":"')
+    
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    async for chunk in text_chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield orjson.dumps(text)[1:-1]
+    
+    yield orjson.dumps(decoder.decode(b"", final=True))[1:-1] + b'"}'
+
+
+def _immutable_result_headers(result_tag: str, variant: str) -> Dict[str, str]:
+    """Validator and caching headers for a completed, never-changing OCR result"""
+    return {
+        "ETag": compute_etag(result_tag, variant),
+        "Cache-Control": f"private, max-age={settings.OCR_CACHE_TTL_SECONDS}, immutable"
+    }
+
+
+async def _cache_while_streaming(
+    parts: AsyncIterator[bytes],
+    result_cache: OCRResultCache,
+    document_id: str,
+    variant: str
+) -> AsyncIterator[bytes]:
+    """
+    Pass body parts through, caching the whole body once it has been sent.
+    
+    Bodies over OCR_RESULT_CACHE_MAX_BYTES are not cached, so a large
+    result is never buffered in full.
+    """
+    buffered: Optional[List[bytes]] = []
+    size = 0
+    async for part in parts:
+        if buffered is not None:
+            size += len(part)
+            if size <= settings.OCR_RESULT_CACHE_MAX_BYTES:
+                buffered.append(part)
+            else:
+                buffered = None
+        yield part
+    
+    if buffered is not None:
+        await result_cache.set(document_id, variant, b"".join(buffered))
+
+
+async def charge_ocr_quota(request: Request, rate_limiter: RateLimitService, cost: int = 1) -> None:
+    """
+    Charge `cost` units against OCR_RATE_LIMIT_PER_HOUR per user and endpoint.
+    
+    Every accepted document becomes paid Mistral work, so requests over the
+    quota are refused with 429 before anything is queued.
+    """
+    user_id = None  # TODO: current_user["user"]["user_id"]
+    client = f"user:{user_id}" if user_id else f"ip:{request.client.host if request.client else 'unknown'}"
+    route = request.scope.get("route")
+    endpoint = getattr(route, "path", None) or request.url.path
+    
+    retry_after = await rate_limiter.hit(
+        f"ocr:{client}:{endpoint}", settings.OCR_RATE_LIMIT_PER_HOUR, 3600, cost=cost
+    )
+    if retry_after:
+        raise RateLimitExceededError("OCR request quota exceeded", retry_after=math.ceil(retry_after))
+
+
+async def check_ocr_quota(
+    request: Request,
+    rate_limiter: Annotated[RateLimitService, Depends(get_rate_limit_service)]
+) -> None:
+    """Dependency charging one unit for single-document OCR requests"""
+    await charge_ocr_quota(request, rate_limiter)
 
-router = APIRouter()
-# logger = get_logger(__name__)
+
+# Handlers that do not await anything are plain `def`, so FastAPI runs them in
+# its threadpool and sync SDK calls added to them (mistralai, boto3) cannot
+# stall the event loop. Make a handler `async def` only once it awaits.
 
 
 # ============= OCR PROCESSING ENDPOINTS =============
 
-@router.post(
+@ocr_write_router.post(
     "/documents/{document_id}/process",
     # response_model=OCRJobResponse,
     status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(check_ocr_quota)],
     summary="Start OCR Processing",
     description="Start OCR processing for a document",
     tags=["ocr"]
 )
 async def process_document_ocr(
-    background_tasks: BackgroundTasks,
-    document_id: uuid.UUID = Path(..., description="Document unique identifier"),
+    ocr_queue: OCRQueue,
+    document_id: DocumentId,
     # ocr_request: OCRProcessRequest,
     priority: int = Query(5, ge=1, le=10, description="Processing priority (1=highest)"),
     # current_user: Dict[str, Any] = Depends(get_current_user)
@@ -65,21 +251,21 @@ async def process_document_ocr(
     # TODO: Verify document exists and user has access
     # TODO: Check if OCR already in progress
     # TODO: Validate OCR request parameters
-    # TODO: Create OCR job record
-    # TODO: Queue background processing task
-    # TODO: Return job response with tracking ID
+    
+    # Record the job and hand it to the OCR workers; nothing runs in-process
+    user_id = None  # TODO: current_user["user"]["user_id"]
+    job = (await ocr_queue.enqueue_jobs([str(document_id)], user_id, priority))[0]
     
     return {
-        "message": "OCR processing endpoint - TODO: Implement",
+        "job_id": job["job_id"],
         "document_id": document_id,
         "priority": priority,
-        "job_id": str(uuid.uuid4()),
-        "status": "pending",
-        "estimated_completion": "2024-07-08T15:30:00Z"
+        "status": job["status"],
+        "queued_at": job["queued_at"]
     }
 
 
-@router.post(
+@ocr_write_router.post(
     "/batch",
     # response_model=BatchOCRResponse,
     status_code=status.HTTP_202_ACCEPTED,
@@ -88,8 +274,10 @@ async def process_document_ocr(
     tags=["ocr"]
 )
 async def process_batch_ocr(
-    # batch_request: BatchOCRRequest,
-    background_tasks: BackgroundTasks,
+    request: Request,
+    batch_request: BatchOCRRequest,
+    ocr_queue: OCRQueue,
+    rate_limiter: Annotated[RateLimitService, Depends(get_rate_limit_service)],
     # current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
@@ -102,23 +290,26 @@ async def process_batch_ocr(
     - **Cost optimization**: Batch pricing and processing optimization
     """
     
-    # TODO: Validate all documents exist and user has access
-    # TODO: Check processing quotas and limits
-    # TODO: Create batch job record
-    # TODO: Queue individual OCR tasks
-    # TODO: Return batch job response
+    user_id = None  # TODO: current_user["user"]["user_id"]
+    document_ids = [str(document_id) for document_id in batch_request.document_ids]
     
-    return {
-        "message": "Batch OCR processing endpoint - TODO: Implement",
-        "batch_id": str(uuid.uuid4()),
-        "document_count": 0,
-        "estimated_completion": "2024-07-08T16:00:00Z"
-    }
+    # Each document is paid OCR work, so the batch costs one unit per document
+    await charge_ocr_quota(request, rate_limiter, cost=len(document_ids))
+    
+    # TODO: Replace with DocumentService.check_batch_access(document_ids, user_id),
+    #       which checks documents concurrently and reports failures per document
+    errors: List[Dict[str, Any]] = []
+    
+    # One queued job per OCR_BATCH_SIZE documents, all in one round trip;
+    # inaccessible documents are reported instead of failing the batch
+    batch = await ocr_queue.enqueue_batch(document_ids, user_id, batch_request.priority)
+    batch["errors"] = errors
+    return batch
 
 
 # ============= OCR RESULTS ENDPOINTS =============
 
-@router.get(
+@ocr_read_router.get(
     "/documents/{document_id}/results",
     # response_model=OCRResultResponse,
     summary="Get OCR Results",
@@ -126,11 +317,13 @@ async def process_batch_ocr(
     tags=["ocr"]
 )
 async def get_ocr_results(
-    document_id: uuid.UUID = Path(..., description="Document unique identifier"),
-    format: str = Query("json", regex="^(json|txt|markdown)$", description="Output format"),
+    result_cache: OCRResults,
+    document_id: DocumentId,
+    format: ResultFormat = "json",
     include_confidence: bool = Query(True, description="Include confidence scores"),
     include_tables: bool = Query(False, description="Include extracted table data"),
     include_images: bool = Query(False, description="Include extracted images"),
+    if_none_match: Annotated[Optional[str], Header(description="ETag from a previous response")] = None,
     # current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
@@ -144,13 +337,23 @@ async def get_ocr_results(
     """
     
     # TODO: Verify document exists and user has access
+    
+    # Completed results never change: a matching ETag is answered from the
+    # cached result tag alone, and a hit is served as stored bytes
+    media_type = _RESULT_MEDIA_TYPES[format]
+    variant = OCRResultCache.variant(format, include_confidence, include_tables, include_images)
+    cached, result_tag = await result_cache.lookup(str(document_id), variant)
+    headers = _immutable_result_headers(result_tag, variant) if result_tag else {}
+    if headers and etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if cached is not None:
+        return Response(content=cached, media_type=media_type, headers=headers)
+    
     # TODO: Check if OCR results are available
-    # TODO: Retrieve results from cache or storage
     # TODO: Format results according to request
     # TODO: Add confidence and metadata
-    # TODO: Return formatted OCR results
     
-    return {
+    result = {
         "message": "OCR results endpoint - TODO: Implement",
         "document_id": document_id,
         "format": format,
@@ -158,12 +361,25 @@ async def get_ocr_results(
         "include_tables": include_tables,
         "include_images": include_images,
         "status": "completed",
-        "text_content": "Sample OCR text content...",
         "confidence_score": 0.95
     }
+    
+    # Text can run to megabytes, so it is streamed from storage rather than
+    # built into the response in memory; txt skips JSON entirely
+    text_chunks = _iter_ocr_text(str(document_id))
+    body = text_chunks if format == "txt" else _stream_ocr_json(result, text_chunks)
+    
+    # Only completed results are cacheable
+    if result["status"] == "completed":
+        result_tag = result_tag or await result_cache.get_result_tag(str(document_id))
+        if result_tag:
+            headers = _immutable_result_headers(result_tag, variant)
+        body = _cache_while_streaming(body, result_cache, str(document_id), variant)
+    
+    return StreamingResponse(body, media_type=media_type, headers=headers)
 
 
-@router.get(
+@ocr_read_router.get(
     "/jobs/{job_id}",
     # response_model=OCRJobResponse,
     summary="Get OCR Job Status",
@@ -171,7 +387,8 @@ async def get_ocr_results(
     tags=["ocr"]
 )
 async def get_ocr_job_status(
-    job_id: uuid.UUID = Path(..., description="OCR job unique identifier"),
+    ocr_queue: OCRQueue,
+    job_id: OCRJobId,
     # current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
@@ -184,32 +401,27 @@ async def get_ocr_job_status(
     - **Queue position**: Position in processing queue
     """
     
-    # TODO: Verify job exists and user has access
-    # TODO: Get job status from processing queue
+    # TODO: Verify user has access to the job
     # TODO: Calculate progress and ETA
-    # TODO: Include error details if failed
-    # TODO: Return job status response
     
-    return {
-        "message": "OCR job status endpoint - TODO: Implement",
-        "job_id": job_id,
-        "status": "processing",
-        "progress_percentage": 75.0,
-        "estimated_completion": "2024-07-08T15:35:00Z",
-        "queue_position": 2
-    }
+    # Workers update the job record as they progress
+    job = await ocr_queue.get_job(job_id.hex)
+    if job is None:
+        raise OCRJobNotFoundError(job_id.hex)
+    
+    return job
 
 
-@router.get(
+@ocr_read_router.get(
     "/jobs/{job_id}/results",
     # response_model=OCRResultResponse,
     summary="Get Job Results",
     description="Get OCR results by job ID",
     tags=["ocr"]
 )
-async def get_job_results(
-    job_id: uuid.UUID = Path(..., description="OCR job unique identifier"),
-    format: str = Query("json", regex="^(json|txt|markdown)$", description="Output format"),
+def get_job_results(
+    job_id: OCRJobId,
+    format: ResultFormat = "json",
     # current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
@@ -237,15 +449,15 @@ async def get_job_results(
 
 # ============= OCR MANAGEMENT ENDPOINTS =============
 
-@router.delete(
+@ocr_write_router.delete(
     "/jobs/{job_id}",
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Cancel OCR Job",
     description="Cancel a pending or running OCR job",
     tags=["ocr"]
 )
-async def cancel_ocr_job(
-    job_id: uuid.UUID = Path(..., description="OCR job unique identifier"),
+def cancel_ocr_job(
+    job_id: OCRJobId,
     # current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
@@ -264,13 +476,11 @@ async def cancel_ocr_job(
     # TODO: Update job status
     # TODO: Log cancellation event
     
-    return {
-        "message": "Cancel OCR job endpoint - TODO: Implement",
-        "job_id": job_id
-    }
+    logger.info("OCR job cancellation requested", extra={"job_id": str(job_id)})
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
-@router.post(
+@ocr_write_router.post(
     "/jobs/{job_id}/retry",
     # response_model=OCRJobResponse,
     summary="Retry Failed OCR Job",
@@ -278,8 +488,9 @@ async def cancel_ocr_job(
     tags=["ocr"]
 )
 async def retry_ocr_job(
-    background_tasks: BackgroundTasks,
-    job_id: uuid.UUID = Path(..., description="OCR job unique identifier"),
+    ocr_queue: OCRQueue,
+    result_cache: OCRResults,
+    job_id: OCRJobId,
     # current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
@@ -292,10 +503,21 @@ async def retry_ocr_job(
     - **Audit trail**: Track retry attempts and outcomes
     """
     
-    # TODO: Verify job exists and user has access
+    # TODO: Verify user has access to the job
+    job = await ocr_queue.get_job(job_id.hex)
+    if job is None:
+        raise OCRJobNotFoundError(job_id.hex)
+    
+    # A retry produces new results, so cached renderings must not outlive it
+    if job.get("document_id"):
+        document_ids = [job["document_id"]]
+    else:
+        document_ids = json.loads(job.get("document_ids") or "[]")
+    await result_cache.invalidate(*document_ids)
+    
     # TODO: Check if job is in failed state
     # TODO: Reset job status and progress
-    # TODO: Queue retry processing task
+    # TODO: Re-queue via await ocr_queue.enqueue_jobs(document_ids, ...)
     # TODO: Return updated job response
     
     return {
@@ -308,13 +530,14 @@ async def retry_ocr_job(
 
 # ============= OCR QUEUE MANAGEMENT =============
 
-@router.get(
+@ocr_read_router.get(
     "/queue",
     summary="Get OCR Queue Status",
     description="Get current OCR processing queue status",
     tags=["ocr"]
 )
 async def get_ocr_queue_status(
+    ocr_queue: OCRQueue,
     # current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
@@ -327,78 +550,81 @@ async def get_ocr_queue_status(
     - **System health**: OCR service health status
     """
     
-    # TODO: Get queue statistics
-    # TODO: Calculate wait times
     # TODO: Check system health
-    # TODO: Return queue status
+    
+    # Counters are maintained as jobs move, so this is one MGET at any depth
+    stats = await ocr_queue.get_queue_stats()
+    total_slots = settings.MAX_CONCURRENT_TASKS
     
     return {
-        "message": "OCR queue status endpoint - TODO: Implement",
-        "queue_length": 15,
+        "queue_length": stats["pending"],
         "processing_capacity": {
-            "total_slots": 10,
-            "used_slots": 7,
-            "available_slots": 3
+            "total_slots": total_slots,
+            "used_slots": stats["running"],
+            "available_slots": max(total_slots - stats["running"], 0)
         },
-        "estimated_wait_time_minutes": 8,
+        "completed_last_minute": stats["completed_last_minute"],
+        "estimated_wait_time_minutes": stats["estimated_wait_minutes"],
         "system_health": "healthy"
     }
 
 
-@router.get(
+@ocr_read_router.get(
     "/jobs",
     summary="List User OCR Jobs",
     description="List OCR jobs for the current user",
     tags=["ocr"]
 )
 async def list_user_ocr_jobs(
+    ocr_queue: OCRQueue,
     status: Optional[str] = Query(None, description="Filter by job status"),
     limit: int = Query(20, ge=1, le=100, description="Maximum number of jobs to return"),
-    offset: int = Query(0, ge=0, description="Number of jobs to skip"),
-    sort_by: str = Query("created_at", description="Sort field"),
-    sort_order: str = Query("desc", regex="^(asc|desc)$", description="Sort order"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    sort_by: Literal["created_at"] = Query("created_at", description="Sort field"),
+    sort_order: Literal["asc", "desc"] = Query("desc", description="Sort order"),
     # current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
     List user's OCR jobs with filtering and pagination:
     
     - **Status filtering**: Filter by job status (pending, processing, completed, failed)
-    - **Pagination**: Efficient pagination for large job lists
-    - **Sorting**: Flexible sorting options
+    - **Pagination**: Keyset cursor pagination on (created_at, id)
+    - **Sorting**: Newest or oldest first
     - **Job summary**: Essential job information and status
     - **Quick actions**: Links to results and management actions
     """
     
-    # TODO: Get user's OCR jobs
-    # TODO: Apply status filter
-    # TODO: Apply pagination and sorting
-    # TODO: Return job list
+    user_id = None  # TODO: current_user["user"]["user_id"]
+    page: Dict[str, Any] = {"jobs": [], "next_cursor": None, "total_count": 0}
+    if user_id:
+        page = await ocr_queue.list_user_jobs(user_id, limit, cursor, sort_order, status)
     
-    return {
-        "message": "List OCR jobs endpoint - TODO: Implement",
+    # Returned as a response object so job pages skip jsonable_encoder
+    return ORJSONResponse({
         "filters": {
             "status": status,
-            "user_id": "current_user_id"
+            "user_id": user_id
         },
         "pagination": {
             "limit": limit,
-            "offset": offset,
-            "total_count": 0
+            "next_cursor": page["next_cursor"],
+            "has_more": page["next_cursor"] is not None,
+            "total_count": page["total_count"]
         },
-        "jobs": []
-    }
+        "jobs": page["jobs"]
+    })
 
 
 # ============= OCR ANALYTICS ENDPOINTS =============
 
-@router.get(
+@ocr_read_router.get(
     "/analytics",
     summary="Get OCR Analytics",
     description="Get OCR processing analytics and statistics",
     tags=["ocr"]
 )
-async def get_ocr_analytics(
-    period: str = Query("30d", regex="^(1d|7d|30d|90d)$", description="Analytics period"),
+def get_ocr_analytics(
+    period: OCRAnalyticsPeriod = Query("30d", description="Analytics period"),
     # current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
@@ -431,13 +657,15 @@ async def get_ocr_analytics(
 
 # ============= OCR CONFIGURATION ENDPOINTS =============
 
-@router.get(
+@ocr_read_router.get(
     "/models",
     summary="List Available OCR Models",
     description="Get list of available OCR models and their capabilities",
     tags=["ocr"]
 )
-async def list_ocr_models():
+def list_ocr_models(
+    if_none_match: Annotated[Optional[str], Header(description="ETag from a previous response")] = None
+):
     """
     List available OCR models and their features:
     
@@ -452,28 +680,18 @@ async def list_ocr_models():
     # TODO: Include model capabilities and pricing
     # TODO: Return model list
     
-    return {
-        "message": "OCR models endpoint - TODO: Implement",
-        "models": [
-            {
-                "id": "mistral-ocr-standard",
-                "name": "Mistral OCR Standard",
-                "capabilities": ["text", "tables"],
-                "languages": ["en", "es", "fr", "de"],
-                "accuracy": 0.95,
-                "speed": "fast"
-            }
-        ]
-    }
+    return _static_json_response(_MODELS_BYTES, _MODELS_ETAG, if_none_match)
 
 
-@router.get(
+@ocr_read_router.get(
     "/languages",
     summary="List Supported Languages",
     description="Get list of supported OCR languages",
     tags=["ocr"]
 )
-async def list_supported_languages():
+def list_supported_languages(
+    if_none_match: Annotated[Optional[str], Header(description="ETag from a previous response")] = None
+):
     """
     List supported OCR languages:
     
@@ -488,15 +706,7 @@ async def list_supported_languages():
     # TODO: Include quality ratings
     # TODO: Return language list
     
-    return {
-        "message": "Supported languages endpoint - TODO: Implement",
-        "languages": [
-            {"code": "en", "name": "English", "quality": "excellent"},
-            {"code": "es", "name": "Spanish", "quality": "excellent"},
-            {"code": "fr", "name": "French", "quality": "good"},
-            {"code": "de", "name": "German", "quality": "good"}
-        ]
-    }
+    return _static_json_response(_LANGS_BYTES, _LANGS_ETAG, if_none_match)
 
 
 # TODO: Add OCR quality assessment endpoints
@@ -505,3 +715,9 @@ async def list_supported_languages():
 # TODO: Add OCR workflow automation
 # TODO: Add OCR comparison and validation
 # TODO: Add OCR export functionality
+
+
+# Both routers are served under the same prefix as a single router
+router = APIRouter()
+router.include_router(ocr_write_router)
+router.include_router(ocr_read_router)
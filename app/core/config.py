@@ -8,9 +8,11 @@ Author: InsureCove Team
 Date: July 8, 2025
 """
 
+from pydantic import PrivateAttr, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List, Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, Literal, FrozenSet
 from enum import Enum
+import functools
 import os
 
 
@@ -28,6 +30,26 @@ class StorageType(str, Enum):
     S3 = "s3"
 
 
+def cached_config(method: Callable[["Settings"], Dict[str, Any]]) -> Callable[["Settings"], Dict[str, Any]]:
+    """
+    Memoize a get_*_config method per Settings instance.
+    
+    Settings do not change at runtime, so each config dict is built once;
+    callers must treat it as read-only. Settings.refresh() drops the cache.
+    """
+    name = method.__name__
+    
+    @functools.wraps(method)
+    def wrapper(self: "Settings") -> Dict[str, Any]:
+        try:
+            return self._config_cache[name]
+        except KeyError:
+            config = self._config_cache[name] = method(self)
+            return config
+    
+    return wrapper
+
+
 class LogLevel(str, Enum):
     """Logging levels"""
     DEBUG = "DEBUG"
@@ -40,11 +62,15 @@ class LogLevel(str, Enum):
 class Settings(BaseSettings):
     """Application configuration settings"""
     
+    # Frozen because @cached_config dicts would go stale on mutation; defaults
+    # are already of their field types, so only env/init values are validated
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
         case_sensitive=True,
-        extra="ignore"
+        extra="ignore",
+        frozen=True,
+        validate_default=False
     )
     
     # ============= APPLICATION SETTINGS =============
@@ -60,19 +86,22 @@ class Settings(BaseSettings):
     # ============= SERVER SETTINGS =============
     HOST: str = "0.0.0.0"
     PORT: int = 8000
-    WORKERS: int = 1
+    WORKERS: int = os.cpu_count() or 1  # Async workers: one per core
     RELOAD: bool = True
+    LOOP: Literal["uvloop", "asyncio"] = "uvloop"
+    HTTP_PARSER: Literal["httptools", "h11"] = "httptools"
     
     # TODO: Add SSL configuration
     # TODO: Add server timeout settings
     
     # ============= SECURITY SETTINGS =============
     SECRET_KEY: str = "dev-secret-key-change-in-production"
-    ALLOWED_HOSTS: List[str] = ["*"]
-    CORS_ORIGINS: List[str] = ["*"]
+    # Membership-tested per request, so these are sets rather than lists
+    ALLOWED_HOSTS: FrozenSet[str] = frozenset({"*"})
+    CORS_ORIGINS: FrozenSet[str] = frozenset({"*"})
     CORS_CREDENTIALS: bool = True
-    CORS_METHODS: List[str] = ["*"]
-    CORS_HEADERS: List[str] = ["*"]
+    CORS_METHODS: FrozenSet[str] = frozenset({"*"})
+    CORS_HEADERS: FrozenSet[str] = frozenset({"*"})
     
     # ============= AUTHENTICATION SERVICE =============
     AUTH_SERVICE_URL: str = "http://localhost:8000"  # Auth microservice URL
@@ -102,8 +131,9 @@ class Settings(BaseSettings):
     AWS_SESSION_TOKEN: Optional[str] = None
     AWS_S3_BUCKET: str = "insurecove-documents"
     AWS_S3_PREFIX: str = "documents/"
+    ENABLE_AWS_SECRETS: bool = False  # Load secrets from AWS Secrets Manager at startup
+    SECRETS_REFRESH_INTERVAL_SECONDS: float = 240.0  # Kept below the 5-minute secrets cache TTL
     
-    # TODO: Add AWS Secrets Manager configuration
     # TODO: Add S3 encryption settings
     # TODO: Add IAM role configuration
     
@@ -111,9 +141,12 @@ class Settings(BaseSettings):
     STORAGE_TYPE: StorageType = StorageType.LOCAL
     LOCAL_STORAGE_PATH: str = "./storage"
     MAX_FILE_SIZE_MB: int = 50
-    ALLOWED_FILE_TYPES: List[str] = ["pdf", "jpeg", "jpg", "png", "tiff", "tif"]
+    ALLOWED_FILE_TYPES: FrozenSet[str] = frozenset({"pdf", "jpeg", "jpg", "png", "tiff", "tif"})
     UPLOAD_TIMEOUT_SECONDS: int = 300
+    MAX_CONCURRENT_UPLOADS: int = 16  # Per-worker cap on in-flight batch file uploads
     DOWNLOAD_URL_EXPIRY_HOURS: int = 24
+    DOWNLOAD_OFFLOAD_HEADER: Optional[str] = None  # "X-Accel-Redirect" (nginx) or "X-Sendfile"; unset streams through the app
+    DOWNLOAD_OFFLOAD_PREFIX: str = "/_protected/"  # Internal proxy location the storage key is appended to
     
     # TODO: Add file compression settings
     # TODO: Add thumbnail generation settings
@@ -126,6 +159,10 @@ class Settings(BaseSettings):
     OCR_TIMEOUT_SECONDS: int = 300
     OCR_MAX_RETRIES: int = 3
     OCR_BATCH_SIZE: int = 10
+    MISTRAL_POOL_SIZE: int = 50  # Max concurrent connections to the Mistral API
+    MISTRAL_KEEPALIVE: int = 20  # Idle connections kept open for reuse
+    OCR_WRITE_MAX_CONCURRENCY: int = 32  # Per-worker cap on in-flight OCR submit/retry/cancel requests
+    OCR_READ_MAX_CONCURRENCY: int = 200  # Per-worker cap on in-flight OCR status/result/catalog requests
     
     # TODO: Add OCR quality settings
     # TODO: Add language configuration
@@ -135,6 +172,7 @@ class Settings(BaseSettings):
     REDIS_URL: str = "redis://localhost:6379"
     CACHE_TTL_SECONDS: int = 3600
     OCR_CACHE_TTL_SECONDS: int = 86400
+    OCR_RESULT_CACHE_MAX_BYTES: int = 1 << 20  # Larger OCR result bodies are streamed but not cached
     DOCUMENT_CACHE_TTL_SECONDS: int = 1800
     CACHE_MAX_CONNECTIONS: int = 50
     
@@ -155,6 +193,12 @@ class Settings(BaseSettings):
     ENABLE_METRICS: bool = True
     METRICS_PORT: int = 9090
     HEALTH_CHECK_TIMEOUT: int = 30
+    HEALTH_CACHE_TTL_SECONDS: float = 5.0  # Reuse dependency probe results for this long
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = 2.0  # Probes slower than this report UNHEALTHY
+    HEALTH_PROBE_TIMEOUTS: Dict[str, float] = {}  # Per-service overrides, e.g. {"mistral_ai_ocr": 5}
+    ENABLE_SYSTEM_METRICS: bool = True  # Collect host CPU/memory/disk metrics (imports psutil)
+    SYSTEM_METRICS_INTERVAL_SECONDS: float = 2.0  # Background CPU/memory/disk snapshot period
+    METRICS_FLUSH_INTERVAL_SECONDS: float = 0.5  # Period for merging buffered request metrics
     LOG_JSON_FORMAT: bool = False
     SENTRY_DSN: Optional[str] = None
     
@@ -188,6 +232,25 @@ class Settings(BaseSettings):
     # TODO: Add A/B testing configuration
     # TODO: Add experimental features
     
+    # get_*_config results, filled by @cached_config
+    _config_cache: Dict[str, Dict[str, Any]] = PrivateAttr(default_factory=dict)
+    
+    def refresh(self) -> None:
+        """Drop memoized config dicts so they are rebuilt from current values"""
+        self._config_cache.clear()
+    
+    @field_validator("ALLOWED_FILE_TYPES", "ALLOWED_HOSTS")
+    @classmethod
+    def lowercase_values(cls, values: FrozenSet[str]) -> FrozenSet[str]:
+        """Normalize case once so lookups only lowercase the candidate"""
+        return frozenset(value.lower() for value in values)
+    
+    @field_validator("DOWNLOAD_OFFLOAD_HEADER", mode="before")
+    @classmethod
+    def blank_as_unset(cls, value: Optional[str]) -> Optional[str]:
+        """Treat an empty env value (`NAME=`) as unset"""
+        return value or None
+    
     @property
     def is_development(self) -> bool:
         """Check if running in development environment"""
@@ -209,6 +272,7 @@ class Settings(BaseSettings):
         # TODO: Add connection pooling parameters
         return self.DATABASE_URL or "sqlite:///./document_service.db"
     
+    @cached_config
     def get_redis_config(self) -> Dict[str, Any]:
         """Get Redis configuration"""
         # TODO: Parse Redis URL into components
@@ -219,6 +283,7 @@ class Settings(BaseSettings):
             "decode_responses": True
         }
     
+    @cached_config
     def get_aws_config(self) -> Dict[str, Any]:
         """Get AWS configuration"""
         # TODO: Add STS token support
@@ -238,6 +303,7 @@ class Settings(BaseSettings):
         
         return config
     
+    @cached_config
     def get_storage_config(self) -> Dict[str, Any]:
         """Get storage configuration"""
         # TODO: Add storage-specific settings
@@ -254,6 +320,7 @@ class Settings(BaseSettings):
                 "path": self.LOCAL_STORAGE_PATH
             }
     
+    @cached_config
     def get_cors_config(self) -> Dict[str, Any]:
         """Get CORS configuration"""
         # TODO: Add environment-specific CORS settings
@@ -264,6 +331,7 @@ class Settings(BaseSettings):
             "allow_headers": self.CORS_HEADERS
         }
     
+    @cached_config
     def get_ocr_config(self) -> Dict[str, Any]:
         """Get OCR service configuration"""
         # TODO: Add OCR model configuration
@@ -279,8 +347,7 @@ class Settings(BaseSettings):
     
     # TODO: Add validation methods
     # TODO: Add configuration loading from AWS Secrets
-    # TODO: Add configuration caching
-    # TODO: Add configuration refresh mechanism
+    # TODO: Add configuration refresh mechanism (reload values, then refresh())
 
 
 # Global settings instance
@@ -8,52 +8,72 @@ Author: InsureCove Team
 Date: July 8, 2025
 """
 
-from typing import Optional, Dict, Any, List
-from datetime import datetime
+from typing import Optional, Dict, Any, Final, List
+from datetime import datetime, timezone
+import time
 import uuid
-from enum import Enum
 
+from app.utils.date_utils import format_utc_timestamp
 
-class ErrorType(str, Enum):
-    """Standard error type URIs"""
+
+class ErrorType:
+    """
+    Standard error type URIs.
+    
+    Plain str constants rather than an Enum: they go into every problem
+    dict, and orjson encodes str directly without an Enum member lookup.
+    """
     # Generic errors
-    VALIDATION_ERROR = "https://insurecove.com/problems/validation-error"
-    AUTHENTICATION_ERROR = "https://insurecove.com/problems/authentication-error"
-    AUTHORIZATION_ERROR = "https://insurecove.com/problems/authorization-error"
-    NOT_FOUND_ERROR = "https://insurecove.com/problems/not-found"
-    CONFLICT_ERROR = "https://insurecove.com/problems/conflict"
-    RATE_LIMIT_ERROR = "https://insurecove.com/problems/rate-limit-exceeded"
+    VALIDATION_ERROR: Final[str] = "https://insurecove.com/problems/validation-error"
+    AUTHENTICATION_ERROR: Final[str] = "https://insurecove.com/problems/authentication-error"
+    AUTHORIZATION_ERROR: Final[str] = "https://insurecove.com/problems/authorization-error"
+    NOT_FOUND_ERROR: Final[str] = "https://insurecove.com/problems/not-found"
+    CONFLICT_ERROR: Final[str] = "https://insurecove.com/problems/conflict"
+    PRECONDITION_FAILED: Final[str] = "https://insurecove.com/problems/precondition-failed"
+    RANGE_NOT_SATISFIABLE: Final[str] = "https://insurecove.com/problems/range-not-satisfiable"
+    RATE_LIMIT_ERROR: Final[str] = "https://insurecove.com/problems/rate-limit-exceeded"
     
     # Document-specific errors
-    DOCUMENT_NOT_FOUND = "https://insurecove.com/problems/document-not-found"
-    DOCUMENT_TOO_LARGE = "https://insurecove.com/problems/document-too-large"
-    INVALID_DOCUMENT_TYPE = "https://insurecove.com/problems/invalid-document-type"
-    DOCUMENT_PROCESSING_ERROR = "https://insurecove.com/problems/document-processing-error"
-    DOCUMENT_UPLOAD_ERROR = "https://insurecove.com/problems/document-upload-error"
+    DOCUMENT_NOT_FOUND: Final[str] = "https://insurecove.com/problems/document-not-found"
+    DOCUMENT_TOO_LARGE: Final[str] = "https://insurecove.com/problems/document-too-large"
+    INVALID_DOCUMENT_TYPE: Final[str] = "https://insurecove.com/problems/invalid-document-type"
+    DOCUMENT_PROCESSING_ERROR: Final[str] = "https://insurecove.com/problems/document-processing-error"
+    DOCUMENT_UPLOAD_ERROR: Final[str] = "https://insurecove.com/problems/document-upload-error"
     
     # OCR-specific errors
-    OCR_SERVICE_UNAVAILABLE = "https://insurecove.com/problems/ocr-service-unavailable"
-    OCR_PROCESSING_FAILED = "https://insurecove.com/problems/ocr-processing-failed"
-    OCR_JOB_NOT_FOUND = "https://insurecove.com/problems/ocr-job-not-found"
-    OCR_TIMEOUT = "https://insurecove.com/problems/ocr-timeout"
+    OCR_SERVICE_UNAVAILABLE: Final[str] = "https://insurecove.com/problems/ocr-service-unavailable"
+    OCR_PROCESSING_FAILED: Final[str] = "https://insurecove.com/problems/ocr-processing-failed"
+    OCR_JOB_NOT_FOUND: Final[str] = "https://insurecove.com/problems/ocr-job-not-found"
+    OCR_TIMEOUT: Final[str] = "https://insurecove.com/problems/ocr-timeout"
     
     # Storage errors
-    STORAGE_ERROR = "https://insurecove.com/problems/storage-error"
-    STORAGE_QUOTA_EXCEEDED = "https://insurecove.com/problems/storage-quota-exceeded"
+    STORAGE_ERROR: Final[str] = "https://insurecove.com/problems/storage-error"
+    STORAGE_QUOTA_EXCEEDED: Final[str] = "https://insurecove.com/problems/storage-quota-exceeded"
     
     # Service errors
-    INTERNAL_SERVER_ERROR = "https://insurecove.com/problems/internal-server-error"
-    SERVICE_UNAVAILABLE = "https://insurecove.com/problems/service-unavailable"
-    EXTERNAL_SERVICE_ERROR = "https://insurecove.com/problems/external-service-error"
+    INTERNAL_SERVER_ERROR: Final[str] = "https://insurecove.com/problems/internal-server-error"
+    SERVICE_UNAVAILABLE: Final[str] = "https://insurecove.com/problems/service-unavailable"
+    EXTERNAL_SERVICE_ERROR: Final[str] = "https://insurecove.com/problems/external-service-error"
     
     # Configuration and secrets errors
-    CONFIGURATION_ERROR = "https://insurecove.com/problems/configuration-error"
-    SECRETS_MANAGER_ERROR = "https://insurecove.com/problems/secrets-manager-error"
+    CONFIGURATION_ERROR: Final[str] = "https://insurecove.com/problems/configuration-error"
+    SECRETS_MANAGER_ERROR: Final[str] = "https://insurecove.com/problems/secrets-manager-error"
+
+
+# Merged into problem dicts for absent optional members; never mutated
+_NO_FIELDS: Dict[str, Any] = {}
 
 
 class APIException(Exception):
     """Base API exception following RFC 9457 Problem Details specification"""
     
+    # Subclasses declare empty __slots__ so attributes stay in slots and
+    # no per-instance __dict__ is allocated
+    __slots__ = (
+        'status_code', 'title', 'detail', 'type', 'instance', 'errors',
+        'extra_data', '_reported_at', '_request_id'
+    )
+    
     def __init__(
         self,
         status_code: int,
@@ -70,33 +90,48 @@ class APIException(Exception):
         self.type = type_uri
         self.instance = instance
         self.errors = errors or []
-        self.timestamp = datetime.utcnow()
-        self.request_id = str(uuid.uuid4())
         self.extra_data = kwargs
+        # Filled on first read; many exceptions are caught and never rendered
+        self._reported_at: Optional[float] = None
+        self._request_id: Optional[str] = None
         
         super().__init__(detail)
     
+    @property
+    def reported_at(self) -> float:
+        """Epoch seconds when the problem was first reported"""
+        if self._reported_at is None:
+            self._reported_at = time.time()
+        return self._reported_at
+    
+    @property
+    def timestamp(self) -> datetime:
+        """When the problem was first reported (UTC)"""
+        return datetime.fromtimestamp(self.reported_at, timezone.utc)
+    
+    @property
+    def request_id(self) -> str:
+        """Identifier of this problem occurrence"""
+        if self._request_id is None:
+            self._request_id = str(uuid.uuid4())
+        return self._request_id
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert exception to RFC 9457 compliant dictionary"""
-        problem_detail = {
+        # One literal: the ** merges size the dict once instead of growing it.
+        # Copying a per-class {type, title, status} skeleton and assigning the
+        # rest is slower, and those members can differ per instance anyway
+        return {
             "type": self.type,
             "title": self.title,
             "status": self.status_code,
             "detail": self.detail,
-            "timestamp": self.timestamp.isoformat(),
-            "request_id": self.request_id
+            "timestamp": format_utc_timestamp(self.reported_at),
+            "request_id": self.request_id,
+            **({"instance": self.instance} if self.instance else _NO_FIELDS),
+            **({"errors": self.errors} if self.errors else _NO_FIELDS),
+            **self.extra_data
         }
-        
-        if self.instance:
-            problem_detail["instance"] = self.instance
-        
-        if self.errors:
-            problem_detail["errors"] = self.errors
-        
-        # Add any extra data
-        problem_detail.update(self.extra_data)
-        
-        return problem_detail
 
 
 # ============= AUTHENTICATION & AUTHORIZATION EXCEPTIONS =============
@@ -104,6 +139,8 @@ class APIException(Exception):
 class AuthenticationError(APIException):
     """Authentication required or failed"""
     
+    __slots__ = ()
+    
     def __init__(self, detail: str = "Authentication required", **kwargs):
         super().__init__(
             status_code=401,
@@ -117,6 +154,8 @@ class AuthenticationError(APIException):
 class AuthorizationError(APIException):
     """Insufficient permissions"""
     
+    __slots__ = ()
+    
     def __init__(self, detail: str = "Access denied", **kwargs):
         super().__init__(
             status_code=403,
@@ -130,6 +169,8 @@ class AuthorizationError(APIException):
 class InvalidTokenError(AuthenticationError):
     """Invalid or expired token"""
     
+    __slots__ = ()
+    
     def __init__(self, detail: str = "Invalid or expired authentication token", **kwargs):
         super().__init__(detail=detail, **kwargs)
 
@@ -139,17 +180,20 @@ class InvalidTokenError(AuthenticationError):
 class ValidationError(APIException):
     """Request validation failed"""
     
+    __slots__ = ()
+    
     def __init__(
         self,
         detail: str = "Request validation failed",
         errors: Optional[List[Dict[str, Any]]] = None,
+        type_uri: str = ErrorType.VALIDATION_ERROR,
         **kwargs
     ):
         super().__init__(
             status_code=422,
             title="Validation Error",
             detail=detail,
-            type_uri=ErrorType.VALIDATION_ERROR,
+            type_uri=type_uri,
             errors=errors,
             **kwargs
         )
@@ -158,6 +202,8 @@ class ValidationError(APIException):
 class InvalidFileTypeError(ValidationError):
     """Unsupported file type"""
     
+    __slots__ = ()
+    
     def __init__(self, file_type: str, allowed_types: List[str], **kwargs):
         detail = f"File type '{file_type}' not supported. Allowed types: {', '.join(allowed_types)}"
         super().__init__(
@@ -172,6 +218,8 @@ class InvalidFileTypeError(ValidationError):
 class FileTooLargeError(ValidationError):
     """File size exceeds limit"""
     
+    __slots__ = ()
+    
     def __init__(self, file_size: int, max_size: int, **kwargs):
         detail = f"File size {file_size} bytes exceeds maximum allowed size of {max_size} bytes"
         super().__init__(
@@ -188,12 +236,14 @@ class FileTooLargeError(ValidationError):
 class NotFoundError(APIException):
     """Resource not found"""
     
-    def __init__(self, resource: str = "Resource", **kwargs):
+    __slots__ = ()
+    
+    def __init__(self, resource: str = "Resource", type_uri: str = ErrorType.NOT_FOUND_ERROR, **kwargs):
         super().__init__(
             status_code=404,
             title="Not Found",
             detail=f"{resource} not found",
-            type_uri=ErrorType.NOT_FOUND_ERROR,
+            type_uri=type_uri,
             **kwargs
         )
 
@@ -201,6 +251,8 @@ class NotFoundError(APIException):
 class DocumentNotFoundError(NotFoundError):
     """Document not found"""
     
+    __slots__ = ()
+    
     def __init__(self, document_id: str, **kwargs):
         super().__init__(
             resource="Document",
@@ -213,6 +265,8 @@ class DocumentNotFoundError(NotFoundError):
 class OCRJobNotFoundError(NotFoundError):
     """OCR job not found"""
     
+    __slots__ = ()
+    
     def __init__(self, job_id: str, **kwargs):
         super().__init__(
             resource="OCR job",
@@ -227,6 +281,8 @@ class OCRJobNotFoundError(NotFoundError):
 class ConflictError(APIException):
     """Resource conflict"""
     
+    __slots__ = ()
+    
     def __init__(self, detail: str = "Resource conflict", **kwargs):
         super().__init__(
             status_code=409,
@@ -240,6 +296,8 @@ class ConflictError(APIException):
 class DocumentAlreadyExistsError(ConflictError):
     """Document already exists"""
     
+    __slots__ = ()
+    
     def __init__(self, filename: str, **kwargs):
         super().__init__(
             detail=f"Document with filename '{filename}' already exists",
@@ -248,11 +306,49 @@ class DocumentAlreadyExistsError(ConflictError):
         )
 
 
+class PreconditionFailedError(APIException):
+    """Conditional request precondition (e.g. If-Match) no longer holds"""
+    
+    __slots__ = ()
+    
+    def __init__(self, detail: str = "Resource was modified by another request", **kwargs):
+        super().__init__(
+            status_code=412,
+            title="Precondition Failed",
+            detail=detail,
+            type_uri=ErrorType.PRECONDITION_FAILED,
+            **kwargs
+        )
+
+
+class RangeNotSatisfiableError(APIException):
+    """Range header cannot be satisfied for the representation's size"""
+    
+    __slots__ = ()
+    
+    def __init__(self, file_size: int, detail: str = "Requested range not satisfiable", **kwargs):
+        super().__init__(
+            status_code=416,
+            title="Range Not Satisfiable",
+            detail=detail,
+            type_uri=ErrorType.RANGE_NOT_SATISFIABLE,
+            file_size=file_size,
+            **kwargs
+        )
+    
+    @property
+    def content_range(self) -> str:
+        """Content-Range value a 416 response must carry (RFC 9110 §15.5.17)"""
+        return f"bytes */{self.extra_data['file_size']}"
+
+
 # ============= RATE LIMITING EXCEPTIONS =============
 
 class RateLimitExceededError(APIException):
     """Rate limit exceeded"""
     
+    __slots__ = ()
+    
     def __init__(
         self,
         detail: str = "Rate limit exceeded",
@@ -274,6 +370,8 @@ class RateLimitExceededError(APIException):
 class DocumentProcessingError(APIException):
     """Document processing failed"""
     
+    __slots__ = ()
+    
     def __init__(self, detail: str = "Document processing failed", **kwargs):
         super().__init__(
             status_code=422,
@@ -287,6 +385,8 @@ class DocumentProcessingError(APIException):
 class DocumentUploadError(APIException):
     """Document upload failed"""
     
+    __slots__ = ()
+    
     def __init__(self, detail: str = "Document upload failed", **kwargs):
         super().__init__(
             status_code=400,
@@ -302,6 +402,8 @@ class DocumentUploadError(APIException):
 class OCRServiceError(APIException):
     """OCR service error"""
     
+    __slots__ = ()
+    
     def __init__(self, detail: str = "OCR service error", **kwargs):
         super().__init__(
             status_code=502,
@@ -315,6 +417,8 @@ class OCRServiceError(APIException):
 class OCRProcessingError(APIException):
     """OCR processing failed"""
     
+    __slots__ = ()
+    
     def __init__(self, detail: str = "OCR processing failed", **kwargs):
         super().__init__(
             status_code=422,
@@ -328,6 +432,8 @@ class OCRProcessingError(APIException):
 class OCRTimeoutError(APIException):
     """OCR processing timeout"""
     
+    __slots__ = ()
+    
     def __init__(self, timeout_seconds: int, **kwargs):
         detail = f"OCR processing timed out after {timeout_seconds} seconds"
         super().__init__(
@@ -345,6 +451,8 @@ class OCRTimeoutError(APIException):
 class StorageError(APIException):
     """Storage operation failed"""
     
+    __slots__ = ()
+    
     def __init__(self, detail: str = "Storage operation failed", **kwargs):
         super().__init__(
             status_code=502,
@@ -358,6 +466,8 @@ class StorageError(APIException):
 class StorageQuotaExceededError(APIException):
     """Storage quota exceeded"""
     
+    __slots__ = ()
+    
     def __init__(self, quota_limit: int, current_usage: int, **kwargs):
         detail = f"Storage quota exceeded. Used: {current_usage}, Limit: {quota_limit}"
         super().__init__(
@@ -376,6 +486,8 @@ class StorageQuotaExceededError(APIException):
 class ServiceUnavailableError(APIException):
     """Service temporarily unavailable"""
     
+    __slots__ = ()
+    
     def __init__(
         self,
         detail: str = "Service temporarily unavailable",
@@ -395,6 +507,8 @@ class ServiceUnavailableError(APIException):
 class ExternalServiceError(APIException):
     """External service error"""
     
+    __slots__ = ()
+    
     def __init__(self, service_name: str, detail: str, **kwargs):
         super().__init__(
             status_code=502,
@@ -409,6 +523,8 @@ class ExternalServiceError(APIException):
 class ConfigurationError(APIException):
     """Configuration or secrets management error"""
     
+    __slots__ = ()
+    
     def __init__(self, detail: str = "Configuration error", **kwargs):
         super().__init__(
             status_code=500,
@@ -422,6 +538,8 @@ class ConfigurationError(APIException):
 class SecretsManagerError(APIException):
     """AWS Secrets Manager error"""
     
+    __slots__ = ()
+    
     def __init__(self, detail: str = "Secrets Manager error", **kwargs):
         super().__init__(
             status_code=500,
@@ -8,25 +8,56 @@ Author: InsureCove Team
 Date: July 8, 2025
 """
 
+import inspect
+import json
 import logging
 import logging.config
+import re
 import sys
-import json
-from datetime import datetime
-from typing import Dict, Any, Optional
+import time
+from contextvars import ContextVar
+from decimal import Decimal
+from typing import Dict, Any, Callable, Optional
 from pathlib import Path
 
+import orjson
+
+from app.utils.date_utils import format_utc_timestamp
+
 # TODO: Import configuration
 # from app.core.config import settings
 
 
+# Standard LogRecord attributes; anything else on a record is an `extra` field
+_RECORD_ATTRIBUTES = frozenset({
+    'name', 'msg', 'args', 'levelname', 'levelno', 'pathname',
+    'filename', 'module', 'exc_info', 'exc_text', 'stack_info',
+    'lineno', 'funcName', 'created', 'msecs', 'relativeCreated',
+    'thread', 'threadName', 'processName', 'process', 'message'
+})
+
+
+# Encoders for `extra` values orjson cannot serialize itself, looked up by
+# exact type; anything else falls back to str()
+_EXTRA_ENCODERS: Dict[type, Callable[[Any], Any]] = {
+    Decimal: str,
+    bytes: lambda value: value.decode("utf-8", "replace"),
+    set: list,
+    frozenset: list,
+}
+
+
+def _encode_extra(value: Any) -> Any:
+    return _EXTRA_ENCODERS.get(type(value), str)(value)
+
+
 class JSONFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging"""
     
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON"""
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": format_utc_timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -41,15 +72,23 @@ class JSONFormatter(logging.Formatter):
         
         # Add extra fields from record
         for key, value in record.__dict__.items():
-            if key not in {
-                'name', 'msg', 'args', 'levelname', 'levelno', 'pathname',
-                'filename', 'module', 'exc_info', 'exc_text', 'stack_info',
-                'lineno', 'funcName', 'created', 'msecs', 'relativeCreated',
-                'thread', 'threadName', 'processName', 'process', 'message'
-            }:
+            if key not in _RECORD_ATTRIBUTES:
                 log_entry[key] = value
         
-        return json.dumps(log_entry, default=str)
+        try:
+            return orjson.dumps(log_entry, default=_encode_extra, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except orjson.JSONEncodeError:
+            # e.g. ints beyond 64 bits, which orjson rejects without calling default
+            return json.dumps(log_entry, default=_encode_extra)
+
+
+# Request context for log records; set per request in the app middleware.
+# Each request runs in its own task, so values never leak between requests
+request_id_var: ContextVar[str] = ContextVar("request_id", default="unknown")
+user_id_var: ContextVar[str] = ContextVar("user_id", default="anonymous")
+
+_SERVICE_NAME = "document-service"
+_SERVICE_VERSION = "1.0.0"
 
 
 class RequestContextFilter(logging.Filter):
@@ -57,15 +96,15 @@ class RequestContextFilter(logging.Filter):
     
     def filter(self, record: logging.LogRecord) -> bool:
         """Add request context to log record"""
-        # TODO: Extract request context from contextvars
-        # TODO: Add request ID, user ID, session ID
+        # TODO: Add session ID
         # TODO: Add correlation tracking
         
-        # Placeholder implementation
-        record.request_id = getattr(record, 'request_id', 'unknown')
-        record.user_id = getattr(record, 'user_id', 'anonymous')
-        record.service = "document-service"
-        record.version = "1.0.0"
+        # Values passed explicitly via `extra` take precedence
+        fields = record.__dict__
+        fields.setdefault("request_id", request_id_var.get())
+        fields.setdefault("user_id", user_id_var.get())
+        record.service = _SERVICE_NAME
+        record.version = _SERVICE_VERSION
         
         return True
 
@@ -73,30 +112,50 @@ class RequestContextFilter(logging.Filter):
 class SensitiveDataFilter(logging.Filter):
     """Filter out sensitive data from logs"""
     
+    # Matched case-insensitively
     SENSITIVE_PATTERNS = [
-        r'(?i)(password|secret|key|token)[\s:=]+[^\s]+',
-        r'(?i)(api[_-]?key)[\s:=]+[^\s]+',
-        r'(?i)(authorization|bearer)[\s:=]+[^\s]+',
+        r'(password|secret|key|token)[\s:=]+[^\s]+',
+        r'(api[_-]?key)[\s:=]+[^\s]+',
+        r'(authorization|bearer)[\s:=]+[^\s]+',
         r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',  # Email
     ]
     
+    # Every pattern needs one of these (lowercased) substrings to match, so
+    # messages without any skip the regex scan
+    TRIGGERS = ('password', 'secret', 'key', 'token', 'authorization', 'bearer', '@')
+    
     def filter(self, record: logging.LogRecord) -> bool:
         """Remove sensitive data from log message"""
-        # TODO: Implement pattern-based redaction
         # TODO: Add configurable sensitivity levels
         # TODO: Add whitelist for safe patterns
         
         message = record.getMessage()
+        lowered = message.lower()
+        if any(trigger in lowered for trigger in self.TRIGGERS):
+            message = _SENSITIVE_RE.sub('[REDACTED]', message)
         
-        # Simple placeholder implementation
-        for pattern in self.SENSITIVE_PATTERNS:
-            import re
-            message = re.sub(pattern, '[REDACTED]', message)
-        
+        # Keep the formatted message so the formatter (and any other
+        # handler's filter) does not apply msg % args again
         record.msg = message
+        record.args = ()
         return True
 
 
+# All patterns as one alternation: a single scan per message
+_SENSITIVE_RE = re.compile(
+    "|".join(f"(?:{pattern})" for pattern in SensitiveDataFilter.SENSITIVE_PATTERNS),
+    re.IGNORECASE
+)
+
+
+# Filters and formatters keep no per-handler state, so every handler (and
+# every setup_logging call) shares one instance of each
+_REQUEST_CONTEXT_FILTER = RequestContextFilter()
+_SENSITIVE_DATA_FILTER = SensitiveDataFilter()
+_JSON_FORMATTER = JSONFormatter()
+_TEXT_FORMATTER = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+
 def setup_logging(
     log_level: str = "INFO",
     json_format: bool = False,
@@ -124,16 +183,9 @@ def setup_logging(
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.DEBUG)
         
-        if json_format:
-            console_formatter = JSONFormatter()
-        else:
-            console_formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            )
-        
-        console_handler.setFormatter(console_formatter)
-        console_handler.addFilter(RequestContextFilter())
-        console_handler.addFilter(SensitiveDataFilter())
+        console_handler.setFormatter(_JSON_FORMATTER if json_format else _TEXT_FORMATTER)
+        console_handler.addFilter(_REQUEST_CONTEXT_FILTER)
+        console_handler.addFilter(_SENSITIVE_DATA_FILTER)
         root_logger.addHandler(console_handler)
     
     # File handler
@@ -141,13 +193,9 @@ def setup_logging(
         file_handler = logging.FileHandler(log_file)
         file_handler.setLevel(logging.INFO)
         
-        file_formatter = JSONFormatter() if json_format else logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        
-        file_handler.setFormatter(file_formatter)
-        file_handler.addFilter(RequestContextFilter())
-        file_handler.addFilter(SensitiveDataFilter())
+        file_handler.setFormatter(_JSON_FORMATTER if json_format else _TEXT_FORMATTER)
+        file_handler.addFilter(_REQUEST_CONTEXT_FILTER)
+        file_handler.addFilter(_SENSITIVE_DATA_FILTER)
         root_logger.addHandler(file_handler)
     
     # Configure specific loggers
@@ -196,6 +244,10 @@ def get_logger(name: str) -> logging.Logger:
     return logger
 
 
+# The helpers below check the level before building their `extra` dicts,
+# which logging would otherwise build and then drop
+
+
 class PerformanceLogger:
     """Performance logging utilities"""
     
@@ -211,6 +263,9 @@ class PerformanceLogger:
         **kwargs
     ):
         """Log API request performance"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
         self.logger.info(
             "API request completed",
             extra={
@@ -231,8 +286,12 @@ class PerformanceLogger:
         **kwargs
     ):
         """Log operation performance"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
         self.logger.info(
-            f"Operation {operation} completed",
+            "Operation %s completed",
+            operation,
             extra={
                 "operation": operation,
                 "duration_ms": duration_ms,
@@ -258,6 +317,9 @@ class SecurityLogger:
         **kwargs
     ):
         """Log authentication attempts"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
         self.logger.info(
             "Authentication attempt",
             extra={
@@ -280,6 +342,9 @@ class SecurityLogger:
         **kwargs
     ):
         """Log file upload events"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
         self.logger.info(
             "File upload",
             extra={
@@ -303,6 +368,9 @@ class SecurityLogger:
         **kwargs
     ):
         """Log access denied events"""
+        if not self.logger.isEnabledFor(logging.WARNING):
+            return
+        
         self.logger.warning(
             "Access denied",
             extra={
@@ -325,10 +393,13 @@ class SecurityLogger:
     ):
         """Log security violations"""
         log_level = logging.ERROR if severity == "high" else logging.WARNING
+        if not self.logger.isEnabledFor(log_level):
+            return
         
         self.logger.log(
             log_level,
-            f"Security violation: {event_type}",
+            "Security violation: %s",
+            event_type,
             extra={
                 "event_type": event_type,
                 "description": description,
@@ -354,8 +425,12 @@ class BusinessLogger:
         **kwargs
     ):
         """Log document processing events"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
         self.logger.info(
-            f"Document {operation} completed",
+            "Document %s completed",
+            operation,
             extra={
                 "document_id": document_id,
                 "user_id": user_id,
@@ -376,8 +451,12 @@ class BusinessLogger:
         **kwargs
     ):
         """Log OCR job events"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
         self.logger.info(
-            f"OCR job {status}",
+            "OCR job %s",
+            status,
             extra={
                 "job_id": job_id,
                 "document_id": document_id,
@@ -415,99 +494,85 @@ def log_function_call(func):
     """Decorator to log function calls"""
     import functools
     
-    @functools.wraps(func)
-    async def async_wrapper(*args, **kwargs):
-        logger = logging.getLogger(func.__module__)
-        start_time = datetime.utcnow()
-        
+    logger = logging.getLogger(func.__module__)
+    name = func.__name__
+    
+    # Call/completion records are DEBUG, so they are only built when that
+    # level is enabled; failures are always logged
+    def log_called(args, kwargs):
         logger.debug(
-            f"Function {func.__name__} called",
+            "Function %s called",
+            name,
             extra={
-                "function": func.__name__,
-                "module": func.__module__,
+                "function": name,
                 "args_count": len(args),
                 "kwargs_count": len(kwargs)
             }
         )
-        
-        try:
-            result = await func(*args, **kwargs)
-            duration = (datetime.utcnow() - start_time).total_seconds() * 1000
+    
+    def log_completed(start_ns):
+        logger.debug(
+            "Function %s completed",
+            name,
+            extra={
+                "function": name,
+                "duration_ms": (time.perf_counter_ns() - start_ns) / 1_000_000,
+                "success": True
+            }
+        )
+    
+    def log_failed(start_ns, e):
+        logger.error(
+            "Function %s failed",
+            name,
+            extra={
+                "function": name,
+                "duration_ms": (time.perf_counter_ns() - start_ns) / 1_000_000,
+                "success": False,
+                "error": str(e)
+            },
+            exc_info=True
+        )
+    
+    # Only the wrapper that matches the function type is built
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                log_called(args, kwargs)
+            start_ns = time.perf_counter_ns()
             
-            logger.debug(
-                f"Function {func.__name__} completed",
-                extra={
-                    "function": func.__name__,
-                    "duration_ms": duration,
-                    "success": True
-                }
-            )
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                log_failed(start_ns, e)
+                raise
             
+            if debug:
+                log_completed(start_ns)
             return result
-        except Exception as e:
-            duration = (datetime.utcnow() - start_time).total_seconds() * 1000
-            
-            logger.error(
-                f"Function {func.__name__} failed",
-                extra={
-                    "function": func.__name__,
-                    "duration_ms": duration,
-                    "success": False,
-                    "error": str(e)
-                },
-                exc_info=True
-            )
-            raise
+        
+        return async_wrapper
     
     @functools.wraps(func)
     def sync_wrapper(*args, **kwargs):
-        logger = logging.getLogger(func.__module__)
-        start_time = datetime.utcnow()
-        
-        logger.debug(
-            f"Function {func.__name__} called",
-            extra={
-                "function": func.__name__,
-                "module": func.__module__,
-                "args_count": len(args),
-                "kwargs_count": len(kwargs)
-            }
-        )
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            log_called(args, kwargs)
+        start_ns = time.perf_counter_ns()
         
         try:
             result = func(*args, **kwargs)
-            duration = (datetime.utcnow() - start_time).total_seconds() * 1000
-            
-            logger.debug(
-                f"Function {func.__name__} completed",
-                extra={
-                    "function": func.__name__,
-                    "duration_ms": duration,
-                    "success": True
-                }
-            )
-            
-            return result
         except Exception as e:
-            duration = (datetime.utcnow() - start_time).total_seconds() * 1000
-            
-            logger.error(
-                f"Function {func.__name__} failed",
-                extra={
-                    "function": func.__name__,
-                    "duration_ms": duration,
-                    "success": False,
-                    "error": str(e)
-                },
-                exc_info=True
-            )
+            log_failed(start_ns, e)
             raise
+        
+        if debug:
+            log_completed(start_ns)
+        return result
     
-    # Return appropriate wrapper based on function type
-    if hasattr(func, '__code__') and func.__code__.co_flags & 0x80:  # CO_COROUTINE
-        return async_wrapper
-    else:
-        return sync_wrapper
+    return sync_wrapper
 
 
 # TODO: Add log aggregation utilities
@@ -11,6 +11,7 @@ Date: July 8, 2025
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 import os
+import asyncio
 import logging
 from enum import Enum
 
@@ -257,6 +258,11 @@ class SecretsBasedConfig:
                 raise ConfigurationError("Mistral AI API key not available in AWS Secrets Manager or environment variables")
             return api_key
     
+    @property
+    def cached_mistral_api_key(self) -> Optional[str]:
+        """Mistral AI API key from the loaded cache, without fetching; None until loaded"""
+        return self._config_cache.get("mistral_ai", {}).get("api_key")
+    
     @property
     def mistral_api_url(self) -> str:
         """Get Mistral AI API URL from AWS Secrets Manager"""
@@ -445,6 +451,29 @@ class SecretsBasedConfig:
         self._config_cache.clear()
         self.logger.info("Configuration cache cleared")
     
+    async def load_config_cache(self) -> None:
+        """
+        Fill the configuration cache from the secrets manager.
+        
+        The sync `_get_*_config` accessors can only fetch with asyncio.run,
+        which fails inside a running event loop, so the cache is filled here
+        at startup and on refresh and properties never fetch on a request.
+        Sections that cannot be loaded keep their previous value.
+        """
+        loaders = {
+            "mistral_ai": self.secrets_manager.get_mistral_ai_config,
+            "storage": self.secrets_manager.get_storage_config,
+            "auth_service": self.secrets_manager.get_auth_service_config,
+            "database": self.secrets_manager.get_database_config,
+            "jwt": self.secrets_manager.get_jwt_config,
+            "monitoring": self.secrets_manager.get_monitoring_config,
+        }
+        for section, loader in loaders.items():
+            try:
+                self._config_cache[section] = await loader()
+            except Exception as e:
+                self.logger.warning(f"Failed to load {section} configuration: {e}")
+    
     
     async def validate_configuration(self) -> Dict[str, bool]:
         """
@@ -528,6 +557,9 @@ async def initialize_config(environment: Optional[str] = None) -> SecretsBasedCo
     """
     config = get_config(environment)
     
+    # One batch fetch for all secrets; validation below then reads the cache
+    await config.secrets_manager.preload_secrets()
+    
     # Validate configuration
     validation_results = await config.validate_configuration()
     
@@ -535,5 +567,27 @@ async def initialize_config(environment: Optional[str] = None) -> SecretsBasedCo
     if failed_sections:
         raise ConfigurationError(f"Configuration validation failed for sections: {failed_sections}")
     
+    await config.load_config_cache()
+    
     logging.getLogger(__name__).info("Configuration initialized and validated successfully")
     return config
+
+
+async def run_secrets_refresher(config: SecretsBasedConfig, interval: float) -> None:
+    """
+    Re-fetch secrets every `interval` seconds until cancelled.
+    
+    Keep `interval` below the secrets cache TTL so cached values are
+    replaced before they expire and no request ever waits on AWS.
+    
+    Args:
+        config: Initialized configuration to keep current
+        interval: Seconds between refreshes
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await config.secrets_manager.refresh_secrets()
+            await config.load_config_cache()
+        except Exception as e:
+            config.logger.warning(f"Secrets refresh failed: {e}")
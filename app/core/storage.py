@@ -9,13 +9,14 @@ Date: July 8, 2025
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any, List, IO, Union
+from typing import Optional, Dict, Any, List, IO, Union, AsyncIterator, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
 import mimetypes
 import uuid
 import aiofiles
 import asyncio
+import hashlib
 from urllib.parse import urlparse
 
 # TODO: Import exceptions
@@ -30,6 +31,10 @@ from urllib.parse import urlparse
 # from app.core.exceptions import StorageError, StorageQuotaExceededError
 
 
+# Default chunk size for streamed reads (1 MiB)
+DEFAULT_STREAM_CHUNK_SIZE = 1 << 20
+
+
 class StorageBackend(ABC):
     """Abstract base class for storage backends"""
     
@@ -44,11 +49,52 @@ class StorageBackend(ABC):
         """Store file content to storage backend"""
         pass
     
+    async def store_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        storage_path: str,
+        content_type: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Store file content delivered as an async stream of chunks.
+        
+        The result includes "size" and a SHA-256 "file_hash" computed while
+        the chunks pass through. Backends should override this to write
+        incrementally; the default buffers the chunks and calls store_file.
+        """
+        hasher = hashlib.sha256()
+        parts = []
+        async for chunk in chunks:
+            hasher.update(chunk)
+            parts.append(chunk)
+        
+        result = await self.store_file(b"".join(parts), storage_path, content_type, metadata)
+        return {**result, "file_hash": hasher.hexdigest()}
+    
     @abstractmethod
     async def get_file(self, storage_path: str) -> bytes:
         """Retrieve file content from storage"""
         pass
     
+    async def iter_file(
+        self,
+        storage_path: str,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        byte_range: Optional[Tuple[int, int]] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream file content in fixed-size chunks.
+        
+        byte_range is an inclusive (start, end) pair. Backends should
+        override this to read incrementally; the default falls back to
+        get_file and only slices the buffered content.
+        """
+        content = await self.get_file(storage_path)
+        start, end = byte_range if byte_range else (0, len(content) - 1)
+        for offset in range(start, end + 1, chunk_size):
+            yield content[offset:min(offset + chunk_size, end + 1)]
+    
     @abstractmethod
     async def get_file_url(
         self,
@@ -177,6 +223,46 @@ class LocalStorageBackend(StorageBackend):
             # TODO: Convert to StorageError
             raise Exception(f"Failed to store file: {str(e)}")
     
+    async def store_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        storage_path: str,
+        content_type: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Write chunks to the local filesystem as they arrive, hashing in the same pass"""
+        
+        file_path = self._get_file_path(storage_path)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        hasher = hashlib.sha256()
+        
+        try:
+            async with aiofiles.open(file_path, 'wb') as f:
+                async for chunk in chunks:
+                    hasher.update(chunk)
+                    await f.write(chunk)
+        except BaseException:
+            # Do not leave a truncated file behind (e.g. size limit hit mid-stream)
+            file_path.unlink(missing_ok=True)
+            raise
+        
+        if metadata:
+            metadata_path = file_path.with_suffix(file_path.suffix + '.meta')
+            async with aiofiles.open(metadata_path, 'w') as f:
+                import json
+                await f.write(json.dumps(metadata, default=str))
+        
+        stat = file_path.stat()
+        
+        return {
+            "storage_path": storage_path,
+            "size": stat.st_size,
+            "last_modified": datetime.fromtimestamp(stat.st_mtime),
+            "content_type": content_type or mimetypes.guess_type(str(file_path))[0],
+            "etag": f'"{stat.st_mtime}-{stat.st_size}"',
+            "file_hash": hasher.hexdigest()
+        }
+    
     async def get_file(self, storage_path: str) -> bytes:
         """Retrieve file content from local storage"""
         file_path = self._get_file_path(storage_path)
@@ -192,6 +278,36 @@ class LocalStorageBackend(StorageBackend):
             # TODO: Convert to StorageError
             raise Exception(f"Failed to read file: {str(e)}")
     
+    async def iter_file(
+        self,
+        storage_path: str,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        byte_range: Optional[Tuple[int, int]] = None
+    ) -> AsyncIterator[bytes]:
+        """Stream file content from local storage without buffering it"""
+        file_path = self._get_file_path(storage_path)
+        
+        if not file_path.exists():
+            # TODO: Raise NotFoundError
+            raise FileNotFoundError(f"File not found: {storage_path}")
+        
+        async with aiofiles.open(file_path, 'rb') as f:
+            if byte_range:
+                start, end = byte_range
+                await f.seek(start)
+                remaining = end - start + 1
+            else:
+                remaining = None
+            
+            while remaining is None or remaining > 0:
+                to_read = chunk_size if remaining is None else min(chunk_size, remaining)
+                chunk = await f.read(to_read)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+    
     async def get_file_url(
         self,
         storage_path: str,
@@ -339,6 +455,21 @@ class S3StorageBackend(StorageBackend):
         # Placeholder implementation
         raise NotImplementedError("S3 storage backend not yet implemented")
     
+    async def store_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        storage_path: str,
+        content_type: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Store streamed file content to S3"""
+        # TODO: Implement with create_multipart_upload / upload_part /
+        #       complete_multipart_upload, buffering chunks to the 5 MiB
+        #       minimum part size and hashing them in the same pass
+        # TODO: abort_multipart_upload on failure
+        
+        raise NotImplementedError("S3 storage backend not yet implemented")
+    
     async def get_file(self, storage_path: str) -> bytes:
         """Retrieve file content from S3"""
         # TODO: Implement S3 download
@@ -347,6 +478,20 @@ class S3StorageBackend(StorageBackend):
         
         raise NotImplementedError("S3 storage backend not yet implemented")
     
+    async def iter_file(
+        self,
+        storage_path: str,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        byte_range: Optional[Tuple[int, int]] = None
+    ) -> AsyncIterator[bytes]:
+        """Stream file content from S3"""
+        # TODO: Implement with get_object(Bucket, Key, Range=f"bytes={start}-{end}")
+        #       and yield from the StreamingBody via iter_chunks(chunk_size),
+        #       never calling read() on the whole body
+        
+        raise NotImplementedError("S3 storage backend not yet implemented")
+        yield b""  # pragma: no cover - marks this as an async generator
+    
     async def get_file_url(
         self,
         storage_path: str,
@@ -456,6 +601,23 @@ class StorageManager:
         
         return content
     
+    async def stream_file(
+        self,
+        storage_path: str,
+        user_id: str,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        byte_range: Optional[Tuple[int, int]] = None
+    ) -> AsyncIterator[bytes]:
+        """Stream file in chunks with access control"""
+        
+        # TODO: Verify user access to file
+        # TODO: Log download event
+        
+        self._usage_stats["total_downloads"] += 1
+        
+        async for chunk in self.backend.iter_file(storage_path, chunk_size, byte_range):
+            yield chunk
+    
     async def get_download_url(
         self,
         storage_path: str,
@@ -13,35 +13,77 @@ Date: July 8, 2025
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
 import uvicorn
 import uuid
 import logging
+import asyncio
 from contextlib import asynccontextmanager
 
 # Import route modules
 from app.api import document_routes, ocr_routes, health_routes, metrics_routes
 
 # Import AWS Secrets Manager configuration
-from app.core.secrets_config import get_config, initialize_config
+from app.core.secrets_config import get_config, initialize_config, run_secrets_refresher
 from app.services.secrets_service import initialize_secrets
 
 # Import core modules
-from app.core.exceptions import ConfigurationError
+from app.core.exceptions import APIException, ConfigurationError, ErrorType, RangeNotSatisfiableError
+from app.core.config import settings, Environment
+from app.core.logging_config import request_id_var
+from app.utils.response_utils import ORJSONResponse
+from app.services.ocr_service import close_mistral_client
+from app.utils.system_utils import run_system_metrics_refresher
+
+PROBLEM_JSON_MEDIA_TYPE = "application/problem+json"
+
+# Immutable part of the unhandled-error response, built once at import
+_PROBLEM_TEMPLATE = {
+    "type": ErrorType.INTERNAL_SERVER_ERROR,
+    "title": "Internal Server Error",
+    "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+    "detail": "An unexpected error occurred",
+}
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager for startup and shutdown events"""
-    # TODO: Initialize AWS Secrets Manager
     # TODO: Initialize storage service
     # TODO: Initialize OCR service
     # TODO: Setup logging
     # TODO: Warm up caches
     
     print("🚀 Document Service starting up...")
+    
+    # Fetch every secret once here and refresh in the background, so no
+    # request waits on a Secrets Manager round trip
+    secrets_refresher = None
+    if settings.ENABLE_AWS_SECRETS:
+        secrets_config = await initialize_config(Environment(settings.ENVIRONMENT).value)
+        secrets_refresher = asyncio.create_task(
+            run_secrets_refresher(secrets_config, settings.SECRETS_REFRESH_INTERVAL_SECONDS)
+        )
+    
+    # Keep psutil reads off the request path for health and metrics endpoints
+    metrics_refresher = None
+    if settings.ENABLE_SYSTEM_METRICS:
+        metrics_refresher = asyncio.create_task(
+            run_system_metrics_refresher(settings.SYSTEM_METRICS_INTERVAL_SECONDS)
+        )
+    
+    # Merge per-thread request metric buffers in batches
+    metrics_flusher = asyncio.create_task(
+        metrics_routes.run_metrics_flusher(settings.METRICS_FLUSH_INTERVAL_SECONDS)
+    )
+    
     yield
     
+    if secrets_refresher:
+        secrets_refresher.cancel()
+    if metrics_refresher:
+        metrics_refresher.cancel()
+    metrics_flusher.cancel()
+    await close_mistral_client()
     # TODO: Cleanup resources
     # TODO: Close database connections
     # TODO: Cleanup temporary files
@@ -106,6 +148,7 @@ def setup_middleware(app: FastAPI):
         """Add unique request ID to each request"""
         request_id = str(uuid.uuid4())
         request.state.request_id = request_id
+        request_id_var.set(request_id)
         
         response = await call_next(request)
         response.headers["X-Request-ID"] = request_id
@@ -129,27 +172,39 @@ def setup_middleware(app: FastAPI):
 
 
 def setup_exception_handlers(app: FastAPI):
-    """Setup global exception handlers"""
+    """Setup global exception handlers (RFC 9457 problem+json)"""
+    
+    @app.exception_handler(APIException)
+    async def api_exception_handler(request: Request, exc: APIException):
+        """Render service exceptions with their own status and problem type"""
+        problem = exc.to_dict()
+        problem.setdefault("instance", request.url.path)
+        
+        # 429/503 problems may say when to retry; clients and proxies read the header
+        headers = None
+        if problem.get("retry_after"):
+            headers = {"Retry-After": str(problem["retry_after"])}
+        elif isinstance(exc, RangeNotSatisfiableError):
+            headers = {"Content-Range": exc.content_range}
+        
+        return ORJSONResponse(
+            problem,
+            status_code=exc.status_code,
+            media_type=PROBLEM_JSON_MEDIA_TYPE,
+            headers=headers
+        )
     
-    # TODO: Add custom exception handlers
     @app.exception_handler(Exception)
     async def global_exception_handler(request: Request, exc: Exception):
         """Global exception handler for unhandled exceptions"""
         request_id = getattr(request.state, "request_id", "unknown")
         
         # TODO: Log exception with request context
-        # TODO: Return RFC 9457 compliant error response
         
-        return JSONResponse(
+        return ORJSONResponse(
+            {**_PROBLEM_TEMPLATE, "instance": request.url.path, "request_id": request_id},
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content={
-                "type": "https://example.com/problems/internal-server-error",
-                "title": "Internal Server Error",
-                "status": 500,
-                "detail": "An unexpected error occurred",
-                "instance": str(request.url),
-                "request_id": request_id
-            }
+            media_type=PROBLEM_JSON_MEDIA_TYPE
         )
 
 
@@ -202,11 +257,16 @@ app = create_app()
 
 
 if __name__ == "__main__":
-    # TODO: Load server configuration from settings
+    # uvloop and httptools replace the pure-Python event loop and HTTP
+    # parser; --reload runs a single worker, so it is development-only
     uvicorn.run(
         "app.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,  # TODO: Set to False in production
-        log_level="info"
+        host=settings.HOST,
+        port=settings.PORT,
+        workers=settings.WORKERS,
+        reload=settings.RELOAD and settings.is_development,
+        loop=settings.LOOP,
+        http=settings.HTTP_PARSER,
+        access_log=not settings.is_production,
+        log_level=settings.LOG_LEVEL.lower()
     )
@@ -9,7 +9,7 @@ Date: July 8, 2025
 """
 
 from pydantic import BaseModel, Field, field_validator, ConfigDict
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Union, Literal
 from datetime import datetime
 from enum import Enum
 import uuid
@@ -211,6 +211,48 @@ class DocumentFilters(BaseAPIModel):
     # TODO: Add search functionality
 
 
+DocumentSortField = Literal[
+    "created_at", "updated_at", "file_name", "file_size",
+    "status", "last_accessed", "download_count"
+]
+
+
+class DocumentListParams(BaseAPIModel):
+    """
+    Query parameters for the document list endpoint.
+    
+    Injected with ``Depends()`` so the whole parameter set is checked by one
+    schema compiled at import time; Literal fields replace regex validators.
+    """
+    # Pagination
+    cursor: Optional[str] = Field(None, description="Opaque keyset cursor from a previous page's next_cursor")
+    page_size: int = Field(20, ge=1, le=100, description="Items per page")
+    page: int = Field(1, ge=1, description="Page number (legacy fallback, ignored when cursor is set)")
+    
+    # Filtering
+    document_type: Optional[DocumentType] = Field(None, description="Filter by document type")
+    status: Optional[DocumentStatus] = Field(None, description="Filter by processing status")
+    created_after: Optional[datetime] = Field(None, description="Filter by creation date")
+    created_before: Optional[datetime] = Field(None, description="Filter by creation date")
+    filename_contains: Optional[str] = Field(None, description="Filter by filename")
+    has_ocr: Optional[bool] = Field(None, description="Filter by OCR completion status")
+    
+    # Sorting
+    sort_by: DocumentSortField = Field("created_at", description="Sort field")
+    sort_order: Literal["asc", "desc"] = Field("desc", description="Sort order")
+    
+    def filters(self) -> Dict[str, Any]:
+        """Filter criteria as a dict (tags are parsed separately by parse_tags)"""
+        return {
+            "document_type": self.document_type,
+            "status": self.status,
+            "created_after": self.created_after,
+            "created_before": self.created_before,
+            "filename_contains": self.filename_contains,
+            "has_ocr": self.has_ocr
+        }
+
+
 # ============= RESPONSE MODELS =============
 
 class DocumentResponse(BaseAPIModel):
@@ -283,6 +325,22 @@ class DocumentResponse(BaseAPIModel):
     # TODO: Add URL generation methods
 
 
+class DocumentSummary(BaseAPIModel):
+    """Lightweight document row for list views (no metadata, OCR text or scan details)"""
+    id: uuid.UUID = Field(description="Unique document identifier")
+    file_name: str = Field(description="Current filename (may be sanitized)")
+    original_filename: Optional[str] = Field(None, description="User's original filename as uploaded")
+    mime_type: Optional[str] = Field(None, description="Proper MIME type")
+    file_size: int = Field(description="File size in bytes")
+    document_type: Optional[str] = Field(None, description="Business document type")
+    status: DocumentStatus = Field(description="Document status")
+    tags: List[str] = Field(default_factory=list, description="Document tags/categories")
+    ocr_completed: bool = Field(default=False, description="OCR processing status")
+    download_url: Optional[str] = Field(None, description="Temporary download URL")
+    created_at: Optional[datetime] = Field(None, description="Record creation time")
+    updated_at: Optional[datetime] = Field(None, description="Last update time")
+
+
 class OCRResultResponse(BaseAPIModel):
     """OCR processing result response"""
     # Job information
@@ -392,9 +450,9 @@ class DocumentAccessLogResponse(BaseAPIModel):
 
 class DocumentListResponse(BaseAPIModel):
     """Paginated document list response"""
-    items: List[DocumentResponse] = Field(description="Document items")
-    total_count: int = Field(description="Total number of documents")
-    page_count: int = Field(description="Total number of pages")
+    items: List[DocumentSummary] = Field(description="Document items")
+    total_count: Optional[int] = Field(None, description="Total number of documents (not counted for cursor pages)")
+    page_count: Optional[int] = Field(None, description="Total number of pages (not counted for cursor pages)")
     current_page: int = Field(description="Current page number")
     page_size: int = Field(description="Items per page")
     has_more: bool = Field(description="More items available")
@@ -453,6 +511,9 @@ class MetricsResponse(BaseAPIModel):
     total_requests: int = Field(description="Total requests processed")
     requests_per_minute: float = Field(description="Current requests per minute")
     average_response_time_ms: float = Field(description="Average response time")
+    p50_response_time_ms: float = Field(description="Median response time over recent requests")
+    p95_response_time_ms: float = Field(description="95th percentile response time over recent requests")
+    p99_response_time_ms: float = Field(description="99th percentile response time over recent requests")
     error_rate_percent: float = Field(description="Error rate percentage")
     
     # Document metrics
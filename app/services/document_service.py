@@ -8,33 +8,84 @@ Author: InsureCove Team
 Date: July 8, 2025
 """
 
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Union, AsyncIterator, Tuple
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 import asyncio
+import functools
+import hashlib
+import hmac
+import time
 
 from app.models import (
     DocumentResponse, DocumentUploadRequest, DocumentUpdateRequest,
-    DocumentListResponse, DocumentFilters, DocumentType, DocumentStatus
+    DocumentListResponse, DocumentFilters, DocumentType, DocumentStatus, OCRJobStatus
 )
 from app.core.config import settings
 
 from app.core.exceptions import (
     DocumentNotFoundError, ValidationError, StorageError,
-    DocumentProcessingError, AuthorizationError
+    DocumentProcessingError, AuthorizationError, PreconditionFailedError,
+    RangeNotSatisfiableError, ServiceUnavailableError
 )
 from app.core.storage import StorageManager
 from app.core.logging_config import get_logger
 
 from app.services.storage_service import StorageService
-from app.services.validation_service import ValidationService
+from app.services.validation_service import ValidationService, ALLOWED_MIME_TYPES, MIME_SNIFF_BYTES
 from app.services.ocr_service import OCRService
+from app.services.ocr_queue_service import OCRQueueService
 from app.services.auth_client_service import AuthClientService
-from app.utils.file_utils import FileProcessor
+from app.utils.file_utils import (
+    FileProcessor, peek_stream, detect_mime_from_content,
+    generate_thumbnails, THUMBNAIL_MIME_TYPES
+)
 from app.utils.crypto_utils import SecureStorage, TokenGenerator
 from app.utils.date_utils import DateTimeHelper
-from app.utils.response_utils import ResponseBuilder, APIResponseFormatter
+from app.utils.response_utils import (
+    ResponseBuilder, APIResponseFormatter, encode_cursor, decode_cursor,
+    compute_etag, etag_matches, parse_range_header
+)
+
+
+# Caps concurrent per-file uploads across all batch requests in this worker
+_upload_semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_UPLOADS)
+
+# Lifetime of thumbnail URLs handed out by get_thumbnail_url
+THUMBNAIL_URL_EXPIRY = 86400
+
+# Signed download URLs are identical within one window of this many seconds,
+# so a hot document is signed once per window instead of once per request
+SIGNED_URL_BUCKET_SECONDS = 60
+
+# Columns shown in list views (DocumentSummary) plus storage_key for URL
+# signing; all are carried by the covering keyset index
+LIST_COLUMNS = (
+    "id", "file_name", "original_filename", "mime_type", "file_size", "document_type",
+    "status", "tags", "ocr_completed", "storage_key", "created_at", "updated_at"
+)
+
+# Sort fields that can be NULL, with the value NULL sorts as. A NULL in a
+# row-value cursor comparison is never true, so the ORDER BY and the cursor
+# predicate both compare COALESCE(field, default) instead
+NULLABLE_SORT_DEFAULTS = {
+    "last_accessed": "'-infinity'::timestamptz",  # NULL until first read
+}
+
+
+@functools.lru_cache(maxsize=8192)
+def _sign_download_url(document_id: str, user_id: str, expiry_bucket: int, expires_in: int) -> str:
+    """Build a signed download URL; expiry is counted from the end of the bucket"""
+    expires_at = (expiry_bucket + 1) * SIGNED_URL_BUCKET_SECONDS + expires_in
+    payload = f"{document_id}:{user_id}:{expires_at}"
+    secret_key = getattr(settings, 'SECRET_KEY', 'fallback-secret-key').encode('utf-8')
+    signature = hmac.new(secret_key, payload.encode('utf-8'), hashlib.sha256).hexdigest()[:16]
+    
+    return (
+        f"/api/v1/documents/{document_id}/download"
+        f"?expires={expires_at}&user_id={user_id}&signature={signature}"
+    )
 
 
 class DocumentService:
@@ -46,7 +97,8 @@ class DocumentService:
         validation_service: Optional[ValidationService] = None,
         ocr_service: Optional[OCRService] = None,
         auth_service: Optional[AuthClientService] = None,
-        database_session=None
+        database_session=None,
+        task_queue=None
     ):
         """Initialize document service with dependencies"""
         self.storage = storage_service
@@ -54,6 +106,7 @@ class DocumentService:
         self.ocr = ocr_service
         self.auth = auth_service
         self.db = database_session
+        self.task_queue = task_queue  # redis.asyncio client for OCR job queueing
         self.logger = get_logger(__name__)
         
         # Initialize utility classes
@@ -77,25 +130,30 @@ class DocumentService:
     
     async def upload_document(
         self,
-        file_content: bytes,
+        file_content: Union[bytes, AsyncIterator[bytes]],
         filename: str,
         user_id: str,
         content_type: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None,
         tags: Optional[List[str]] = None,
-        auto_ocr: bool = True
+        auto_ocr: bool = True,
+        file_size: Optional[int] = None,
+        defer_ocr: bool = False
     ) -> Dict[str, Any]:
         """
         Upload a document with full validation and processing
         
         Args:
-            file_content: Document file content
+            file_content: Document file content, or an async iterator of
+                chunks (see iter_upload_chunks) to stream it to storage
             filename: Original filename
             user_id: Owner user ID
             content_type: MIME type
             metadata: Additional metadata
             tags: Document tags
             auto_ocr: Trigger OCR automatically
+            file_size: Declared size of a streamed upload, used for the quota check
+            defer_ocr: Leave OCR to the caller (batch uploads queue it in one call)
             
         Returns:
             Document response with metadata and URLs
@@ -105,8 +163,17 @@ class DocumentService:
         document_id = str(uuid.uuid4())
         
         try:
+            # Streamed uploads are validated on their first chunk; the size
+            # limit is enforced by the chunk iterator as bytes arrive
+            streamed = not isinstance(file_content, (bytes, bytearray))
+            if streamed:
+                head, file_content = await peek_stream(file_content)
+            else:
+                head = file_content
+                file_size = len(file_content)
+            
             # Validate file content and metadata
-            validation_result = await self._validate_upload_file(file_content, filename, content_type)
+            validation_result = await self._validate_upload_file(head, filename, content_type)
             if not validation_result.get("is_valid", False):
                 raise ValidationError(f"File validation failed: {validation_result.get('errors', [])}")
             
@@ -136,7 +203,7 @@ class DocumentService:
                 
             # Check storage quota
             current_usage = await self._get_user_storage_usage(user_id)
-            file_size = len(file_content)
+            file_size = file_size or 0
             quota_limit = storage_quota_mb * 1024 * 1024
             
             if current_usage + file_size > quota_limit:
@@ -144,7 +211,23 @@ class DocumentService:
             
             # Store file in storage backend
             storage_result = None
-            if self.storage:
+            if self.storage and streamed:
+                storage_result = await self.storage.upload_stream(
+                    chunks=file_content,
+                    filename=filename,
+                    content_type=content_type or "application/octet-stream",
+                    user_id=user_id,
+                    metadata=metadata or {},
+                    file_size=file_size
+                )
+                file_size = storage_result.get("size", file_size)
+                
+                # The declared size may be missing or wrong; check the quota
+                # again against the bytes actually stored
+                if not storage_result.get("is_duplicate") and current_usage + file_size > quota_limit:
+                    await self.storage.delete_file(storage_result["file_id"], user_id)
+                    raise StorageError("Storage quota exceeded")
+            elif self.storage:
                 storage_result = await self.storage.upload_file(
                     file_content=file_content,
                     filename=filename,
@@ -161,14 +244,20 @@ class DocumentService:
                 storage_result=storage_result,
                 tags=tags or [],
                 content_type=content_type,
-                file_size=len(file_content),
+                file_size=file_size,
                 metadata=metadata or {}
             )
             
-            # Trigger OCR if requested
+            # Trigger OCR if requested. Streamed content is not held in
+            # memory, so it is queued from storage (or read back from it)
             ocr_job_id = None
-            if auto_ocr and self.ocr:
+            if auto_ocr and streamed and not defer_ocr and self.task_queue is not None:
+                job_ids = await self._enqueue_ocr_jobs([document_id], user_id)
+                ocr_job_id = job_ids.get(document_id)
+            elif auto_ocr and self.ocr and not defer_ocr:
                 try:
+                    if streamed:
+                        file_content = await self.storage.get_file_content(storage_result["file_id"])
                     ocr_result = await self.ocr.extract_text(file_content, filename)
                     ocr_job_id = ocr_result.get("job_id", str(uuid.uuid4()))
                 except Exception as ocr_error:
@@ -191,8 +280,8 @@ class DocumentService:
                 extra={
                     "document_id": document_id,
                     "user_id": user_id,
-                    "filename": filename,
-                    "file_size": len(file_content),
+                    "original_filename": filename,
+                    "file_size": file_size,
                     "auto_ocr": auto_ocr,
                     "ocr_job_id": ocr_job_id
                 }
@@ -204,7 +293,7 @@ class DocumentService:
                 "original_filename": filename,
                 "user_id": user_id,
                 "status": DocumentStatus.UPLOADED.value,
-                "file_size": len(file_content),
+                "file_size": file_size,
                 "content_type": content_type or "application/octet-stream",
                 "tags": tags or [],
                 "metadata": metadata or {},
@@ -213,7 +302,11 @@ class DocumentService:
                 "auto_ocr": auto_ocr,
                 "upload_url": upload_url,
                 "download_url": download_url,
-                "etag": f'"{hash(file_content)}"',  # Simple hash for etag
+                "storage_key": document_record.get("storage_key"),
+                "etag": (
+                    f'"{storage_result["file_hash"]}"' if streamed and storage_result
+                    else f'"{hash(file_content)}"'  # Simple hash for etag
+                ),
                 "version": 1,
                 "ocr_completed": False,
                 "ocr_job_id": ocr_job_id
@@ -246,35 +339,44 @@ class DocumentService:
             List of document responses
         """
         
-        # Validate all files before processing
+        # Validate every file's header before any storage I/O so one bad file
+        # rejects the whole batch instead of leaving part of it uploaded
+        heads = await asyncio.gather(*(self._read_batch_file_head(file_data) for file_data in files))
+        
         validation_errors = []
-        for i, file_data in enumerate(files):
+        for i, (file_data, head) in enumerate(zip(files, heads)):
             try:
-                if not file_data.get("content"):
-                    validation_errors.append(f"File {i}: Missing content")
-                if not file_data.get("filename"):
-                    validation_errors.append(f"File {i}: Missing filename")
-                if len(file_data.get("content", b"")) > 100 * 1024 * 1024:  # 100MB limit
-                    validation_errors.append(f"File {i}: File too large")
+                reason = self._check_batch_file(file_data, head)
             except Exception as e:
-                validation_errors.append(f"File {i}: Validation error - {str(e)}")
+                reason = f"Validation error - {str(e)}"
+            if reason:
+                validation_errors.append({"index": i, "filename": file_data.get("filename"), "reason": reason})
         
         if validation_errors:
-            raise ValidationError(f"Batch validation failed: {'; '.join(validation_errors)}")
-        
-        # Process uploads in parallel
-        upload_tasks = [
-            self.upload_document(
-                file_data["content"],
-                file_data["filename"],
-                user_id,
-                file_data.get("content_type"),
-                file_data.get("metadata"),
-                file_data.get("tags"),
-                auto_ocr
-            )
-            for file_data in files
-        ]
+            summary = "; ".join(f"File {error['index']}: {error['reason']}" for error in validation_errors)
+            raise ValidationError(f"Batch validation failed: {summary}", errors=validation_errors)
+        
+        # With a task queue, OCR jobs are queued once for the whole batch
+        # below instead of per file inside the semaphore
+        queue_ocr = auto_ocr and self.task_queue is not None
+        
+        async def _process_one(file_data: Dict[str, Any]) -> Dict[str, Any]:
+            async with _upload_semaphore:
+                return await self.upload_document(
+                    file_data["content"],
+                    file_data["filename"],
+                    user_id,
+                    file_data.get("content_type"),
+                    file_data.get("metadata"),
+                    file_data.get("tags"),
+                    auto_ocr,
+                    file_data.get("size"),
+                    defer_ocr=queue_ocr
+                )
+        
+        # Process uploads concurrently, bounded so a large batch cannot
+        # exhaust storage connections or memory
+        upload_tasks = [_process_one(file_data) for file_data in files]
         
         try:
             # Handle partial failures gracefully
@@ -310,6 +412,12 @@ class DocumentService:
                         "error_type": "UnexpectedResultType"
                     })
             
+            if queue_ocr:
+                uploaded = [result for result in processed_results if result["success"]]
+                job_ids = await self._enqueue_ocr_jobs([result["id"] for result in uploaded], user_id)
+                for result in uploaded:
+                    result["ocr_job_id"] = job_ids.get(result["id"])
+            
             # Log batch upload summary
             self.logger.info(
                 f"Batch upload completed: {success_count} successful, {error_count} failed",
@@ -336,6 +444,109 @@ class DocumentService:
             raise DocumentProcessingError(f"Batch upload failed: {str(e)}")
             raise Exception(f"Batch upload failed: {str(e)}")
     
+    async def _enqueue_ocr_jobs(self, document_ids: List[str], user_id: str) -> Dict[str, str]:
+        """
+        Queue OCR jobs for uploaded documents through the OCR job queue
+        
+        Goes through OCRQueueService so upload-triggered jobs get the same
+        job record, user index entry and pending count as jobs queued from
+        the OCR API.
+        
+        Args:
+            document_ids: Uploaded document IDs
+            user_id: Owner user ID
+            
+        Returns:
+            Mapping of document ID to queued job ID (empty if queueing failed)
+        """
+        if not document_ids or self.task_queue is None:
+            return {}
+        
+        try:
+            jobs = await OCRQueueService(self.task_queue).enqueue_jobs(document_ids, user_id)
+        except ServiceUnavailableError as e:
+            # OCR can be retried later; a queueing failure must not fail the upload
+            self.logger.warning(
+                f"Failed to queue OCR jobs: {str(e)}",
+                extra={"user_id": user_id, "document_count": len(document_ids)}
+            )
+            return {}
+        
+        return {job["document_id"]: job["job_id"] for job in jobs}
+    
+    async def _read_batch_file_head(self, file_data: Dict[str, Any]) -> bytes:
+        """Read the first bytes of a batch entry for MIME sniffing"""
+        content = file_data.get("content")
+        if not content:
+            return b""
+        if isinstance(content, (bytes, bytearray)):
+            return bytes(content[:MIME_SNIFF_BYTES])
+        
+        # Streamed entry: peek the first chunk and put it back for the upload
+        head, file_data["content"] = await peek_stream(content)
+        return head[:MIME_SNIFF_BYTES]
+    
+    def _check_batch_file(self, file_data: Dict[str, Any], head: bytes) -> Optional[str]:
+        """Return why a batch entry is invalid, or None if it passes"""
+        if not head:
+            return "Missing content"
+        
+        filename = file_data.get("filename")
+        if not filename:
+            return "Missing filename"
+        
+        # Streamed entries carry their declared size instead of bytes
+        content = file_data["content"]
+        size = len(content) if isinstance(content, (bytes, bytearray)) else file_data.get("size") or 0
+        if size > settings.MAX_FILE_SIZE_MB * 1024 * 1024:
+            return "File too large"
+        
+        if self.validator:
+            mime_type = self.validator.sniff_mime_type(head, filename)
+        else:
+            mime_type = detect_mime_from_content(head) or "application/octet-stream"
+        if mime_type not in ALLOWED_MIME_TYPES:
+            return f"File type not allowed: {mime_type}"
+        
+        return None
+    
+    async def generate_thumbnails(
+        self,
+        document_id: str,
+        storage_key: str,
+        mime_type: Optional[str],
+        file_content: Optional[bytes] = None
+    ) -> Dict[str, str]:
+        """
+        Pre-render and store thumbnails for an uploaded document
+        
+        Meant to run after the upload response is sent (e.g. as a FastAPI
+        background task) so image decoding never sits on a request path.
+        
+        Args:
+            document_id: Document unique identifier
+            storage_key: Storage key of the original file
+            mime_type: MIME type of the original file
+            file_content: Original bytes if still in memory, else read from storage
+            
+        Returns:
+            Mapping of size name to thumbnail storage key (empty if skipped)
+        """
+        if not (settings.ENABLE_THUMBNAIL_GENERATION and self.storage):
+            return {}
+        if mime_type not in THUMBNAIL_MIME_TYPES:
+            # TODO: Render the first page of PDFs once a rasterizer is available
+            return {}
+        
+        try:
+            if file_content is None:
+                file_content = await self.storage.get_file_content(storage_key)
+            thumbnails = await asyncio.to_thread(generate_thumbnails, file_content)
+            return await self.storage.store_thumbnails(document_id, thumbnails)
+        except Exception as e:
+            self.logger.warning(f"Thumbnail generation failed for document {document_id}: {str(e)}")
+            return {}
+    
     # ============= DOCUMENT RETRIEVAL OPERATIONS =============
     
     async def get_document(
@@ -343,7 +554,8 @@ class DocumentService:
         document_id: str,
         user_id: str,
         include_download_url: bool = True,
-        url_expires_in: int = 3600
+        url_expires_in: int = 3600,
+        if_none_match: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Retrieve document metadata and generate access URLs
@@ -353,9 +565,11 @@ class DocumentService:
             user_id: Requesting user ID
             include_download_url: Generate download URL
             url_expires_in: URL expiry time in seconds
+            if_none_match: If-None-Match header value from the client
             
         Returns:
-            Document metadata with URLs
+            Document metadata with URLs, or {"etag", "not_modified": True}
+            when the client's cached copy is still current
         """
         
         try:
@@ -368,11 +582,16 @@ class DocumentService:
             if not await self._check_document_access(document_record, user_id):
                 raise AuthorizationError("Access denied to document")
             
+            # Short-circuit before URL signing and serialization if unchanged
+            etag = self.get_document_etag(document_record)
+            if etag_matches(if_none_match, etag):
+                return {"id": document_record["id"], "etag": etag, "not_modified": True}
+            
             # Generate signed URLs if requested
             download_url = None
             if include_download_url:
                 download_url = await self._generate_signed_download_url(
-                    document_id, user_id, url_expires_in
+                    document_id, user_id, url_expires_in, document=document_record
                 )
             
             # Update access tracking
@@ -400,7 +619,7 @@ class DocumentService:
                 "updated_at": document_record["updated_at"],
                 "last_modified": document_record.get("last_modified"),
                 "download_url": download_url,
-                "etag": document_record.get("etag"),
+                "etag": etag,
                 "version": document_record.get("version", 1),
                 "ocr_completed": document_record.get("ocr_completed", False),
                 "ocr_text": document_record.get("ocr_text"),
@@ -418,6 +637,143 @@ class DocumentService:
             self.logger.error(f"Unexpected error during document retrieval: {str(e)}", extra={"document_id": document_id})
             raise DocumentProcessingError(f"Document retrieval failed: {str(e)}")
 
+    async def get_document_headers(self, document_id: str, user_id: str) -> Dict[str, Any]:
+        """
+        Get the validators a HEAD request needs, without URL signing or access logging
+        
+        Args:
+            document_id: Document unique identifier
+            user_id: Requesting user ID
+            
+        Returns:
+            Dict with etag, last_modified and OCR status
+        """
+        
+        try:
+            document_record = await self._get_document_header_record(document_id)
+            if not document_record:
+                raise DocumentNotFoundError(f"Document {document_id} not found")
+            
+            if not await self._check_document_access(document_record, user_id):
+                raise AuthorizationError("Access denied to document")
+            
+            return {
+                "id": document_record["id"],
+                "etag": self.get_document_etag(document_record),
+                "last_modified": document_record["updated_at"],
+                "status": document_record["status"],
+                "ocr_status": (
+                    OCRJobStatus.COMPLETED.value if document_record.get("ocr_completed")
+                    else OCRJobStatus.PENDING.value
+                )
+            }
+            
+        except (DocumentNotFoundError, AuthorizationError):
+            raise
+        except Exception as e:
+            self.logger.error(f"Unexpected error during document header lookup: {str(e)}", extra={"document_id": document_id})
+            raise DocumentProcessingError(f"Document retrieval failed: {str(e)}")
+
+    async def get_thumbnail_url(self, document_id: str, user_id: str, size: str) -> Optional[str]:
+        """
+        Get a URL for a thumbnail pre-rendered at upload time
+        
+        Args:
+            document_id: Document unique identifier
+            user_id: Requesting user ID
+            size: Thumbnail size name (small, medium, large)
+            
+        Returns:
+            Thumbnail URL, or None if no thumbnail exists for the document
+        """
+        
+        try:
+            document_record = await self._get_document_header_record(document_id)
+            if not document_record:
+                raise DocumentNotFoundError(f"Document {document_id} not found")
+            
+            if not await self._check_document_access(document_record, user_id):
+                raise AuthorizationError("Access denied to document")
+            
+            if not self.storage:
+                return None
+            return await self.storage.get_thumbnail_url(document_id, size, THUMBNAIL_URL_EXPIRY)
+            
+        except (DocumentNotFoundError, AuthorizationError):
+            raise
+        except Exception as e:
+            self.logger.error(f"Unexpected error during thumbnail lookup: {str(e)}", extra={"document_id": document_id})
+            raise DocumentProcessingError(f"Thumbnail retrieval failed: {str(e)}")
+
+    async def check_batch_access(
+        self,
+        document_ids: List[str],
+        user_id: str
+    ) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """
+        Check that each document exists and the user may access it
+        
+        Checks run concurrently, at most MAX_CONCURRENT_TASKS at a time, so
+        a batch costs about one lookup's latency rather than one per
+        document. A failed check is reported rather than failing the batch.
+        
+        Args:
+            document_ids: Documents to check
+            user_id: Requesting user ID
+            
+        Returns:
+            Tuple of (accessible document IDs, errors), where each error has
+            index, document_id, error and error_type
+        """
+        semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_TASKS)
+        
+        async def _check(document_id: str) -> None:
+            async with semaphore:
+                # Only the ownership columns are needed, not the full row
+                document_record = await self._get_document_header_record(document_id)
+                if not document_record:
+                    raise DocumentNotFoundError(document_id)
+                if not await self._check_document_access(document_record, user_id):
+                    raise AuthorizationError("Access denied to document")
+        
+        results = await asyncio.gather(
+            *(_check(document_id) for document_id in document_ids),
+            return_exceptions=True
+        )
+        
+        accessible: List[str] = []
+        errors: List[Dict[str, Any]] = []
+        for index, (document_id, result) in enumerate(zip(document_ids, results)):
+            if isinstance(result, Exception):
+                errors.append({
+                    "index": index,
+                    "document_id": document_id,
+                    "error": str(result),
+                    "error_type": type(result).__name__
+                })
+            else:
+                accessible.append(document_id)
+        
+        return accessible, errors
+
+    @staticmethod
+    def get_document_etag(document_record: Dict[str, Any]) -> str:
+        """
+        Compute the metadata ETag from the row's version, status and OCR state.
+        
+        updated_at is left out: access tracking and the update trigger touch
+        it on every read, which would invalidate the ETag a GET just issued.
+        Strong, since version changes on every metadata write; If-Match needs
+        a strong validator to ever match.
+        """
+        return compute_etag(
+            document_record.get("id"),
+            document_record.get("version", 1),
+            document_record.get("status"),
+            document_record.get("ocr_completed", False),
+            weak=False
+        )
+
     async def _get_document_record(self, document_id: str) -> Optional[Dict[str, Any]]:
         """Get document record from database"""
         if not self.db:
@@ -442,6 +798,23 @@ class DocumentService:
             self.logger.error(f"Database query failed: {str(e)}")
             raise DocumentProcessingError(f"Failed to retrieve document: {str(e)}")
 
+    async def _get_document_header_record(self, document_id: str) -> Optional[Dict[str, Any]]:
+        """Get only the columns needed for conditional-request headers"""
+        if not self.db:
+            return None
+            
+        try:
+            query = """
+            SELECT id, uploaded_by, status, version, ocr_completed, updated_at
+            FROM documents 
+            WHERE id = %(document_id)s AND deleted_at IS NULL
+            """
+            result = await self.db.fetchone(query, {"document_id": document_id})
+            return dict(result) if result else None
+        except Exception as e:
+            self.logger.error(f"Database query failed: {str(e)}")
+            raise DocumentProcessingError(f"Failed to retrieve document: {str(e)}")
+
     async def _check_document_access(self, document_record: Dict[str, Any], user_id: str) -> bool:
         """Check if user has access to document"""
         # Basic ownership check
@@ -494,7 +867,7 @@ class DocumentService:
         try:
             query = """
             UPDATE documents 
-            SET last_accessed = %(timestamp)s, updated_at = %(timestamp)s
+            SET last_accessed = %(timestamp)s
             WHERE id = %(document_id)s
             """
             await self.db.execute(query, {
@@ -542,7 +915,7 @@ class DocumentService:
             # Apply additional search and filter criteria
             query_filters = await self._build_query_filters(base_filters, filters)
             
-            # Implement cursor-based pagination with sorting
+            # Keyset pagination when a cursor is supplied, OFFSET only as a fallback
             documents, total_count, next_cursor = await self._execute_paginated_query(
                 query_filters, page, page_size, cursor, sort_by, sort_order
             )
@@ -550,12 +923,13 @@ class DocumentService:
             # Generate download URLs for documents
             for doc in documents:
                 doc["download_url"] = await self._generate_signed_download_url(
-                    doc["id"], user_id, 3600  # 1 hour expiry
+                    doc["id"], user_id, 3600, document=doc  # 1 hour expiry
                 )
+                doc.pop("storage_key", None)  # Only selected for signing
             
-            # Calculate pagination metadata
-            page_count = (total_count + page_size - 1) // page_size
-            has_more = page < page_count
+            # Calculate pagination metadata (totals are only counted without a cursor)
+            page_count = (total_count + page_size - 1) // page_size if total_count is not None else None
+            has_more = next_cursor is not None
             
             return {
                 "items": documents,
@@ -568,6 +942,8 @@ class DocumentService:
                 "previous_cursor": None  # Implement if needed
             }
             
+        except ValidationError:
+            raise
         except Exception as e:
             self.logger.error(f"Document listing failed: {str(e)}", extra={"user_id": user_id})
             raise DocumentProcessingError(f"Document listing failed: {str(e)}")
@@ -613,8 +989,18 @@ class DocumentService:
         cursor: Optional[str],
         sort_by: str,
         sort_order: str
-    ) -> tuple[List[Dict[str, Any]], int, Optional[str]]:
-        """Execute paginated query against documents table"""
+    ) -> tuple[List[Dict[str, Any]], Optional[int], Optional[str]]:
+        """
+        Execute paginated query against documents table
+        
+        With a cursor, the page is located by a row-value comparison on
+        (sort_by, id) so the database seeks the composite index instead of
+        scanning and discarding OFFSET rows. Page/OFFSET is only used when
+        no cursor is given.
+        
+        The total is counted only for page requests; cursor pages return
+        None rather than re-counting every matching row on each page.
+        """
         
         if not self.db:
             return [], 0, None
@@ -642,8 +1028,9 @@ class DocumentService:
                 params["file_type"] = filters["file_type"]
                 
             if filters.get("tags_contain"):
-                where_conditions.append("tags && %(tags)s")  # PostgreSQL array overlap
-                params["tags"] = filters["tags_contain"]
+                # Array overlap is answered by the GIN index on tags
+                where_conditions.append("tags && %(tags)s::text[]")
+                params["tags"] = list(filters["tags_contain"])
                 
             if filters.get("created_after"):
                 where_conditions.append("created_at >= %(created_after)s")
@@ -668,46 +1055,77 @@ class DocumentService:
                 sort_by = "created_at"
             if sort_order.lower() not in ["asc", "desc"]:
                 sort_order = "desc"
-                
-            # Calculate offset for pagination
-            offset = (page - 1) * page_size
-            params["limit"] = page_size
-            params["offset"] = offset
+            sort_order = sort_order.lower()
             
-            # Main query
+            # Count query shares the filters but not the keyset condition
             where_clause = " AND ".join(where_conditions)
-            query = f"""
-            SELECT 
-                id, file_name, original_filename, uploaded_by, status, file_size,
-                file_type, mime_type, document_type, version, etag, 
-                ocr_completed, ocr_confidence, security_scan_status, virus_scan_status,
-                download_count, last_accessed, metadata, tags,
-                created_at, updated_at, last_modified
+            count_query = f"""
+            SELECT COUNT(*) as total 
             FROM documents 
             WHERE {where_clause}
-            ORDER BY {sort_by} {sort_order.upper()}
-            LIMIT %(limit)s OFFSET %(offset)s
             """
+            count_params = dict(params)
             
-            # Count query
-            count_query = f"""
-            SELECT COUNT(*) as total 
+            null_default = NULLABLE_SORT_DEFAULTS.get(sort_by)
+            sort_key = f"COALESCE({sort_by}, {null_default})" if null_default else sort_by
+            
+            # Keyset position from cursor, OFFSET only when no cursor is given
+            pagination_clause = "LIMIT %(limit)s"
+            params["limit"] = page_size + 1  # One extra row tells us if there is a next page
+            
+            if cursor:
+                try:
+                    cursor_sort_by, cursor_sort_order, cursor_value, cursor_id = decode_cursor(cursor)
+                except ValueError as e:
+                    raise ValidationError(str(e))
+                # A cursor reused under another ordering would skip or repeat rows
+                if (cursor_sort_by, cursor_sort_order) != (sort_by, sort_order):
+                    raise ValidationError("Pagination cursor does not match the requested sort order")
+                
+                comparator = "<" if sort_order == "desc" else ">"
+                cursor_key = f"COALESCE(%(cursor_value)s, {null_default})" if null_default else "%(cursor_value)s"
+                where_conditions.append(
+                    f"({sort_key}, id) {comparator} ({cursor_key}, %(cursor_id)s)"
+                )
+                params["cursor_value"] = cursor_value
+                params["cursor_id"] = cursor_id
+            else:
+                pagination_clause += " OFFSET %(offset)s"
+                params["offset"] = (page - 1) * page_size
+            
+            # Main query - id breaks ties so the keyset order is total. Only
+            # summary columns are read (the sort key is needed for the cursor)
+            columns = LIST_COLUMNS if sort_by in LIST_COLUMNS else (*LIST_COLUMNS, sort_by)
+            where_clause = " AND ".join(where_conditions)
+            query = f"""
+            SELECT {', '.join(columns)}
             FROM documents 
             WHERE {where_clause}
+            ORDER BY {sort_key} {sort_order.upper()}, id {sort_order.upper()}
+            {pagination_clause}
             """
             
-            # Execute queries
+            # Execute queries; later pages skip the O(n) count
             documents_result = await self.db.fetchall(query, params)
-            count_result = await self.db.fetchone(count_query, params)
+            total_count = None
+            if not cursor:
+                count_result = await self.db.fetchone(count_query, count_params)
+                total_count = count_result["total"] if count_result else 0
             
             documents = [dict(row) for row in documents_result] if documents_result else []
-            total_count = count_result["total"] if count_result else 0
             
-            # Generate next cursor (simple implementation)
-            next_cursor = str(page + 1) if (page * page_size) < total_count else None
+            # Next cursor is the sort key of the last row actually returned
+            next_cursor = None
+            if len(documents) > page_size:
+                documents = documents[:page_size]
+                last_row = documents[-1]
+                next_cursor = encode_cursor(sort_by, sort_order, last_row.get(sort_by), last_row["id"])
             
             return documents, total_count, next_cursor
             
+        except ValidationError:
+            raise
+            
         except Exception as e:
             self.logger.error(f"Database query failed: {str(e)}")
             raise DocumentProcessingError(f"Failed to query documents: {str(e)}")
@@ -731,23 +1149,28 @@ class DocumentService:
             if_match: ETag for optimistic locking
             
         Returns:
-            Updated document metadata
+            Updated document metadata, including the new etag
+            
+        Raises:
+            PreconditionFailedError: If if_match is stale or a concurrent update won
         """
         
         try:
-            # Verify document exists and user has access
-            document = await self._get_document_record(document_id)
+            # Projected lookup: enough for access and ETag checks, so a stale
+            # If-Match is rejected before any full read or write
+            document = await self._get_document_header_record(document_id)
             if not document:
-                raise DocumentProcessingError("Document not found")
+                raise DocumentNotFoundError(f"Document {document_id} not found")
                 
             if not await self._check_document_access(document, user_id):
-                raise DocumentProcessingError("Access denied to document")
+                raise AuthorizationError("Access denied to document")
             
-            # Check ETag for optimistic locking
-            if if_match:
-                current_etag = document.get('etag')
-                if current_etag != if_match:
-                    raise DocumentProcessingError("Document was modified by another request (ETag mismatch)")
+            # Check ETag for optimistic locking (If-Match uses strong comparison)
+            if if_match and not etag_matches(if_match, self.get_document_etag(document), weak=False):
+                raise PreconditionFailedError(
+                    "Document was modified by another request (ETag mismatch)",
+                    document_id=document_id
+                )
             
             # Validate update data
             validated_updates = await self._validate_document_updates(updates)
@@ -769,33 +1192,40 @@ class DocumentService:
             # Add automatic fields
             update_fields['updated_at'] = datetime.utcnow()
             update_fields['last_modified'] = datetime.utcnow()
-            update_fields['version'] = document.get('version', 1) + 1
+            expected_version = document.get('version', 1)
+            update_fields['version'] = expected_version + 1
             
             # Build dynamic UPDATE query
             set_clauses = []
-            params = {"document_id": document_id}
+            params = {"document_id": document_id, "expected_version": expected_version}
             
             for field, value in update_fields.items():
                 set_clauses.append(f"{field} = %({field})s")
                 params[field] = value
             
+            # Compare-and-set on version so a writer that slipped in after
+            # the check above still cannot be overwritten
             query = f"""
                 UPDATE documents 
                 SET {', '.join(set_clauses)}
-                WHERE id = %(document_id)s AND deleted_at IS NULL
+                WHERE id = %(document_id)s AND version = %(expected_version)s AND deleted_at IS NULL
+                RETURNING *
             """
             
             # Execute update
             if self.db:
-                await self.db.execute(query, params)
+                updated_document = await self.db.fetchone(query, params)
             else:
                 raise DocumentProcessingError("Database connection not available")
             
-            # Get updated document
-            updated_document = await self._get_document_record(document_id)
-            
             if not updated_document:
-                raise DocumentProcessingError("Document update failed")
+                raise PreconditionFailedError(
+                    "Document was modified by another request (version mismatch)",
+                    document_id=document_id
+                )
+            
+            updated_document = dict(updated_document)
+            updated_document["etag"] = self.get_document_etag(updated_document)
             
             # Log update event
             await self._log_document_access(
@@ -808,7 +1238,7 @@ class DocumentService:
             
             return updated_document
             
-        except DocumentProcessingError:
+        except (DocumentNotFoundError, AuthorizationError, PreconditionFailedError, DocumentProcessingError):
             raise
         except Exception as e:
             # Log error and convert to appropriate exception
@@ -959,6 +1389,66 @@ class DocumentService:
             
             raise DocumentProcessingError(f"Document download failed: {str(e)}")
     
+    async def stream_document(
+        self,
+        document_id: str,
+        user_id: str,
+        range_header: Optional[str] = None,
+        chunk_size: int = 1 << 20
+    ) -> Dict[str, Any]:
+        """
+        Open a chunked stream of document content
+        
+        Unlike download_document, the file is never buffered in memory: the
+        returned "stream" is an async generator pulling chunk_size reads from
+        storage, so the caller can hand it straight to a StreamingResponse.
+        
+        Args:
+            document_id: Document unique identifier
+            user_id: Requesting user ID
+            range_header: Raw HTTP Range header for partial downloads
+            chunk_size: Bytes per streamed chunk
+            
+        Returns:
+            Dict with stream, byte_range, file_size, mime_type, filename and etag
+        """
+        
+        document = await self._get_document_record(document_id)
+        if not document:
+            raise DocumentNotFoundError(document_id)
+        
+        if not await self._check_document_access(document, user_id):
+            raise AuthorizationError("Access denied to document")
+        
+        file_size = document.get("file_size") or 0
+        try:
+            byte_range = parse_range_header(range_header, file_size)
+        except ValueError as e:
+            raise RangeNotSatisfiableError(file_size, detail=str(e))
+        
+        storage_key = document.get("storage_key")
+        if not (self.storage and storage_key):
+            raise DocumentProcessingError("File not found in storage")
+        
+        # Bookkeeping happens before the first byte is sent
+        await self._update_download_stats(document_id)
+        self._stats["total_downloads"] += 1
+        await self._log_document_access(
+            document_id=document_id,
+            user_id=user_id,
+            access_type="download"
+        )
+        
+        return {
+            "stream": self.storage.stream_file(storage_key, user_id, chunk_size, byte_range),
+            "byte_range": byte_range,
+            "file_size": file_size,
+            "mime_type": document.get("mime_type") or "application/octet-stream",
+            "filename": document.get("original_filename") or document.get("file_name"),
+            "etag": document.get("etag"),
+            "storage_key": storage_key
+        }
+    
     # ============= DOCUMENT STATISTICS =============
     
     async def get_document_statistics(self, user_id: str) -> Dict[str, Any]:
@@ -988,36 +1478,18 @@ class DocumentService:
                     "storage_used_percent": 0.0
                 }
             
-            # Calculate document statistics
+            # Totals and breakdowns come from the trigger-maintained roll-up
+            # row, so cost does not grow with the number of documents
             stats_query = """
             SELECT 
-                COUNT(*) as total_documents,
-                SUM(file_size) as total_storage_bytes,
-                COUNT(CASE WHEN ocr_completed = true THEN 1 END) as ocr_completed_count
-            FROM documents 
-            WHERE uploaded_by = %(user_id)s AND deleted_at IS NULL
-            """
-            stats_result = await self.db.fetchrow(stats_query, {"user_id": user_id})
-            
-            # Count documents by status
-            status_query = """
-            SELECT status, COUNT(*) as count
-            FROM documents 
-            WHERE uploaded_by = %(user_id)s AND deleted_at IS NULL
-            GROUP BY status
-            """
-            status_results = await self.db.fetch(status_query, {"user_id": user_id})
-            
-            # Count documents by type
-            type_query = """
-            SELECT document_type, COUNT(*) as count
-            FROM documents 
-            WHERE uploaded_by = %(user_id)s AND deleted_at IS NULL AND document_type IS NOT NULL
-            GROUP BY document_type
+                total_documents, total_storage_bytes, ocr_completed,
+                documents_by_type, documents_by_status
+            FROM document_stats 
+            WHERE user_id = %(user_id)s
             """
-            type_results = await self.db.fetch(type_query, {"user_id": user_id})
+            stats_result = await self.db.fetchrow(stats_query, {"user_id": user_id}) or {}
             
-            # Get today's upload count
+            # Get today's upload count (bounded to today's rows by created_at)
             today_upload_query = """
             SELECT COUNT(*) as upload_count
             FROM documents 
@@ -1040,21 +1512,21 @@ class DocumentService:
             today_download_result = await self.db.fetchrow(today_download_query, {"user_id": user_id})
             
             # Calculate processing metrics
-            total_storage_bytes = stats_result['total_storage_bytes'] or 0
+            total_storage_bytes = stats_result.get('total_storage_bytes') or 0
             total_storage_mb = total_storage_bytes / (1024 * 1024)
             storage_quota_mb = getattr(settings, 'DEFAULT_STORAGE_QUOTA_MB', 1000)
             storage_used_percent = (total_storage_mb / storage_quota_mb * 100) if storage_quota_mb > 0 else 0.0
             
-            # Format results
-            documents_by_status = {row['status']: row['count'] for row in status_results}
-            documents_by_type = {row['document_type']: row['count'] for row in type_results}
+            # Format results (counters can reach zero but keys stay in the JSONB)
+            documents_by_status = {k: v for k, v in (stats_result.get('documents_by_status') or {}).items() if v}
+            documents_by_type = {k: v for k, v in (stats_result.get('documents_by_type') or {}).items() if v}
             
             return {
-                "total_documents": stats_result['total_documents'] or 0,
+                "total_documents": stats_result.get('total_documents') or 0,
                 "total_storage_mb": round(total_storage_mb, 2),
                 "documents_by_type": documents_by_type,
                 "documents_by_status": documents_by_status,
-                "ocr_completed": stats_result['ocr_completed_count'] or 0,
+                "ocr_completed": stats_result.get('ocr_completed') or 0,
                 "processing_queue": documents_by_status.get('processing', 0),
                 "upload_count_today": today_upload_result['upload_count'] or 0,
                 "download_count_today": today_download_result['download_count'] or 0,
@@ -1219,37 +1691,37 @@ class DocumentService:
         
         return document_type_mapping.get(ext, 'unknown_document')
     
-    async def _generate_signed_download_url(self, document_id: str, user_id: str, expires_in: int = 3600) -> Optional[str]:
-        """Generate signed download URL for document"""
+    async def _generate_signed_download_url(
+        self,
+        document_id: str,
+        user_id: str,
+        expires_in: int = 3600,
+        document: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """
+        Generate signed download URL for document
+        
+        Pass an already-loaded, access-checked record as `document` to skip
+        the lookup. Signatures are cached per SIGNED_URL_BUCKET_SECONDS window.
+        """
         if self.storage:
             try:
-                # Get document record to determine storage backend
-                document = await self._get_document_record(document_id)
-                if not document:
-                    return None
-                
-                # Check if user has access
-                if not await self._check_document_access(document, user_id):
-                    return None
-                
-                storage_key = document.get('storage_key')
-                storage_bucket = document.get('storage_bucket', 'documents')
-                
-                if storage_key:
-                    # Generate signed URL via storage service
-                    # This would typically call storage service's generate_presigned_url method
-                    expiry_time = datetime.utcnow() + timedelta(seconds=expires_in)
+                if document is None:
+                    # Get document record to determine storage backend
+                    document = await self._get_document_record(document_id)
+                    if not document:
+                        return None
                     
+                    # Check if user has access
+                    if not await self._check_document_access(document, user_id):
+                        return None
+                
+                if document.get('storage_key'):
                     # For S3-like storage, this would generate a presigned URL
-                    # For local storage, this would be a time-limited token URL
-                    signed_url = f"/api/v1/documents/{document_id}/download"
-                    
-                    # Add query parameters for validation
-                    signed_url += f"?expires={int(expiry_time.timestamp())}"
-                    signed_url += f"&user_id={user_id}"
-                    signed_url += f"&signature={self._generate_url_signature(document_id, user_id, expiry_time)}"
-                    
-                    return signed_url
+                    # (TODO: run boto's presign via asyncio.to_thread on a cache miss)
+                    # For local storage, this is a time-limited token URL
+                    expiry_bucket = int(time.time()) // SIGNED_URL_BUCKET_SECONDS
+                    return _sign_download_url(str(document_id), user_id, expiry_bucket, expires_in)
                     
             except Exception as e:
                 self.logger.warning(f"Failed to generate download URL for {document_id}: {str(e)}")
@@ -1257,22 +1729,6 @@ class DocumentService:
         # Fallback to direct download endpoint
         return f"/api/v1/documents/{document_id}/download"
     
-    def _generate_url_signature(self, document_id: str, user_id: str, expiry_time: datetime) -> str:
-        """Generate URL signature for download authentication"""
-        import hashlib
-        import hmac
-        
-        # Use a secret key from settings or environment
-        secret_key = getattr(settings, 'SECRET_KEY', 'fallback-secret-key').encode('utf-8')
-        
-        # Create signature payload
-        payload = f"{document_id}:{user_id}:{int(expiry_time.timestamp())}"
-        
-        # Generate HMAC signature
-        signature = hmac.new(secret_key, payload.encode('utf-8'), hashlib.sha256).hexdigest()
-        
-        return signature[:16]  # Truncate for URL brevity
-    
     async def _validate_upload_file(self, file_content: bytes, filename: str, content_type: Optional[str]) -> Dict[str, Any]:
         """Validate uploaded file content and metadata"""
         validation_result = {"is_valid": True, "errors": [], "warnings": []}
@@ -1394,8 +1850,7 @@ class DocumentService:
             query = """
             UPDATE documents 
             SET download_count = download_count + 1, 
-                last_accessed = %(timestamp)s, 
-                updated_at = %(timestamp)s
+                last_accessed = %(timestamp)s
             WHERE id = %(document_id)s AND deleted_at IS NULL
             """
             await self.db.execute(query, {
@@ -0,0 +1,350 @@
+"""
+OCR Queue Service for handing OCR jobs to out-of-process workers.
+
+API workers only record a job and push it onto the Redis list named by
+OCR_QUEUE_NAME; OCR workers pop jobs from that list, call Mistral, and
+update the job hash. No OCR work runs inside the HTTP process.
+"""
+
+from typing import Dict, List, Optional, Any, Iterator, Sequence, TypeVar
+import functools
+import json
+import logging
+import secrets
+import time
+from datetime import datetime, timedelta
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableError, ValidationError
+from app.utils.response_utils import encode_cursor, decode_cursor
+
+logger = logging.getLogger(__name__)
+
+# Job state hashes live under this prefix, e.g. ocr:job:<job_id>
+OCR_JOB_KEY_PREFIX = "ocr:job:"
+
+# Per-user job index, e.g. ocr:user_jobs:<user_id>. Members are
+# "<queued_at>|<job_id>" at score 0, so lexicographic order is the
+# (created_at, id) keyset order and ZCARD is the user's job count
+OCR_USER_JOBS_KEY_PREFIX = "ocr:user_jobs:"
+
+# Queue statistics are plain counters kept up to date with INCR/DECR as
+# jobs move through the queue, so status reads never walk the queue
+OCR_QUEUE_PENDING_KEY = "ocr:queue:pending"
+OCR_QUEUE_RUNNING_KEY = "ocr:queue:running"
+# Completions per wall-clock minute, e.g. ocr:queue:completed:<epoch minute>
+OCR_QUEUE_COMPLETED_KEY_PREFIX = "ocr:queue:completed:"
+
+# Finished or abandoned job records expire after this long
+OCR_JOB_TTL_SECONDS = 7 * 24 * 3600
+
+# Job and batch ids are 128 random bits as 32 hex characters: the same
+# entropy as a UUID4 and accepted by uuid.UUID path parameters (whose .hex
+# gives back the stored form), without building a UUID object per id
+JOB_ID_BYTES = 16
+
+T = TypeVar("T")
+
+
+def new_ids(count: int) -> List[str]:
+    """Generate `count` random hex ids from a single urandom read"""
+    token = secrets.token_hex(JOB_ID_BYTES * count)
+    width = JOB_ID_BYTES * 2
+    return [token[i:i + width] for i in range(0, len(token), width)]
+
+
+def chunked(items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    """Split `items` into consecutive slices of at most `size` elements"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class OCRQueueService:
+    """
+    Producer side of the OCR job queue.
+
+    Each job is a hash at ocr:job:<job_id> (status and parameters, read
+    by status endpoints) plus a JSON payload on OCR_QUEUE_NAME. This is
+    the only producer; DocumentService queues upload OCR through it too.
+    """
+
+    def __init__(self, redis_client: redis.Redis):
+        self.redis = redis_client
+        self.queue_name = settings.OCR_QUEUE_NAME
+
+    async def enqueue_jobs(
+        self,
+        document_ids: List[str],
+        user_id: Optional[str] = None,
+        priority: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        Create and queue one OCR job per document in a single round trip.
+
+        Args:
+            document_ids: Documents to process
+            user_id: Owner user ID
+            priority: Processing priority (1=highest), passed to workers
+
+        Returns:
+            Created job records (job_id, document_id, status, ...)
+
+        Raises:
+            ServiceUnavailableError: If the queue cannot be reached
+        """
+        queued_at = datetime.utcnow().isoformat(timespec="microseconds")
+        jobs = [
+            {
+                "job_id": job_id,
+                "document_id": str(document_id),
+                "user_id": user_id or "",
+                "priority": priority,
+                "status": "pending",
+                "queued_at": queued_at
+            }
+            for job_id, document_id in zip(new_ids(len(document_ids)), document_ids)
+        ]
+        if jobs:
+            await self._push_jobs(jobs)
+
+        return jobs
+
+    async def enqueue_batch(
+        self,
+        document_ids: List[str],
+        user_id: Optional[str] = None,
+        priority: int = 5
+    ) -> Dict[str, Any]:
+        """
+        Queue a batch as one job per OCR_BATCH_SIZE documents.
+
+        A worker handles each chunk in one task, so per-request overhead to
+        Mistral (connection reuse, rate-limit accounting) is paid per chunk
+        rather than per document.
+
+        Args:
+            document_ids: Documents to process
+            user_id: Owner user ID
+            priority: Processing priority (1=highest), passed to workers
+
+        Returns:
+            batch_id, job_ids, chunk_count and document_count
+
+        Raises:
+            ServiceUnavailableError: If the queue cannot be reached
+        """
+        chunks = list(chunked(document_ids, settings.OCR_BATCH_SIZE))
+        batch_id, *job_ids = new_ids(len(chunks) + 1)
+        queued_at = datetime.utcnow().isoformat(timespec="microseconds")
+        jobs = [
+            {
+                "job_id": job_id,
+                "batch_id": batch_id,
+                "document_ids": json.dumps([str(document_id) for document_id in chunk]),
+                "user_id": user_id or "",
+                "priority": priority,
+                "status": "pending",
+                "queued_at": queued_at
+            }
+            for job_id, chunk in zip(job_ids, chunks)
+        ]
+
+        if jobs:
+            await self._push_jobs(jobs)
+
+        return {
+            "batch_id": batch_id,
+            "job_ids": [job["job_id"] for job in jobs],
+            "chunk_count": len(jobs),
+            "document_count": len(document_ids)
+        }
+
+    async def _push_jobs(self, jobs: List[Dict[str, Any]]) -> None:
+        """
+        Write job records and queue entries in one MULTI/EXEC round trip,
+        so they land together or not at all.
+        """
+        pipe = self.redis.pipeline(transaction=True)
+        for job in jobs:
+            key = OCR_JOB_KEY_PREFIX + job["job_id"]
+            pipe.hset(key, mapping=job)
+            pipe.expire(key, OCR_JOB_TTL_SECONDS)
+        pipe.lpush(self.queue_name, *(json.dumps(job) for job in jobs))
+        pipe.incrby(OCR_QUEUE_PENDING_KEY, len(jobs))
+
+        # Index jobs per user for listing; entries older than the job TTL
+        # point at expired records and are trimmed on the next write
+        index_cutoff = (datetime.utcnow() - timedelta(seconds=OCR_JOB_TTL_SECONDS)).isoformat()
+        for user_id in {job["user_id"] for job in jobs if job["user_id"]}:
+            index_key = OCR_USER_JOBS_KEY_PREFIX + user_id
+            pipe.zadd(index_key, {
+                f"{job['queued_at']}|{job['job_id']}": 0
+                for job in jobs if job["user_id"] == user_id
+            })
+            pipe.zremrangebylex(index_key, "-", f"({index_cutoff}")
+            pipe.expire(index_key, OCR_JOB_TTL_SECONDS)
+
+        try:
+            await pipe.execute()
+        except redis.RedisError as e:
+            logger.error(f"Failed to queue OCR jobs: {str(e)}", extra={"job_count": len(jobs)})
+            raise ServiceUnavailableError("OCR queue is unavailable")
+
+    async def record_job_started(self, job_id: str) -> None:
+        """Worker hook: move a job from pending to running"""
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.decr(OCR_QUEUE_PENDING_KEY)
+        pipe.incr(OCR_QUEUE_RUNNING_KEY)
+        pipe.hset(OCR_JOB_KEY_PREFIX + job_id, "status", "processing")
+        await pipe.execute()
+
+    async def record_job_finished(self, job_id: str, status: str = "completed") -> None:
+        """Worker hook: mark a running job finished and count it toward throughput"""
+        completed_key = OCR_QUEUE_COMPLETED_KEY_PREFIX + str(int(time.time() // 60))
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.decr(OCR_QUEUE_RUNNING_KEY)
+        pipe.incr(completed_key)
+        pipe.expire(completed_key, 120)
+        pipe.hset(OCR_JOB_KEY_PREFIX + job_id, "status", status)
+        await pipe.execute()
+
+    async def get_queue_stats(self) -> Dict[str, Any]:
+        """
+        Read queue counters in a single MGET.
+
+        Throughput is the number of jobs finished in the last full minute;
+        the wait estimate is pending jobs divided by that rate.
+
+        Returns:
+            pending, running, completed_last_minute and
+            estimated_wait_minutes (None when there is no recent throughput)
+
+        Raises:
+            ServiceUnavailableError: If the queue cannot be reached
+        """
+        previous_minute = int(time.time() // 60) - 1
+        try:
+            values = await self.redis.mget(
+                OCR_QUEUE_PENDING_KEY,
+                OCR_QUEUE_RUNNING_KEY,
+                OCR_QUEUE_COMPLETED_KEY_PREFIX + str(previous_minute)
+            )
+        except redis.RedisError as e:
+            logger.error(f"Failed to read OCR queue stats: {str(e)}")
+            raise ServiceUnavailableError("OCR queue is unavailable")
+
+        # Counters can dip below zero if a worker dies mid-job; clamp them
+        pending, running, completed = (max(int(value or 0), 0) for value in values)
+        return {
+            "pending": pending,
+            "running": running,
+            "completed_last_minute": completed,
+            "estimated_wait_minutes": pending / completed if completed else None
+        }
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a job's current record.
+
+        Args:
+            job_id: OCR job ID
+
+        Returns:
+            Job record, or None if unknown or expired
+        """
+        try:
+            job = await self.redis.hgetall(OCR_JOB_KEY_PREFIX + job_id)
+        except redis.RedisError as e:
+            logger.error(f"Failed to read OCR job {job_id}: {str(e)}")
+            raise ServiceUnavailableError("OCR queue is unavailable")
+        return job or None
+
+    async def list_user_jobs(
+        self,
+        user_id: str,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        sort_order: str = "desc",
+        status: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        List a user's jobs by queue time with keyset pagination.
+
+        Pages are read from the per-user index with ZRANGEBYLEX starting
+        just past the cursor position, so page N costs the same as page 1.
+
+        Args:
+            user_id: Owner user ID
+            limit: Maximum number of jobs to return
+            cursor: next_cursor from a previous page
+            sort_order: "desc" (newest first) or "asc"
+            status: Only return jobs in this status
+
+        Returns:
+            jobs, next_cursor and total_count (None when filtering by status)
+
+        Raises:
+            ValidationError: If the cursor is invalid or was issued for another sort order
+            ServiceUnavailableError: If the queue cannot be reached
+        """
+        descending = sort_order == "desc"
+        bound = "+" if descending else "-"
+        if cursor:
+            try:
+                cursor_sort_by, cursor_sort_order, queued_at, job_id = decode_cursor(cursor)
+            except ValueError as e:
+                raise ValidationError(str(e))
+            if (cursor_sort_by, cursor_sort_order) != ("created_at", sort_order):
+                raise ValidationError("Pagination cursor does not match the requested sort order")
+            bound = f"({queued_at}|{job_id}"
+
+        index_key = OCR_USER_JOBS_KEY_PREFIX + user_id
+        jobs: List[Dict[str, Any]] = []
+        try:
+            # One extra job tells us if there is a next page; a status filter
+            # can drop jobs, so keep reading index pages until that is known
+            while len(jobs) <= limit:
+                if descending:
+                    members = await self.redis.zrevrangebylex(index_key, bound, "-", start=0, num=limit + 1)
+                else:
+                    members = await self.redis.zrangebylex(index_key, bound, "+", start=0, num=limit + 1)
+                if not members:
+                    break
+
+                pipe = self.redis.pipeline(transaction=False)
+                for member in members:
+                    pipe.hgetall(OCR_JOB_KEY_PREFIX + member.split("|", 1)[1])
+                for job in await pipe.execute():
+                    if job and (status is None or job.get("status") == status):
+                        jobs.append(job)
+
+                if len(members) <= limit:
+                    break
+                bound = "(" + members[-1]
+
+            total_count = await self.redis.zcard(index_key) if status is None else None
+        except redis.RedisError as e:
+            logger.error(f"Failed to list OCR jobs: {str(e)}", extra={"user_id": user_id})
+            raise ServiceUnavailableError("OCR queue is unavailable")
+
+        next_cursor = None
+        if len(jobs) > limit:
+            jobs = jobs[:limit]
+            next_cursor = encode_cursor("created_at", sort_order, jobs[-1]["queued_at"], jobs[-1]["job_id"])
+
+        return {"jobs": jobs, "next_cursor": next_cursor, "total_count": total_count}
+
+
+@functools.lru_cache(maxsize=1)
+def get_ocr_queue_service() -> OCRQueueService:
+    """
+    Dependency provider for the OCR queue (one connection pool per process).
+
+    The broker URL is shared with CELERY_BROKER_URL; connections are opened
+    on first use.
+    """
+    return OCRQueueService(
+        redis.from_url(settings.CELERY_BROKER_URL, decode_responses=True)
+    )
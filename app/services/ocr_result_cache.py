@@ -0,0 +1,126 @@
+"""
+OCR Result Cache backed by Redis.
+
+Results of a completed OCR job do not change, so each rendered response
+body is kept as serialized bytes and served without touching storage or
+re-serializing. All variants of one document (format and include_* flags)
+live as fields of a single hash, so a retry invalidates them with one DEL.
+The hash also holds a random result tag that HTTP ETags are derived from,
+so conditional requests are answered without reading the results.
+"""
+
+from typing import Optional, Tuple
+import secrets
+import functools
+import logging
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Result hashes live under this prefix, e.g. ocr:results:<document_id>
+OCR_RESULT_KEY_PREFIX = "ocr:results:"
+
+# Hash field holding the document's result tag; variant fields contain ":"
+RESULT_TAG_FIELD = "tag"
+
+
+class OCRResultCache:
+    """
+    Cache of serialized OCR result responses.
+
+    Redis failures are logged and treated as misses; the cache never
+    fails a request that could be answered without it.
+    """
+
+    def __init__(self, redis_client: redis.Redis, ttl_seconds: int):
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def variant(format: str, include_confidence: bool, include_tables: bool, include_images: bool) -> str:
+        """Hash field naming one rendering of a document's results"""
+        return f"{format}:{int(include_confidence)}:{int(include_tables)}:{int(include_images)}"
+
+    async def lookup(self, document_id: str, variant: str) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        Get a cached response body and the document's result tag in one HMGET.
+
+        Args:
+            document_id: Document unique identifier
+            variant: Field from `variant()`
+
+        Returns:
+            (body, result tag); either is None when not cached
+        """
+        try:
+            body, tag = await self.redis.hmget(OCR_RESULT_KEY_PREFIX + document_id, [variant, RESULT_TAG_FIELD])
+        except redis.RedisError as e:
+            logger.warning(f"OCR result cache read failed: {str(e)}", extra={"document_id": document_id})
+            return None, None
+        return body, tag.decode("ascii") if tag is not None else None
+
+    async def get_result_tag(self, document_id: str) -> Optional[str]:
+        """
+        Get the document's result tag, creating it if absent.
+
+        The tag is dropped with the rest of the hash on invalidation, so
+        new results always get a new tag.
+
+        Returns:
+            Result tag, or None if Redis is unavailable
+        """
+        key = OCR_RESULT_KEY_PREFIX + document_id
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.hsetnx(key, RESULT_TAG_FIELD, secrets.token_hex(8))
+        pipe.hget(key, RESULT_TAG_FIELD)
+        pipe.expire(key, self.ttl_seconds)
+
+        try:
+            _, tag, _ = await pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"OCR result tag lookup failed: {str(e)}", extra={"document_id": document_id})
+            return None
+        return tag.decode("ascii")
+
+    async def set(self, document_id: str, variant: str, body: bytes) -> None:
+        """Store a response body; the document's TTL restarts on each write"""
+        key = OCR_RESULT_KEY_PREFIX + document_id
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.hset(key, variant, body)
+        pipe.expire(key, self.ttl_seconds)
+
+        try:
+            await pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"OCR result cache write failed: {str(e)}", extra={"document_id": document_id})
+
+    async def invalidate(self, *document_ids: str) -> None:
+        """Drop every cached rendering of the documents' results in one DEL"""
+        if not document_ids:
+            return
+
+        try:
+            await self.redis.delete(*(OCR_RESULT_KEY_PREFIX + document_id for document_id in document_ids))
+        except redis.RedisError as e:
+            logger.warning(f"OCR result cache invalidation failed: {str(e)}", extra={"document_ids": document_ids})
+
+
+@functools.lru_cache(maxsize=1)
+def get_ocr_result_cache() -> OCRResultCache:
+    """
+    Dependency provider for the OCR result cache (one connection pool per process).
+
+    Bodies are stored as raw bytes, so responses are not decoded.
+    """
+    redis_config = settings.get_redis_config()
+    return OCRResultCache(
+        redis.from_url(
+            redis_config["url"],
+            max_connections=redis_config["max_connections"],
+            decode_responses=False
+        ),
+        settings.OCR_CACHE_TTL_SECONDS
+    )
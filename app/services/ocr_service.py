@@ -12,13 +12,78 @@ import io
 import base64
 from datetime import datetime, timedelta
 
+import httpx
+
 from app.core.config import settings
 from app.core.exceptions import OCRProcessingError, ExternalServiceError
+from app.core.secrets_config import get_config
 # TODO: Import models when they are implemented
 # from app.models import OCRResult, DocumentMetadata
 
 logger = logging.getLogger(__name__)
 
+# One pooled client per process: Mistral calls reuse TCP/TLS connections
+# instead of handshaking per OCR job
+_mistral_client: Optional[httpx.AsyncClient] = None
+
+
+# Set once the Secrets Manager fallback has been logged, so a missing key
+# is reported once rather than on every Mistral request
+_warned_key_fallback = False
+
+
+def _current_mistral_api_key() -> Optional[str]:
+    """
+    The Mistral key as of now; Secrets Manager values rotate in the background.
+    
+    Only the loaded secrets cache is read: fetching from a request would need
+    asyncio.run inside the running loop.
+    """
+    global _warned_key_fallback
+    if settings.ENABLE_AWS_SECRETS:
+        api_key = get_config().cached_mistral_api_key
+        if api_key:
+            return api_key
+        if not _warned_key_fallback:
+            _warned_key_fallback = True
+            logger.warning("Mistral API key not loaded from Secrets Manager; using MISTRAL_API_KEY")
+    return settings.MISTRAL_API_KEY
+
+
+class _MistralKeyAuth(httpx.Auth):
+    """Set the bearer token on each request, so a rotated key takes effect
+    without rebuilding the pooled client"""
+
+    def auth_flow(self, request: httpx.Request):
+        request.headers["Authorization"] = f"Bearer {_current_mistral_api_key() or ''}"
+        yield request
+
+
+def get_mistral_client() -> httpx.AsyncClient:
+    """Get the process-wide Mistral API client, creating it on first use"""
+    global _mistral_client
+    if _mistral_client is None or _mistral_client.is_closed:
+        limits = httpx.Limits(
+            max_connections=settings.MISTRAL_POOL_SIZE,
+            max_keepalive_connections=settings.MISTRAL_KEEPALIVE
+        )
+        _mistral_client = httpx.AsyncClient(
+            base_url=settings.MISTRAL_API_URL,
+            auth=_MistralKeyAuth(),
+            timeout=settings.OCR_TIMEOUT_SECONDS,
+            # Transport-level retries cover connect failures only
+            transport=httpx.AsyncHTTPTransport(limits=limits, retries=settings.OCR_MAX_RETRIES)
+        )
+    return _mistral_client
+
+
+async def close_mistral_client() -> None:
+    """Close the shared Mistral client (application shutdown)"""
+    global _mistral_client
+    if _mistral_client is not None:
+        await _mistral_client.aclose()
+        _mistral_client = None
+
 
 class OCRService:
     """
@@ -306,29 +371,20 @@ class OCRService:
         
         # TODO: Replace with actual Mistral API implementation
         # 
-        # Example implementation:
-        # async with aiohttp.ClientSession() as session:
-        #     headers = {
-        #         'Authorization': f'Bearer {settings.MISTRAL_API_KEY}',
-        #         'Content-Type': 'application/json'
-        #     }
-        #     
-        #     payload = {
-        #         'file_data': base64.b64encode(content).decode('utf-8'),
-        #         'file_type': file_type,
-        #         'language': options.get('language', 'auto'),
-        #         'enhance_image': options.get('enhance_image', True),
-        #         'detect_tables': options.get('detect_tables', False)
-        #     }
-        #     
-        #     async with session.post(
-        #         f'{settings.MISTRAL_OCR_ENDPOINT}/extract',
-        #         headers=headers,
-        #         json=payload
-        #     ) as response:
-        #         if response.status != 200:
-        #             raise OCRProcessingError(f"Mistral API error: {response.status}")
-        #         return await response.json()
+        # Example implementation (self._client is the shared pooled client;
+        # never open a session per call):
+        # payload = {
+        #     'file_data': base64.b64encode(content).decode('utf-8'),
+        #     'file_type': file_type,
+        #     'language': options.get('language', 'auto'),
+        #     'enhance_image': options.get('enhance_image', True),
+        #     'detect_tables': options.get('detect_tables', False)
+        # }
+        # 
+        # response = await self._client.post('/ocr', json=payload)
+        # if response.status_code != 200:
+        #     raise OCRProcessingError(f"Mistral API error: {response.status_code}")
+        # return response.json()
         
         # Placeholder response that matches expected OCR output structure
         placeholder_text = f"Sample extracted text from {file_type} document.\nThis is a placeholder OCR result.\nProcessed at {datetime.utcnow().isoformat()}"
@@ -421,15 +477,9 @@ class OCRService:
         
         return text.strip()
     
-    def _initialize_mistral_client(self):
-        """Initialize Mistral OCR client"""
-        # TODO: Replace with actual Mistral client initialization
-        # For now, return a mock client
-        return {
-            "api_key": self.mistral_api_key,
-            "base_url": self.mistral_base_url,
-            "initialized": True
-        }
+    def _initialize_mistral_client(self) -> httpx.AsyncClient:
+        """Get the shared, connection-pooled Mistral client"""
+        return get_mistral_client()
     
     def _detect_document_type(self, text: str) -> str:
         """Detect document type from extracted text content."""
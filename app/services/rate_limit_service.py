@@ -0,0 +1,100 @@
+"""
+Rate Limit Service for per-user request quotas.
+
+Windows are fixed-length counters. With RATE_LIMIT_STORAGE="redis" the
+counters are shared by all workers and each check is one atomic Lua call;
+otherwise every worker keeps its own counters in memory.
+"""
+
+from typing import Dict, List
+import functools
+import logging
+import time
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Rate limit counters live under this prefix, e.g. rate_limit:<scope>:<id>
+RATE_LIMIT_KEY_PREFIX = "rate_limit:"
+
+# In-memory windows are swept of expired entries beyond this many keys
+MAX_MEMORY_WINDOWS = 10_000
+
+# Count the hit and start the window on its first hit, atomically.
+# Returns 0 if allowed, otherwise milliseconds until the window resets
+WINDOW_SCRIPT = """
+local count = redis.call('INCRBY', KEYS[1], ARGV[3])
+if count == tonumber(ARGV[3]) then
+    redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+if count > tonumber(ARGV[1]) then
+    return math.max(redis.call('PTTL', KEYS[1]), 1)
+end
+return 0
+"""
+
+
+class RateLimitService:
+    """
+    Fixed-window rate limiter.
+
+    Redis failures are logged and the request is allowed: the limiter
+    protects capacity and should not become an outage of its own.
+    """
+
+    def __init__(self, redis_client: redis.Redis = None):
+        self.redis = redis_client
+        self._window_script = redis_client.register_script(WINDOW_SCRIPT) if redis_client is not None else None
+        self._windows: Dict[str, List[float]] = {}  # key -> [window end (monotonic), count]
+
+    async def hit(self, key: str, limit: int, window_seconds: int, cost: int = 1) -> float:
+        """
+        Count a request against its window.
+
+        Args:
+            key: Counter key, without RATE_LIMIT_KEY_PREFIX
+            limit: Units allowed per window
+            window_seconds: Window length
+            cost: Units this request consumes
+
+        Returns:
+            0 if the request is allowed, otherwise seconds until it would be
+        """
+        if self._window_script is not None:
+            try:
+                retry_after_ms = await self._window_script(
+                    keys=[RATE_LIMIT_KEY_PREFIX + key],
+                    args=[limit, window_seconds * 1000, cost]
+                )
+            except redis.RedisError as e:
+                logger.warning(f"Rate limit check failed, allowing request: {str(e)}", extra={"key": key})
+                return 0
+            return int(retry_after_ms) / 1000
+
+        now = time.monotonic()
+        window = self._windows.get(key)
+        if window is None or window[0] <= now:
+            if len(self._windows) >= MAX_MEMORY_WINDOWS:
+                self._windows = {k: w for k, w in self._windows.items() if w[0] > now}
+            window = self._windows[key] = [now + window_seconds, 0]
+        window[1] += cost
+        return window[0] - now if window[1] > limit else 0
+
+
+@functools.lru_cache(maxsize=1)
+def get_rate_limit_service() -> RateLimitService:
+    """Dependency provider for the rate limiter (one per process)"""
+    if settings.RATE_LIMIT_STORAGE != "redis":
+        return RateLimitService()
+
+    redis_config = settings.get_redis_config()
+    return RateLimitService(
+        redis.from_url(
+            redis_config["url"],
+            max_connections=redis_config["max_connections"],
+            decode_responses=True
+        )
+    )
@@ -24,6 +24,9 @@ import asyncio
 from app.utils.aws_secrets import AWSSecretsManager, AWSSecretsConfig, SecretValue
 from app.core.exceptions import ConfigurationError
 
+# Every secret the service reads, fetched together on preload and refresh
+SERVICE_SECRET_NAMES = ["mistral-ai", "storage", "auth-service", "database", "jwt", "monitoring"]
+
 
 class DocumentServiceSecretsManager:
     """
@@ -299,6 +302,22 @@ class DocumentServiceSecretsManager:
             return {"log_level": "INFO"}
 
 
+    async def preload_secrets(self) -> Dict[str, bool]:
+        """
+        Fetch every service secret in one BatchGetSecretValue call.
+        
+        The batch result warms the AWS client cache, so the per-secret
+        getters that rebuild this manager's cache make no further calls.
+        The boto3 call runs in a thread to keep the event loop free.
+        
+        Returns:
+            Dict mapping secret names to validation status
+        """
+        await asyncio.to_thread(self.secrets_manager.get_secrets, SERVICE_SECRET_NAMES)
+        self._cache.clear()
+        return await self.validate_secrets()
+
+
     async def refresh_secrets(self) -> bool:
         """
         Refresh all cached secrets from AWS Secrets Manager.
@@ -307,32 +326,15 @@ class DocumentServiceSecretsManager:
         are up-to-date, especially for rotating secrets.
         
         Returns:
-            bool: True if all secrets were refreshed successfully
-            
-        Raises:
-            ConfigurationError: If critical secrets cannot be refreshed
+            bool: True if all critical secrets were refreshed successfully
         """
         try:
             self.logger.info("Refreshing all cached secrets")
             
-            # Clear cache
-            self._cache.clear()
+            validation_results = await self.preload_secrets()
             
-            # Try to reload critical secrets
             critical_secrets = ["mistral-ai", "storage", "auth-service"]
-            success_count = 0
-            
-            for secret_name in critical_secrets:
-                try:
-                    if secret_name == "mistral-ai":
-                        await self.get_mistral_ai_config()
-                    elif secret_name == "storage":
-                        await self.get_storage_config()
-                    elif secret_name == "auth-service":
-                        await self.get_auth_service_config()
-                    success_count += 1
-                except Exception as e:
-                    self.logger.error(f"Failed to refresh secret '{secret_name}': {e}")
+            success_count = sum(1 for name in critical_secrets if validation_results.get(name))
             
             self.logger.info(f"Successfully refreshed {success_count}/{len(critical_secrets)} critical secrets")
             return success_count == len(critical_secrets)
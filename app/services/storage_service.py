@@ -4,7 +4,7 @@ Storage Service for handling file operations with AWS S3.
 This service provides an abstraction layer for file storage operations.
 """
 
-from typing import Dict, List, Optional, BinaryIO, Any
+from typing import Dict, List, Optional, BinaryIO, Any, AsyncIterator, Tuple
 import logging
 from pathlib import Path
 import asyncio
@@ -13,8 +13,9 @@ import hashlib
 import mimetypes
 
 from app.core.config import settings
-from app.core.exceptions import StorageError, NotFoundError
-from app.core.storage import StorageBackend
+from app.core.exceptions import APIException, StorageError, NotFoundError
+from app.core.storage import StorageBackend, DEFAULT_STREAM_CHUNK_SIZE
+from app.utils.file_utils import peek_stream, thumbnail_storage_key
 # TODO: Import models when implemented
 # from app.models import DocumentMetadata, UploadResult
 
@@ -148,6 +149,113 @@ class StorageService:
             logger.error(f"File upload failed: {str(e)}")
             raise StorageError(f"Failed to upload file: {str(e)}")
     
+    async def upload_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        filename: str,
+        content_type: str,
+        user_id: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        file_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Upload file content delivered as an async stream of chunks.
+        
+        The first chunk is validated before anything is written; the hash is
+        computed by the backend while the chunks are stored.
+        
+        Args:
+            chunks: Async iterator of file content chunks
+            filename: Original filename
+            content_type: MIME type of the file
+            user_id: ID of the user uploading the file
+            metadata: Additional metadata
+            file_size: Declared size, if known before the stream is read
+            
+        Returns:
+            Upload result with file information
+        """
+        try:
+            logger.info(f"Starting streamed file upload: {filename} for user {user_id}")
+            
+            head, chunks = await peek_stream(chunks)
+            await self._validate_file(head, filename, content_type)
+            
+            file_key = await self._generate_file_key(filename, user_id)
+            
+            upload_metadata = await self._prepare_metadata(
+                filename, content_type, file_size or 0, user_id, metadata
+            )
+            
+            storage_result = await self.storage.store_stream(
+                chunks, file_key, content_type, upload_metadata
+            )
+            file_hash = storage_result["file_hash"]
+            size = storage_result.get("size", file_size or 0)
+            
+            # Deduplication can only run once the hash is known
+            existing_file = await self._check_duplicate(file_hash, user_id)
+            if existing_file:
+                logger.info(f"Duplicate file detected: {file_hash}")
+                await self.storage.delete_file(file_key)
+                return existing_file
+            
+            logger.info(f"File uploaded successfully: {file_key}")
+            return {
+                "file_id": file_key,
+                "filename": filename,
+                "storage_url": storage_result,
+                "size": size,
+                "content_type": content_type,
+                "file_hash": file_hash,
+                "upload_time": datetime.utcnow(),
+                "metadata": upload_metadata,
+                "status": "success"
+            }
+            
+        except APIException:
+            # e.g. FileTooLargeError raised by the chunk iterator mid-stream
+            raise
+        except Exception as e:
+            logger.error(f"Streamed file upload failed: {str(e)}")
+            raise StorageError(f"Failed to upload file: {str(e)}")
+    
+    async def get_file_content(self, file_id: str) -> bytes:
+        """Read stored file content for internal processing (no access check)"""
+        try:
+            return await self.storage.get_file(file_id)
+        except Exception as e:
+            logger.error(f"Failed to read file {file_id}: {str(e)}")
+            raise StorageError(f"Failed to read file: {str(e)}")
+    
+    async def store_thumbnails(self, document_id: str, thumbnails: Dict[str, bytes]) -> Dict[str, str]:
+        """
+        Store pre-rendered thumbnails for a document.
+        
+        Returns:
+            Mapping of size name to storage key
+        """
+        keys = {}
+        try:
+            for size, content in thumbnails.items():
+                key = thumbnail_storage_key(document_id, size)
+                await self.storage.store_file(
+                    content, key, "image/webp",
+                    {"document_id": document_id, "thumbnail_size": size}
+                )
+                keys[size] = key
+            return keys
+        except Exception as e:
+            logger.error(f"Failed to store thumbnails for {document_id}: {str(e)}")
+            raise StorageError(f"Failed to store thumbnails: {str(e)}")
+    
+    async def get_thumbnail_url(self, document_id: str, size: str, expires_in: int = 86400) -> Optional[str]:
+        """Get a URL for a pre-rendered thumbnail, or None if it was never generated"""
+        key = thumbnail_storage_key(document_id, size)
+        if not await self.storage.file_exists(key):
+            return None
+        return await self.storage.get_file_url(key, expires_in)
+    
     async def download_file(self, file_id: str, user_id: str) -> Dict[str, Any]:
         """
         Download file from storage with access control.
@@ -184,6 +292,36 @@ class StorageService:
             logger.error(f"File download failed: {str(e)}")
             raise StorageError(f"Failed to download file: {str(e)}")
     
+    async def stream_file(
+        self,
+        file_id: str,
+        user_id: str,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        byte_range: Optional[Tuple[int, int]] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream file content from storage in fixed-size chunks.
+        
+        Peak memory is one chunk rather than the whole file, and the first
+        chunk can be sent as soon as storage returns it.
+        
+        Args:
+            file_id: Storage key of the file
+            user_id: Requesting user ID
+            chunk_size: Bytes per yielded chunk
+            byte_range: Optional inclusive (start, end) byte range
+        """
+        await self._validate_file_access(file_id, user_id)
+        
+        try:
+            async for chunk in self.storage.iter_file(file_id, chunk_size, byte_range):
+                yield chunk
+        except Exception as e:
+            logger.error(f"File stream failed: {str(e)}")
+            raise StorageError(f"Failed to stream file: {str(e)}")
+        
+        logger.info(f"File streamed: {file_id} by user {user_id}")
+    
     async def delete_file(self, file_id: str, user_id: str) -> bool:
         """
         Delete file from storage with proper cleanup.
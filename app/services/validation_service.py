@@ -10,14 +10,28 @@ import logging
 from datetime import datetime
 import mimetypes
 from pathlib import Path
-# TODO: Import python-magic when dependency is added
-# import magic  # python-magic for file type detection
+try:
+    import magic  # python-magic for file type detection
+except ImportError:  # libmagic missing on the host; fall back to signature checks
+    magic = None
 
 from app.core.config import settings
 from app.core.exceptions import ValidationError
 
 logger = logging.getLogger(__name__)
 
+# MIME types accepted for upload (frozenset for O(1) membership checks)
+ALLOWED_MIME_TYPES = frozenset({
+    'image/jpeg', 'image/png', 'image/tiff', 'image/bmp', 'image/gif',
+    'application/pdf', 'text/plain', 'application/msword',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'application/vnd.ms-excel',
+    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+})
+
+# Bytes of file header needed to sniff the MIME type
+MIME_SNIFF_BYTES = 512
+
 
 class ValidationService:
     """
@@ -141,13 +155,7 @@ class ValidationService:
         }
         
         # File type validation
-        self.allowed_file_types = {
-            'image/jpeg', 'image/png', 'image/tiff', 'image/bmp', 'image/gif',
-            'application/pdf', 'text/plain', 'application/msword',
-            'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-            'application/vnd.ms-excel',
-            'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        }
+        self.allowed_file_types = ALLOWED_MIME_TYPES
         
         # Security patterns
         self.sql_injection_patterns = [
@@ -597,6 +605,21 @@ class ValidationService:
         
         return True
     
+    def sniff_mime_type(self, head: bytes, filename: str) -> str:
+        """
+        Detect MIME type from the first MIME_SNIFF_BYTES of a file.
+        
+        Uses libmagic when available and falls back to signature and
+        extension checks otherwise.
+        """
+        head = head[:MIME_SNIFF_BYTES]
+        if magic is not None:
+            try:
+                return magic.from_buffer(head, mime=True)
+            except Exception as e:
+                logger.warning(f"libmagic detection failed, using fallback: {str(e)}")
+        return self._detect_file_type_fallback(head, filename)
+    
     def _detect_file_type_fallback(self, content: bytes, filename: str) -> str:
         """
         Fallback file type detection when python-magic is not available.
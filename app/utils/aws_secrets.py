@@ -13,11 +13,12 @@ specifically for the document service with support for:
 import json
 import logging
 import os
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, Optional, Union, List
 from dataclasses import dataclass
 from functools import lru_cache
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError, PartialCredentialsError
 from pydantic import BaseModel, Field
 
@@ -25,6 +26,9 @@ from pydantic import BaseModel, Field
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# BatchGetSecretValue accepts at most this many secret IDs per call
+BATCH_GET_SECRET_LIMIT = 20
+
 
 class AWSSecretsConfig(BaseModel):
     """Configuration for AWS Secrets Manager - Document Service"""
@@ -43,6 +47,9 @@ class AWSSecretsConfig(BaseModel):
     
     # Cache settings
     cache_ttl: int = Field(default=300, description="Cache TTL in seconds")  # 5 minutes
+    
+    # Client settings
+    max_pool_connections: int = Field(default=10, description="HTTP connections kept by the boto3 client")
 
 
 @dataclass
@@ -135,15 +142,18 @@ class AWSSecretsManager:
                 region_name=self.config.aws_region
             )
             
-            # Create secrets manager client
-            client_config = {}
-            if session_config.get('proxies'):
-                client_config['proxies'] = session_config['proxies']
+            # Create secrets manager client; adaptive retries back off on
+            # throttling instead of failing startup or a refresh outright
+            client_config = Config(
+                retries={"mode": "adaptive", "max_attempts": 3},
+                max_pool_connections=self.config.max_pool_connections,
+                proxies=session_config.get('proxies')
+            )
                 
             self._client = session.client(
                 'secretsmanager',
                 region_name=self.config.aws_region,
-                **client_config
+                config=client_config
             )
             
             logger.info(f"AWS Secrets Manager client initialized for region: {self.config.aws_region}")
@@ -212,26 +222,7 @@ class AWSSecretsManager:
             logger.debug(f"Retrieving secret '{full_secret_name}' from AWS Secrets Manager")
             response = client.get_secret_value(**request_params)
             
-            # Parse secret value
-            if 'SecretString' in response:
-                secret_value = response['SecretString']
-                # Try to parse as JSON
-                try:
-                    secret_value = json.loads(secret_value)
-                except json.JSONDecodeError:
-                    # Keep as string if not valid JSON
-                    pass
-            else:
-                # Binary secret
-                secret_value = response['SecretBinary']
-            
-            # Create SecretValue object
-            secret = SecretValue(
-                value=secret_value,
-                version_id=response.get('VersionId', ''),
-                created_date=response.get('CreatedDate', '').isoformat() if response.get('CreatedDate') else '',
-                secret_name=full_secret_name
-            )
+            secret = self._to_secret_value(response, full_secret_name)
             
             # Cache the result
             if use_cache:
@@ -256,6 +247,82 @@ class AWSSecretsManager:
                 raise AWSSecretsManagerError(f"AWS error retrieving secret '{full_secret_name}': {error_message}")
         except Exception as e:
             raise AWSSecretsManagerError(f"Unexpected error retrieving secret '{secret_name}': {str(e)}")
+
+    def get_secrets(self, secret_names: List[str]) -> Dict[str, SecretValue]:
+        """
+        Retrieve several secrets with BatchGetSecretValue and cache them
+        
+        One call covers up to 20 secrets, so loading every service secret
+        at startup or on refresh costs one round trip instead of one each.
+        
+        Args:
+            secret_names: Names of the secrets (without prefix)
+            
+        Returns:
+            Dict mapping each retrieved name to its SecretValue; secrets that
+            could not be read are logged and left out
+            
+        Raises:
+            AWSSecretsManagerError: If the batch call itself fails
+        """
+        import time
+        
+        name_prefix = f"{self.config.secret_prefix}/{self.config.environment}/"
+        secrets: Dict[str, SecretValue] = {}
+        
+        try:
+            client = self._get_client()
+            for start in range(0, len(secret_names), BATCH_GET_SECRET_LIMIT):
+                batch = secret_names[start:start + BATCH_GET_SECRET_LIMIT]
+                response = client.batch_get_secret_value(
+                    SecretIdList=[name_prefix + name for name in batch]
+                )
+                
+                for entry in response.get('SecretValues', []):
+                    name = entry['Name'][len(name_prefix):]
+                    secrets[name] = self._to_secret_value(entry, entry['Name'])
+                    self._cache[self._get_cache_key(name)] = {
+                        'secret': secrets[name],
+                        'timestamp': time.time()
+                    }
+                
+                for error in response.get('Errors', []):
+                    logger.error(
+                        f"Failed to retrieve secret '{error.get('SecretId')}': "
+                        f"{error.get('ErrorCode')} {error.get('Message')}"
+                    )
+        except ClientError as e:
+            raise AWSSecretsManagerError(f"AWS error retrieving secrets: {e.response['Error']['Message']}")
+        except AWSSecretsManagerError:
+            raise
+        except Exception as e:
+            raise AWSSecretsManagerError(f"Unexpected error retrieving secrets: {str(e)}")
+        
+        logger.info(f"Retrieved {len(secrets)}/{len(secret_names)} secrets in batch")
+        return secrets
+    
+    @staticmethod
+    def _to_secret_value(response: Dict[str, Any], full_secret_name: str) -> SecretValue:
+        """Build a SecretValue from a GetSecretValue or BatchGetSecretValue entry"""
+        if 'SecretString' in response:
+            secret_value = response['SecretString']
+            # Try to parse as JSON
+            try:
+                secret_value = json.loads(secret_value)
+            except json.JSONDecodeError:
+                # Keep as string if not valid JSON
+                pass
+        else:
+            # Binary secret
+            secret_value = response['SecretBinary']
+        
+        return SecretValue(
+            value=secret_value,
+            version_id=response.get('VersionId', ''),
+            created_date=response.get('CreatedDate', '').isoformat() if response.get('CreatedDate') else '',
+            secret_name=full_secret_name
+        )
+
     def get_document_service_config(self) -> Dict[str, Any]:
         """Get document service configuration from secrets"""
         try:
@@ -6,8 +6,11 @@ This module provides helper functions for date/time operations, formatting, and
 
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Union, List, Dict, Callable, Any
+import functools
+import math
 import pytz
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -212,6 +215,33 @@ def to_iso_format(
     return iso_string
 
 
+@functools.lru_cache(maxsize=64)
+def _utc_second_prefix(second: int) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+
+
+def format_utc_timestamp(epoch_seconds: float) -> str:
+    """
+    Format an epoch time as ISO 8601 UTC with microseconds and a "Z" suffix.
+    
+    Cheaper than datetime.fromtimestamp(...).isoformat() on hot paths such
+    as log records: no datetime is built, and the formatted second is cached
+    so timestamps within the same second share it.
+    
+    Args:
+        epoch_seconds: Seconds since the epoch, e.g. time.time() or LogRecord.created
+        
+    Returns:
+        e.g. "2025-07-08T12:00:00.123456Z"
+    """
+    # Rounded the way datetime.fromtimestamp rounds
+    fraction, second = math.modf(epoch_seconds)
+    micros = round(fraction * 1_000_000)
+    if micros >= 1_000_000:
+        second, micros = second + 1, micros - 1_000_000
+    return f"{_utc_second_prefix(int(second))}.{micros:06d}Z"
+
+
 def from_iso_format(
     iso_string: str,
     validate: bool = True,
@@ -5,10 +5,11 @@ This module provides helper functions for file handling, validation, and process
 """
 
 import os
+import io
 import hashlib
 import mimetypes
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, BinaryIO, Any, Callable
+from typing import Dict, List, Optional, Tuple, BinaryIO, Any, Callable, AsyncIterator
 from pathlib import Path
 import tempfile
 import shutil
@@ -16,6 +17,12 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Longest edge in pixels for each pre-rendered thumbnail size
+THUMBNAIL_SIZES = {"small": 128, "medium": 512, "large": 1024}
+
+# Source types Pillow can render thumbnails for
+THUMBNAIL_MIME_TYPES = frozenset({"image/jpeg", "image/png", "image/tiff", "image/bmp", "image/gif"})
+
 
 def calculate_file_hash(
     content: bytes, 
@@ -460,6 +467,93 @@ def split_file_into_chunks(content: bytes, chunk_size: int = 1024 * 1024) -> Lis
     return chunks
 
 
+async def iter_upload_chunks(
+    upload_file: Any,
+    chunk_size: int = 1024 * 1024,
+    max_size: Optional[int] = None
+) -> AsyncIterator[bytes]:
+    """
+    Read an UploadFile (or any object with async read(n)) in fixed-size chunks.
+    
+    Only one chunk is held in memory at a time, so large uploads stream
+    through without buffering the whole multipart body.
+    
+    Args:
+        upload_file: Object exposing an awaitable read(size)
+        chunk_size: Bytes per chunk
+        max_size: Abort once more than this many bytes have been read
+        
+    Raises:
+        FileTooLargeError: If max_size is exceeded
+    """
+    from app.core.exceptions import FileTooLargeError
+    
+    total = 0
+    while chunk := await upload_file.read(chunk_size):
+        total += len(chunk)
+        if max_size is not None and total > max_size:
+            raise FileTooLargeError(file_size=total, max_size=max_size)
+        yield chunk
+
+
+async def peek_stream(chunks: AsyncIterator[bytes]) -> Tuple[bytes, AsyncIterator[bytes]]:
+    """
+    Read the first chunk of a stream without losing it.
+    
+    Returns the first chunk (b"" for an empty stream) and an iterator that
+    yields that chunk again followed by the rest of the stream.
+    """
+    try:
+        head = await chunks.__anext__()
+    except StopAsyncIteration:
+        head = b""
+    
+    async def _replay() -> AsyncIterator[bytes]:
+        if head:
+            yield head
+        async for chunk in chunks:
+            yield chunk
+    
+    return head, _replay()
+
+
+def thumbnail_storage_key(document_id: str, size: str) -> str:
+    """Storage key of a pre-rendered thumbnail"""
+    return f"thumbs/{document_id}/{size}.webp"
+
+
+def generate_thumbnails(content: bytes, sizes: Optional[Dict[str, int]] = None) -> Dict[str, bytes]:
+    """
+    Render WebP thumbnails of an image at several sizes.
+    
+    The image is decoded once and each size is reduced from the previous,
+    larger one. CPU-bound, so call it off the event loop.
+    
+    Args:
+        content: Source image bytes
+        sizes: Mapping of size name to longest edge in pixels
+        
+    Returns:
+        Mapping of size name to WebP bytes
+    """
+    from PIL import Image
+    
+    sizes = sizes or THUMBNAIL_SIZES
+    thumbnails = {}
+    
+    with Image.open(io.BytesIO(content)) as img:
+        img.load()
+        current = img if img.mode in ("RGB", "RGBA") else img.convert("RGB")
+        for name, edge in sorted(sizes.items(), key=lambda item: item[1], reverse=True):
+            current = current.copy()
+            current.thumbnail((edge, edge))
+            buffer = io.BytesIO()
+            current.save(buffer, format="WEBP", quality=80)
+            thumbnails[name] = buffer.getvalue()
+    
+    return thumbnails
+
+
 def validate_file_signature(content: bytes, expected_mime_type: str) -> bool:
     """
     Validate file signature against expected MIME type.
@@ -4,15 +4,37 @@ Response utility functions for API responses.
 This module provides helper functions for creating consistent API responses.
 """
 
-from typing import Dict, List, Optional, Any, Union
-from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple, Union
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
 from fastapi.responses import JSONResponse
 from fastapi import status
+import base64
+import binascii
+import hashlib
+import hmac
+import json
 import logging
+import orjson
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+class ORJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson.
+    
+    orjson serializes datetime and UUID natively and returns bytes directly,
+    skipping the stdlib json encode + str.encode round trip.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
 def create_success_response(
     data: Any = None,
     message: str = "Success",
@@ -330,6 +352,78 @@ def create_paginated_response(
     )
 
 
+# Truncated HMAC-SHA256 tag appended to cursor payloads
+CURSOR_MAC_BYTES = 8
+
+
+def _cursor_mac(payload: bytes, secret: Optional[str]) -> bytes:
+    key = (secret or settings.SECRET_KEY).encode("utf-8")
+    return hmac.new(key, payload, hashlib.sha256).digest()[:CURSOR_MAC_BYTES]
+
+
+def encode_cursor(
+    sort_by: str,
+    sort_order: str,
+    sort_value: Any,
+    row_id: Any,
+    secret: Optional[str] = None
+) -> str:
+    """
+    Encode a keyset pagination position as an opaque, signed cursor.
+    
+    The cursor carries the sort field and direction plus the last row's sort
+    value and id, so the next page can be fetched with a row-value comparison
+    instead of an OFFSET scan and no cursor state is kept on the server.
+    An HMAC tag stops clients from forging positions.
+    """
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    
+    payload = json.dumps(
+        {"k": [sort_value, str(row_id)], "s": sort_by, "o": sort_order},
+        separators=(",", ":")
+    ).encode("utf-8")
+    token = payload + _cursor_mac(payload, secret)
+    return base64.urlsafe_b64encode(token).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, secret: Optional[str] = None) -> Tuple[str, str, Any, str]:
+    """
+    Decode and verify a cursor produced by encode_cursor.
+    
+    Returns:
+        Tuple of (sort_by, sort_order, sort_value, row_id)
+        
+    Raises:
+        ValueError: If the cursor is malformed or its signature does not match
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        token = base64.urlsafe_b64decode(padded.encode("ascii"))
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise ValueError(f"Invalid pagination cursor: {str(e)}") from e
+    
+    payload, mac = token[:-CURSOR_MAC_BYTES], token[-CURSOR_MAC_BYTES:]
+    if len(token) <= CURSOR_MAC_BYTES or not hmac.compare_digest(mac, _cursor_mac(payload, secret)):
+        raise ValueError("Invalid pagination cursor: signature mismatch")
+    
+    try:
+        data = json.loads(payload)
+        sort_value, row_id = data["k"]
+        return data["s"], data["o"], sort_value, row_id
+    except (UnicodeError, ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid pagination cursor: {str(e)}") from e
+
+
+def build_next_link_header(url: str, next_cursor: str) -> str:
+    """Build an RFC 8288 Link header pointing at the next cursor page"""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k not in ("cursor", "page")]
+    query.append(("cursor", next_cursor))
+    next_url = urlunsplit(parts._replace(query=urlencode(query)))
+    return f'<{next_url}>; rel="next"'
+
+
 def create_file_upload_response(
     file_id: str,
     filename: str,
@@ -448,6 +542,123 @@ def add_cache_headers(
     return response
 
 
+def parse_range_header(range_header: Optional[str], file_size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range "Range: bytes=..." header into an inclusive (start, end).
+    
+    Returns None when there is no usable range (absent or malformed header,
+    other units or multiple ranges), in which case the full content should
+    be sent; RFC 9110 says an invalid Range is ignored, not rejected.
+    
+    Raises:
+        ValueError: If the range cannot be satisfied for file_size (416)
+    """
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+    
+    start_text, separator, end_text = (part.strip() for part in range_header[6:].partition("-"))
+    if not separator or not (start_text or end_text) or not all(
+        text.isascii() and text.isdigit() for text in (start_text, end_text) if text
+    ):
+        return None
+    
+    if not start_text:
+        # Suffix range: last N bytes; nothing to serve for N = 0 or an empty file
+        suffix_length = int(end_text)
+        if suffix_length == 0 or file_size == 0:
+            raise ValueError(f"Range not satisfiable for size {file_size}: {range_header}")
+        return max(file_size - suffix_length, 0), file_size - 1
+    
+    start = int(start_text)
+    end = int(end_text) if end_text else file_size - 1
+    if end_text and end < start:
+        # last-pos before first-pos is invalid syntax, not an unsatisfiable range
+        return None
+    
+    if start >= file_size:
+        raise ValueError(f"Range not satisfiable for size {file_size}: {range_header}")
+    
+    return start, min(end, file_size - 1)
+
+
+def compute_etag(*parts: Any, weak: bool = True) -> str:
+    """
+    Compute an ETag from identifying values (e.g. updated_at and version).
+    
+    Hashing a few small fields is enough to detect a change and avoids
+    serializing or hashing the response body.
+    """
+    hasher = hashlib.blake2b(digest_size=8)
+    for part in parts:
+        if isinstance(part, datetime):
+            part = part.isoformat()
+        hasher.update(part if isinstance(part, bytes) else str(part).encode("utf-8"))
+        hasher.update(b"\x1f")
+    
+    tag = f'"{hasher.hexdigest()}"'
+    return f"W/{tag}" if weak else tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str, weak: bool = True) -> bool:
+    """
+    Check an If-None-Match (or If-Match) header against an ETag.
+    
+    Weak comparison is required for If-None-Match (RFC 9110), so W/"x" and
+    "x" match. Pass weak=False for If-Match, where only identical strong
+    validators match and a weak ETag never does. Honours "*" and
+    comma-separated lists.
+    """
+    if not if_none_match:
+        return False
+    
+    if if_none_match.strip() == "*":
+        return True
+    
+    if not weak:
+        if etag.startswith("W/"):
+            return False
+        return any(candidate.strip() == etag for candidate in if_none_match.split(","))
+    
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def format_http_date(dt: datetime) -> str:
+    """Format a datetime as an IMF-fixdate for Last-Modified (naive values are UTC)"""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return format_datetime(dt.astimezone(timezone.utc), usegmt=True)
+
+
+def not_modified_since(if_modified_since: Optional[str], last_modified: Optional[datetime]) -> bool:
+    """
+    Check an If-Modified-Since header against a resource's modification time.
+    
+    HTTP dates only carry whole seconds, so sub-second precision is dropped
+    before comparing. Unparseable dates are ignored, as RFC 9110 requires.
+    """
+    if not if_modified_since or last_modified is None:
+        return False
+    
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    
+    return last_modified.replace(microsecond=0) <= since
+
+
 class ResponseBuilder:
     """
     Builder pattern for creating complex responses.
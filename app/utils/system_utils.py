@@ -0,0 +1,270 @@
+"""
+System resource sampling utilities.
+
+This module keeps host metrics that are expensive or blocking to read
+(e.g. CPU percent, which needs two samples over an interval) off the
+request path: a background task refreshes a snapshot in a worker thread
+and request handlers only read the latest snapshot.
+"""
+
+import asyncio
+import os
+import time
+import logging
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Default seconds between background system metric snapshots
+SYSTEM_METRICS_INTERVAL_SECONDS = 2.0
+
+# Last CPU reading and the time.monotonic() at which it was taken
+_last_cpu_percent: float = 0.0
+_last_cpu_sample: float = 0.0
+
+# Linux: CPU time counters are read straight from /proc/stat through a file
+# descriptor kept open for the life of the process (one pread per sample)
+PROC_STAT_PATH = "/proc/stat"
+_proc_stat_fd: Optional[int] = None
+_proc_stat_unavailable = not hasattr(os, "pread")
+_last_cpu_times: Optional[Tuple[int, int]] = None  # (busy, total) jiffies
+
+# Linux: memory totals come from the head of /proc/meminfo the same way
+PROC_MEMINFO_PATH = "/proc/meminfo"
+_proc_meminfo_fd: Optional[int] = None
+_proc_meminfo_unavailable = not hasattr(os, "pread")
+
+# Disk fill level moves over minutes, so statvfs is called at most this often
+DISK_SAMPLE_INTERVAL_SECONDS = 30.0
+
+# Root of the filesystem whose usage is reported
+DISK_ROOT_PATH = "C:\\" if os.name == "nt" else "/"
+
+_disk_cache = {"ts": float("-inf"), "value": 0.0}
+
+# psutil (C extension plus platform modules) is imported on first use so
+# workers that never collect system metrics do not pay for it
+_psutil = None
+
+# Reused across snapshots; Process() construction reads /proc on each call
+_process = None
+
+# Reported when system metrics collection is disabled or not sampled yet
+EMPTY_SYSTEM_METRICS: Dict[str, Any] = {
+    "cpu_usage_percent": None,
+    "memory_usage_mb": None,
+    "memory_usage_percent": None,
+    "disk_usage_percent": None,
+    "process_memory_mb": None,
+    "process_threads": None
+}
+
+# Latest snapshot; replaced wholesale so readers never see a partial update
+_metrics_snapshot: Dict[str, Any] = {}
+
+
+def _get_psutil():
+    """Import psutil on first use"""
+    global _psutil
+    if _psutil is None:
+        import psutil
+        _psutil = psutil
+    return _psutil
+
+
+def _get_process():
+    """Get the cached psutil.Process for this worker"""
+    global _process
+    if _process is None:
+        _process = _get_psutil().Process()
+    return _process
+
+
+def _read_proc_stat_cpu() -> Optional[Tuple[int, int]]:
+    """
+    Read aggregate (busy, total) CPU jiffies from the first line of /proc/stat.
+
+    Returns:
+        (busy, total), or None where /proc/stat cannot be read (non-Linux)
+    """
+    global _proc_stat_fd, _proc_stat_unavailable
+
+    if _proc_stat_unavailable:
+        return None
+    try:
+        if _proc_stat_fd is None:
+            _proc_stat_fd = os.open(PROC_STAT_PATH, os.O_RDONLY)
+        head = os.pread(_proc_stat_fd, 256, 0)
+    except OSError:
+        _proc_stat_unavailable = True
+        return None
+
+    # cpu  user nice system idle iowait irq softirq steal [guest guest_nice]
+    # guest time is already included in user/nice, so only the first 8 count
+    values = [int(v) for v in head.split(b"\n", 1)[0].split()[1:9]]
+    total = sum(values)
+    idle = values[3] + values[4]
+    return total - idle, total
+
+
+def _read_proc_meminfo() -> Optional[Tuple[int, int]]:
+    """
+    Read (total, available) memory in bytes from the head of /proc/meminfo.
+
+    Returns:
+        (total, available), or None where /proc/meminfo cannot be read
+        (non-Linux, or kernels without MemAvailable)
+    """
+    global _proc_meminfo_fd, _proc_meminfo_unavailable
+
+    if _proc_meminfo_unavailable:
+        return None
+    try:
+        if _proc_meminfo_fd is None:
+            _proc_meminfo_fd = os.open(PROC_MEMINFO_PATH, os.O_RDONLY)
+        head = os.pread(_proc_meminfo_fd, 256, 0)
+    except OSError:
+        _proc_meminfo_unavailable = True
+        return None
+
+    # MemTotal, MemFree and MemAvailable are the first three lines, in kB
+    total = available = None
+    for line in head.split(b"\n"):
+        if line.startswith(b"MemTotal:"):
+            total = int(line.split()[1]) * 1024
+        elif line.startswith(b"MemAvailable:"):
+            available = int(line.split()[1]) * 1024
+            break
+    if not total or available is None:
+        _proc_meminfo_unavailable = True
+        return None
+    return total, available
+
+
+def get_memory_usage() -> Tuple[int, float]:
+    """
+    Get system memory in use, computed as total - available like psutil.
+
+    Returns:
+        (used bytes, used percent of total)
+    """
+    meminfo = _read_proc_meminfo()
+    if meminfo is None:
+        memory = _get_psutil().virtual_memory()
+        return memory.used, memory.percent
+    total, available = meminfo
+    used = total - available
+    return used, used / total * 100
+
+
+def get_cpu_percent(min_interval: float = SYSTEM_METRICS_INTERVAL_SECONDS) -> float:
+    """
+    Get system-wide CPU usage without blocking.
+
+    Computes usage since the previous read from /proc/stat deltas on
+    Linux, or psutil's non-blocking mode elsewhere, and re-reads at most
+    once per `min_interval`; in between, the cached value is returned.
+
+    Args:
+        min_interval: Minimum seconds between actual reads
+
+    Returns:
+        CPU usage percent
+    """
+    global _last_cpu_percent, _last_cpu_sample, _last_cpu_times
+
+    now = time.monotonic()
+    if now - _last_cpu_sample >= min_interval:
+        cpu_times = _read_proc_stat_cpu()
+        if cpu_times is None:
+            _last_cpu_percent = _get_psutil().cpu_percent(interval=None)
+        else:
+            if _last_cpu_times is not None:
+                busy_delta = cpu_times[0] - _last_cpu_times[0]
+                total_delta = cpu_times[1] - _last_cpu_times[1]
+                if total_delta > 0:
+                    _last_cpu_percent = busy_delta / total_delta * 100
+            _last_cpu_times = cpu_times
+        _last_cpu_sample = now
+    return _last_cpu_percent
+
+
+def get_disk_usage_percent(min_interval: float = DISK_SAMPLE_INTERVAL_SECONDS) -> float:
+    """
+    Get root filesystem usage, re-reading at most once per `min_interval`.
+
+    Args:
+        min_interval: Minimum seconds between actual statvfs calls
+
+    Returns:
+        Used disk space as a percent of total
+    """
+    now = time.monotonic()
+    if now - _disk_cache["ts"] >= min_interval:
+        disk = _get_psutil().disk_usage(DISK_ROOT_PATH)
+        _disk_cache["value"] = (disk.used / disk.total) * 100
+        _disk_cache["ts"] = now
+    return _disk_cache["value"]
+
+
+def collect_system_metrics() -> Dict[str, Any]:
+    """
+    Read host and process metrics (blocking syscalls; run off the event loop).
+
+    Returns:
+        Dict[str, Any]: CPU, memory, disk and process metrics
+    """
+    cpu_percent = get_cpu_percent(min_interval=0)
+
+    memory_used, memory_percent = get_memory_usage()
+
+    # Process-specific metrics, read from one cached /proc snapshot
+    process = _get_process()
+    with process.oneshot():
+        process_memory_mb = process.memory_info().rss / (1024 * 1024)
+        process_threads = process.num_threads()
+
+    return {
+        "cpu_usage_percent": round(cpu_percent, 2),
+        "memory_usage_mb": round(memory_used / (1024 * 1024), 2),
+        "memory_usage_percent": round(memory_percent, 2),
+        "disk_usage_percent": round(get_disk_usage_percent(), 2),
+        "process_memory_mb": round(process_memory_mb, 2),
+        "process_threads": process_threads
+    }
+
+
+def get_system_metrics_snapshot() -> Dict[str, Any]:
+    """
+    Get the latest background snapshot of system metrics.
+
+    Returns EMPTY_SYSTEM_METRICS until the refresher has produced a
+    snapshot (e.g. outside the app lifespan), so callers on the event loop
+    never make blocking psutil or /proc reads.
+
+    Returns:
+        Dict[str, Any]: Latest system metrics
+    """
+    return _metrics_snapshot or EMPTY_SYSTEM_METRICS
+
+
+async def run_system_metrics_refresher(interval: float = SYSTEM_METRICS_INTERVAL_SECONDS) -> None:
+    """
+    Refresh the system metrics snapshot every `interval` seconds until cancelled.
+
+    Start once per worker at application startup.
+
+    Args:
+        interval: Seconds between snapshots
+    """
+    global _metrics_snapshot
+
+    # Seed the CPU counters; the first delta-based read is meaningless
+    get_cpu_percent(min_interval=0)
+
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            _metrics_snapshot = await asyncio.to_thread(collect_system_metrics)
+        except Exception as e:
+            logger.warning(f"System metrics refresh failed: {str(e)}")
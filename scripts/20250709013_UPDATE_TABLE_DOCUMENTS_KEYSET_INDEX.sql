@@ -0,0 +1,16 @@
+-- ======================================================================
+-- Documents Table - Keyset Pagination Index
+-- Script: 20250709013_UPDATE_TABLE_DOCUMENTS_KEYSET_INDEX.sql
+-- Date: July 9, 2025
+-- Purpose: Support cursor (keyset) pagination for document listing
+-- Dependencies: documents table
+-- ======================================================================
+
+-- Composite index matching the list_documents keyset query:
+--   WHERE uploaded_by = :user AND (created_at, id) < (:cursor_ts, :cursor_id)
+--   ORDER BY created_at DESC, id DESC
+-- The trailing id column makes the order total so cursors never skip or
+-- repeat rows that share a created_at value.
+CREATE INDEX IF NOT EXISTS idx_documents_user_created_id ON public.documents 
+    USING btree (uploaded_by, created_at DESC, id DESC) 
+    WHERE deleted_at IS NULL;
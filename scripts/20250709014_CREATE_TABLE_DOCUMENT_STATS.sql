@@ -0,0 +1,153 @@
+-- ======================================================================
+-- Document Statistics Roll-up Table Creation Script
+-- Script: 20250709014_CREATE_TABLE_DOCUMENT_STATS.sql
+-- Date: July 9, 2025
+-- Purpose: Per-user document counters maintained by triggers so the
+--          statistics endpoint reads one row instead of scanning documents
+-- Dependencies: documents table
+-- ======================================================================
+
+-- One row per uploader; only live (non soft-deleted) documents are counted
+CREATE TABLE IF NOT EXISTS public.document_stats (
+  user_id TEXT NOT NULL, -- Matches documents.uploaded_by
+
+  -- Counters
+  total_documents BIGINT NOT NULL DEFAULT 0,
+  total_storage_bytes BIGINT NOT NULL DEFAULT 0,
+  ocr_completed BIGINT NOT NULL DEFAULT 0,
+  documents_by_type JSONB NOT NULL DEFAULT '{}'::jsonb, -- {"pdf": 12, ...}
+  documents_by_status JSONB NOT NULL DEFAULT '{}'::jsonb, -- {"active": 10, ...}
+
+  -- Timestamps
+  updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+
+  -- Constraints
+  CONSTRAINT document_stats_pkey PRIMARY KEY (user_id)
+);
+
+-- Add (p_sign = 1) or remove (p_sign = -1) one document's contribution
+CREATE OR REPLACE FUNCTION apply_document_stats_delta(
+    p_user_id TEXT,
+    p_sign INTEGER,
+    p_file_size BIGINT,
+    p_ocr_completed BOOLEAN,
+    p_document_type TEXT,
+    p_status TEXT
+)
+RETURNS VOID AS $$
+BEGIN
+    IF p_user_id IS NULL THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO public.document_stats AS s (
+        user_id, total_documents, total_storage_bytes, ocr_completed,
+        documents_by_type, documents_by_status, updated_at
+    ) VALUES (
+        p_user_id,
+        p_sign,
+        p_sign * COALESCE(p_file_size, 0),
+        CASE WHEN p_ocr_completed THEN p_sign ELSE 0 END,
+        CASE WHEN p_document_type IS NULL THEN '{}'::jsonb ELSE jsonb_build_object(p_document_type, p_sign) END,
+        jsonb_build_object(p_status, p_sign),
+        NOW()
+    )
+    ON CONFLICT (user_id) DO UPDATE SET
+        total_documents = s.total_documents + p_sign,
+        total_storage_bytes = s.total_storage_bytes + p_sign * COALESCE(p_file_size, 0),
+        ocr_completed = s.ocr_completed + CASE WHEN p_ocr_completed THEN p_sign ELSE 0 END,
+        documents_by_type = CASE
+            WHEN p_document_type IS NULL THEN s.documents_by_type
+            ELSE jsonb_set(
+                s.documents_by_type, ARRAY[p_document_type],
+                to_jsonb(COALESCE((s.documents_by_type ->> p_document_type)::BIGINT, 0) + p_sign)
+            )
+        END,
+        documents_by_status = jsonb_set(
+            s.documents_by_status, ARRAY[p_status],
+            to_jsonb(COALESCE((s.documents_by_status ->> p_status)::BIGINT, 0) + p_sign)
+        ),
+        updated_at = NOW();
+END;
+$$ LANGUAGE plpgsql;
+
+-- Move a row's contribution from its old state to its new state
+CREATE OR REPLACE FUNCTION maintain_document_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.deleted_at IS NULL THEN
+        PERFORM apply_document_stats_delta(
+            OLD.uploaded_by, -1, OLD.file_size, OLD.ocr_completed, OLD.document_type, OLD.status
+        );
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.deleted_at IS NULL THEN
+        PERFORM apply_document_stats_delta(
+            NEW.uploaded_by, 1, NEW.file_size, NEW.ocr_completed, NEW.document_type, NEW.status
+        );
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS maintain_document_stats_insert_delete ON public.documents;
+CREATE TRIGGER maintain_document_stats_insert_delete
+    AFTER INSERT OR DELETE ON public.documents
+    FOR EACH ROW
+    EXECUTE FUNCTION maintain_document_stats();
+
+-- Only fire when a counted column actually changes (e.g. not on download_count bumps)
+DROP TRIGGER IF EXISTS maintain_document_stats_update ON public.documents;
+CREATE TRIGGER maintain_document_stats_update
+    AFTER UPDATE OF uploaded_by, file_size, ocr_completed, document_type, status, deleted_at ON public.documents
+    FOR EACH ROW
+    WHEN (
+        (OLD.uploaded_by, OLD.file_size, OLD.ocr_completed, OLD.document_type, OLD.status, OLD.deleted_at)
+        IS DISTINCT FROM
+        (NEW.uploaded_by, NEW.file_size, NEW.ocr_completed, NEW.document_type, NEW.status, NEW.deleted_at)
+    )
+    EXECUTE FUNCTION maintain_document_stats();
+
+-- Backfill from existing documents
+INSERT INTO public.document_stats (
+    user_id, total_documents, total_storage_bytes, ocr_completed,
+    documents_by_type, documents_by_status, updated_at
+)
+SELECT
+    d.uploaded_by,
+    COUNT(*),
+    COALESCE(SUM(d.file_size), 0),
+    COUNT(*) FILTER (WHERE d.ocr_completed),
+    COALESCE((
+        SELECT jsonb_object_agg(t.document_type, t.n)
+        FROM (
+            SELECT document_type, COUNT(*) AS n
+            FROM public.documents
+            WHERE uploaded_by = d.uploaded_by AND deleted_at IS NULL AND document_type IS NOT NULL
+            GROUP BY document_type
+        ) t
+    ), '{}'::jsonb),
+    COALESCE((
+        SELECT jsonb_object_agg(t.status, t.n)
+        FROM (
+            SELECT status, COUNT(*) AS n
+            FROM public.documents
+            WHERE uploaded_by = d.uploaded_by AND deleted_at IS NULL
+            GROUP BY status
+        ) t
+    ), '{}'::jsonb),
+    NOW()
+FROM public.documents d
+WHERE d.deleted_at IS NULL AND d.uploaded_by IS NOT NULL
+GROUP BY d.uploaded_by
+ON CONFLICT (user_id) DO UPDATE SET
+    total_documents = EXCLUDED.total_documents,
+    total_storage_bytes = EXCLUDED.total_storage_bytes,
+    ocr_completed = EXCLUDED.ocr_completed,
+    documents_by_type = EXCLUDED.documents_by_type,
+    documents_by_status = EXCLUDED.documents_by_status,
+    updated_at = EXCLUDED.updated_at;
+
+-- Grant permissions
+GRANT SELECT ON public.document_stats TO authenticated;
@@ -0,0 +1,20 @@
+-- ======================================================================
+-- Documents Table - Covering Index for Document Listing
+-- Script: 20250709015_UPDATE_TABLE_DOCUMENTS_LIST_COVERING_INDEX.sql
+-- Date: July 9, 2025
+-- Purpose: Let list_documents be answered by an index-only scan
+-- Dependencies: documents table, 20250709013_UPDATE_TABLE_DOCUMENTS_KEYSET_INDEX.sql
+-- ======================================================================
+
+-- Same key as idx_documents_user_created_id, plus the columns list_documents
+-- projects (LIST_COLUMNS in document_service.py). Wide columns such as
+-- metadata and ocr_text stay out, so the heap is only visited for rows
+-- not yet marked all-visible.
+CREATE INDEX IF NOT EXISTS idx_documents_user_created_id_covering ON public.documents 
+    USING btree (uploaded_by, created_at DESC, id DESC) 
+    INCLUDE (file_name, original_filename, mime_type, file_size, document_type,
+             status, tags, ocr_completed, storage_key, updated_at)
+    WHERE deleted_at IS NULL;
+
+-- The covering index serves every query the narrower keyset index did
+DROP INDEX IF EXISTS public.idx_documents_user_created_id;
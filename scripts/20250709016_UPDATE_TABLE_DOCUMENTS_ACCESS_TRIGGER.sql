@@ -0,0 +1,41 @@
+-- ======================================================================
+-- Documents Table - Leave Timestamps Alone on Access-Only Updates
+-- Script: 20250709016_UPDATE_TABLE_DOCUMENTS_ACCESS_TRIGGER.sql
+-- Date: July 9, 2025
+-- Purpose: Keep updated_at/last_modified stable across reads and downloads
+-- Dependencies: documents table, 20250708001_CREATE_TABLE_DOCUMENTS.sql
+-- ======================================================================
+
+-- get_document and downloads record last_accessed and download_count.
+-- Bumping updated_at/last_modified for those writes made every read change
+-- Last-Modified, so If-Modified-Since never matched on a repeat request.
+CREATE OR REPLACE FUNCTION update_documents_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- Access tracking only: keep the row's modification timestamps
+    IF (to_jsonb(NEW) - ARRAY['last_accessed', 'download_count', 'updated_at', 'last_modified'])
+       = (to_jsonb(OLD) - ARRAY['last_accessed', 'download_count', 'updated_at', 'last_modified']) THEN
+        NEW.updated_at = OLD.updated_at;
+        NEW.last_modified = OLD.last_modified;
+        RETURN NEW;
+    END IF;
+
+    NEW.updated_at = NOW();
+    NEW.last_modified = NOW();
+
+    -- Auto-generate missing fields for backward compatibility
+    IF NEW.mime_type IS NULL AND NEW.file_type IS NOT NULL THEN
+        NEW.mime_type = NEW.file_type;
+    END IF;
+
+    IF NEW.storage_key IS NULL THEN
+        NEW.storage_key = 'documents/' || NEW.id::TEXT || '/' || NEW.file_name;
+    END IF;
+
+    IF NEW.etag IS NULL THEN
+        NEW.etag = '"' || EXTRACT(EPOCH FROM NOW())::TEXT || '"';
+    END IF;
+
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
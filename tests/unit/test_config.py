@@ -58,3 +58,65 @@ class TestGetSettings:
         """Test settings caching mechanism."""
         # TODO: Test caching behavior
         assert True  # Placeholder
+
+
+class TestConfigCaching:
+    """Test cases for memoized get_*_config methods."""
+
+    def test_config_dict_built_once_until_refresh(self):
+        from app.core.config import Settings
+
+        settings = Settings()
+        first = settings.get_redis_config()
+        assert settings.get_redis_config() is first
+
+        settings.refresh()
+        assert settings.get_redis_config() is not first
+        assert settings.get_redis_config() == first
+
+
+class TestMembershipFields:
+    """Test cases for set-typed allow-list settings."""
+
+    def test_file_types_are_lowercased_frozenset(self):
+        from app.core.config import Settings
+
+        settings = Settings(ALLOWED_FILE_TYPES=["PDF", "png"])
+        assert settings.ALLOWED_FILE_TYPES == frozenset({"pdf", "png"})
+        assert isinstance(settings.CORS_ORIGINS, frozenset)
+
+
+class TestFrozenSettings:
+    """Test cases for immutable settings."""
+
+    def test_assignment_is_rejected(self):
+        from pydantic import ValidationError
+        from app.core.config import Settings
+
+        settings = Settings()
+        with pytest.raises(ValidationError):
+            settings.OCR_TIMEOUT_SECONDS = 1
+
+    def test_env_values_are_still_validated(self, monkeypatch):
+        from pydantic import ValidationError
+        from app.core.config import Settings
+
+        monkeypatch.setenv("OCR_TIMEOUT_SECONDS", "45")
+        assert Settings().OCR_TIMEOUT_SECONDS == 45
+
+        monkeypatch.setenv("OCR_TIMEOUT_SECONDS", "soon")
+        with pytest.raises(ValidationError):
+            Settings()
+
+
+class TestDownloadOffload:
+    """Test cases for the download offload header setting."""
+
+    def test_blank_header_means_unset(self, monkeypatch):
+        from app.core.config import Settings
+
+        monkeypatch.setenv("DOWNLOAD_OFFLOAD_HEADER", "")
+        assert Settings().DOWNLOAD_OFFLOAD_HEADER is None
+
+        monkeypatch.setenv("DOWNLOAD_OFFLOAD_HEADER", "X-Accel-Redirect")
+        assert Settings().DOWNLOAD_OFFLOAD_HEADER == "X-Accel-Redirect"
@@ -0,0 +1,41 @@
+"""
+Unit tests for document routes.
+"""
+
+import asyncio
+import io
+
+import pytest
+from fastapi import UploadFile
+
+from app.api import document_routes
+from app.core.exceptions import FileTooLargeError, ValidationError
+
+
+class TestUploadSizeCheck:
+    """Test cases for rejecting uploads on their declared size."""
+
+    def test_declared_oversize_matches_mid_stream_error(self, monkeypatch):
+        monkeypatch.setitem(document_routes.settings.__dict__, "MAX_FILE_SIZE_MB", 1)
+        file = UploadFile(io.BytesIO(b""), size=2 * 1024 * 1024, filename="a.pdf")
+
+        with pytest.raises(FileTooLargeError) as exc_info:
+            document_routes.reject_oversized_upload(file)
+
+        assert exc_info.value.status_code == 422
+        assert exc_info.value.extra_data["max_size"] == 1024 * 1024
+
+    def test_batch_rejects_oversized_files_as_validation_problem(self, monkeypatch):
+        monkeypatch.setitem(document_routes.settings.__dict__, "MAX_FILE_SIZE_MB", 1)
+        files = [
+            UploadFile(io.BytesIO(b""), size=10, filename="small.pdf"),
+            UploadFile(io.BytesIO(b""), size=2 * 1024 * 1024, filename="big.pdf"),
+        ]
+
+        with pytest.raises(ValidationError) as exc_info:
+            asyncio.run(document_routes.upload_documents_batch(files))
+
+        assert exc_info.value.status_code == 422
+        assert exc_info.value.errors == [
+            {"index": 1, "filename": "big.pdf", "reason": "File too large"}
+        ]
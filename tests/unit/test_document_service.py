@@ -0,0 +1,178 @@
+"""
+Unit tests for document service.
+"""
+
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core.exceptions import PreconditionFailedError, RangeNotSatisfiableError, StorageError
+from app.services.document_service import DocumentService
+from app.utils.response_utils import encode_cursor
+
+
+async def _chunks(*parts):
+    for part in parts:
+        yield part
+
+
+class _FakeDocumentDB:
+    """One documents row; every UPDATE bumps updated_at like the table trigger."""
+
+    def __init__(self):
+        self.row = {
+            "id": "doc-1", "file_name": "a.pdf", "original_filename": "a.pdf",
+            "uploaded_by": "user-1", "status": "uploaded", "file_size": 100,
+            "file_type": "pdf", "mime_type": "application/pdf", "version": 1,
+            "ocr_completed": False, "created_at": datetime(2025, 7, 8),
+            "updated_at": datetime(2025, 7, 8), "last_accessed": None,
+        }
+
+    async def fetchone(self, query, params=None):
+        if query.lstrip().startswith("UPDATE"):
+            if params["expected_version"] != self.row["version"]:
+                return None
+            self.row.update({key: params[key] for key in self.row if key in params})
+            self.row["updated_at"] = datetime.utcnow()
+        return dict(self.row)
+
+    async def execute(self, query, params=None):
+        if "UPDATE documents" in query:
+            self.row["last_accessed"] = params["timestamp"]
+            self.row["updated_at"] = datetime.utcnow()
+
+
+class TestStreamedUpload:
+    """Test cases for uploads streamed to storage."""
+
+    def _service(self, stored_size, task_queue=None):
+        storage = AsyncMock()
+        storage.upload_stream.return_value = {"file_id": "uploads/a.pdf", "size": stored_size, "file_hash": "abc"}
+        service = DocumentService(storage_service=storage, task_queue=task_queue)
+        service._get_user_storage_usage = AsyncMock(return_value=0)
+        return service, storage
+
+    def test_quota_checked_against_stored_size(self):
+        service, storage = self._service(stored_size=2000 * 1024 * 1024)
+
+        with pytest.raises(StorageError):
+            asyncio.run(service.upload_document(_chunks(b"%PDF-1.4 body"), "a.pdf", "user-1", "application/pdf"))
+
+        storage.delete_file.assert_awaited_once_with("uploads/a.pdf", "user-1")
+
+    def test_auto_ocr_is_queued_from_storage(self):
+        task_queue = MagicMock()
+        task_queue.pipeline.return_value.execute = AsyncMock()
+        service, _ = self._service(stored_size=1024, task_queue=task_queue)
+
+        result = asyncio.run(
+            service.upload_document(_chunks(b"%PDF-1.4 body"), "a.pdf", "user-1", "application/pdf")
+        )
+
+        assert result["ocr_job_id"] is not None
+        task_queue.pipeline.return_value.execute.assert_awaited_once()
+
+
+class TestDocumentETag:
+    """Test cases for conditional GETs of document metadata."""
+
+    def test_repeat_get_is_not_modified(self):
+        service = DocumentService(database_session=_FakeDocumentDB())
+
+        first = asyncio.run(service.get_document("doc-1", "user-1", include_download_url=False))
+        second = asyncio.run(
+            service.get_document("doc-1", "user-1", include_download_url=False, if_none_match=first["etag"])
+        )
+
+        assert second == {"id": "doc-1", "etag": first["etag"], "not_modified": True}
+
+
+class TestListDocumentsPagination:
+    """Test cases for keyset pagination of document listings."""
+
+    def _service(self):
+        db = AsyncMock()
+        db.fetchall.return_value = []
+        db.fetchone.return_value = {"total": 7}
+        return DocumentService(database_session=db), db
+
+    def test_total_counted_on_first_page_only(self):
+        service, db = self._service()
+
+        first = asyncio.run(service._execute_paginated_query({}, 1, 20, None, "created_at", "desc"))
+        cursor = encode_cursor("created_at", "desc", "2025-07-08T12:00:00", "doc-1")
+        later = asyncio.run(service._execute_paginated_query({}, 1, 20, cursor, "created_at", "desc"))
+
+        assert first[1] == 7
+        assert later[1] is None
+        db.fetchone.assert_awaited_once()
+
+    def test_nullable_sort_key_is_coalesced_in_order_and_cursor(self):
+        service, db = self._service()
+        cursor = encode_cursor("last_accessed", "desc", None, "doc-1")
+
+        asyncio.run(service._execute_paginated_query({}, 1, 20, cursor, "last_accessed", "desc"))
+
+        query, params = db.fetchall.await_args.args
+        assert "ORDER BY COALESCE(last_accessed, '-infinity'::timestamptz) DESC" in query
+        assert "(COALESCE(last_accessed, '-infinity'::timestamptz), id) < " \
+            "(COALESCE(%(cursor_value)s, '-infinity'::timestamptz), %(cursor_id)s)" in query
+        assert params["cursor_value"] is None
+
+
+class TestStreamDocument:
+    """Test cases for ranged document downloads."""
+
+    def test_unsatisfiable_range_is_416_with_content_range(self):
+        service = DocumentService(storage_service=AsyncMock())
+        service._get_document_record = AsyncMock(return_value={"file_size": 100, "storage_key": "uploads/a.pdf"})
+        service._check_document_access = AsyncMock(return_value=True)
+
+        with pytest.raises(RangeNotSatisfiableError) as exc_info:
+            asyncio.run(service.stream_document("doc-1", "user-1", range_header="bytes=500-"))
+
+        assert exc_info.value.status_code == 416
+        assert exc_info.value.content_range == "bytes */100"
+
+    def test_suffix_range_on_empty_file_is_416(self):
+        service = DocumentService(storage_service=AsyncMock())
+        service._get_document_record = AsyncMock(return_value={"file_size": 0, "storage_key": "uploads/a.pdf"})
+        service._check_document_access = AsyncMock(return_value=True)
+
+        with pytest.raises(RangeNotSatisfiableError) as exc_info:
+            asyncio.run(service.stream_document("doc-1", "user-1", range_header="bytes=-5"))
+
+        assert exc_info.value.content_range == "bytes */0"
+
+
+class TestUpdateDocumentPreconditions:
+    """Test cases for If-Match on metadata updates."""
+
+    def _service(self):
+        service = DocumentService()
+        document = {"id": "doc-1", "updated_at": "2025-07-08T12:00:00", "version": 3}
+        service._get_document_header_record = AsyncMock(return_value=document)
+        service._check_document_access = AsyncMock(return_value=True)
+        return service, DocumentService.get_document_etag(document)
+
+    def test_document_etag_is_strong(self):
+        _, etag = self._service()
+
+        assert not etag.startswith("W/")
+
+    def test_weak_if_match_is_rejected(self):
+        service, etag = self._service()
+
+        with pytest.raises(PreconditionFailedError):
+            asyncio.run(service.update_document("doc-1", "user-1", {"tags": ["a"]}, if_match=f"W/{etag}"))
+
+    def test_etag_from_get_passes_if_match(self):
+        service = DocumentService(database_session=_FakeDocumentDB())
+
+        etag = asyncio.run(service.get_document("doc-1", "user-1", include_download_url=False))["etag"]
+        updated = asyncio.run(service.update_document("doc-1", "user-1", {"tags": ["a"]}, if_match=etag))
+
+        assert updated["version"] == 2
+        assert updated["etag"] != etag
@@ -0,0 +1,76 @@
+"""
+Unit tests for RFC 9457 exception classes.
+"""
+
+import uuid
+
+from app.core.exceptions import NotFoundError
+
+
+class TestProblemDetails:
+    """Test cases for lazily filled problem fields."""
+
+    def test_request_id_and_timestamp_filled_on_first_read(self):
+        exc = NotFoundError("Document")
+        assert exc._request_id is None and exc._reported_at is None
+
+        problem = exc.to_dict()
+
+        assert problem["request_id"] == exc.request_id
+        assert str(uuid.UUID(problem["request_id"])) == problem["request_id"]
+        assert problem["timestamp"] == exc.timestamp.isoformat().replace("+00:00", "Z")
+        assert problem["status"] == 404
+
+    def test_every_subclass_keeps_attributes_in_slots(self):
+        import inspect
+
+        from app.core import exceptions
+
+        for name, cls in vars(exceptions).items():
+            if inspect.isclass(cls) and issubclass(cls, exceptions.APIException):
+                assert "__slots__" in cls.__dict__, name
+
+        exc = exceptions.RateLimitExceededError("Too many requests", retry_after=3)
+        exc.to_dict()
+        assert exc.__dict__ == {}
+
+    def test_optional_members_only_when_set(self):
+        bare = NotFoundError("Document").to_dict()
+        full = NotFoundError("Document", instance="/documents/1", errors=[{"field": "id"}], hint="check id").to_dict()
+
+        assert "instance" not in bare and "errors" not in bare
+        assert full["instance"] == "/documents/1"
+        assert full["errors"] == [{"field": "id"}]
+        assert full["hint"] == "check id"
+
+    def test_problem_type_is_plain_str(self):
+        from app.core.exceptions import ErrorType
+
+        problem = NotFoundError("Document").to_dict()
+
+        assert type(problem["type"]) is str
+        assert problem["type"] == ErrorType.NOT_FOUND_ERROR == "https://insurecove.com/problems/not-found"
+
+
+class TestProblemResponses:
+    """Test cases for the problem+json exception handler."""
+
+    def test_range_not_satisfiable_carries_content_range(self):
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from app.core.exceptions import RangeNotSatisfiableError
+        from app.main import setup_exception_handlers
+
+        app = FastAPI()
+        setup_exception_handlers(app)
+
+        @app.get("/file")
+        def read_file():
+            raise RangeNotSatisfiableError(100)
+
+        response = TestClient(app).get("/file")
+
+        assert response.status_code == 416
+        assert response.headers["content-range"] == "bytes */100"
+        assert response.headers["content-type"] == "application/problem+json"
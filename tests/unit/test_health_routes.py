@@ -0,0 +1,151 @@
+"""
+Unit tests for health check probe caching.
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.api import health_routes
+from app.api.health_routes import cached_health_check, determine_overall_status, run_health_checks
+from app.models import HealthStatus, ServiceHealthCheck
+
+
+def _healthy(name: str) -> ServiceHealthCheck:
+    return ServiceHealthCheck(
+        name=name,
+        status=HealthStatus.HEALTHY,
+        response_time_ms=1.0,
+        error_message=None,
+        last_check=datetime.now()
+    )
+
+
+class TestCachedHealthCheck:
+    """Test cases for the per-probe TTL cache."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        health_routes._health_cache.clear()
+        health_routes._health_cache_locks.clear()
+        yield
+        health_routes._health_cache.clear()
+        health_routes._health_cache_locks.clear()
+
+    def _counting_probe(self, name: str, delay: float = 0.0):
+        calls = []
+
+        async def check(service_name, now=None) -> ServiceHealthCheck:
+            calls.append(1)
+            await asyncio.sleep(delay)
+            return _healthy(service_name)
+
+        cached = cached_health_check(check)
+
+        def probe(**kwargs):
+            return cached(name, **kwargs)
+
+        return probe, calls
+
+    def test_result_reused_within_ttl(self):
+        probe, calls = self._counting_probe("storage")
+
+        async def run():
+            first = await probe()
+            second = await probe()
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert first is second
+        assert len(calls) == 1
+
+    def test_concurrent_callers_share_one_call(self):
+        probe, calls = self._counting_probe("auth", delay=0.01)
+
+        async def run():
+            return await asyncio.gather(*(probe() for _ in range(5)))
+
+        results = asyncio.run(run())
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+
+    def test_refresh_bypasses_cache(self):
+        probe, calls = self._counting_probe("ocr")
+
+        async def run():
+            await probe()
+            await probe(refresh=True)
+
+        asyncio.run(run())
+        assert len(calls) == 2
+
+    def test_raising_probe_reported_unhealthy(self, monkeypatch):
+        async def probe_broken() -> None:
+            raise RuntimeError("connection refused")
+
+        monkeypatch.setitem(health_routes.HEALTH_PROBES, "broken_service", (probe_broken, "Broken service"))
+
+        checks = asyncio.run(run_health_checks(["broken_service"]))
+        assert checks[0].name == "broken_service"
+        assert checks[0].status == HealthStatus.UNHEALTHY
+        assert "connection refused" in checks[0].error_message
+
+
+class TestDetermineOverallStatus:
+    """Test cases for overall status aggregation."""
+
+    def _check(self, name: str, status: HealthStatus) -> ServiceHealthCheck:
+        check = _healthy(name)
+        check.status = status
+        return check
+
+    def test_critical_unhealthy_is_unhealthy(self):
+        dependencies = [
+            self._check("aws_s3_storage", HealthStatus.UNHEALTHY),
+            self._check("mistral_ai_ocr", HealthStatus.HEALTHY),
+            self._check("external_auth_service", HealthStatus.HEALTHY)
+        ]
+        assert determine_overall_status(dependencies) == HealthStatus.UNHEALTHY
+
+    def test_non_critical_unhealthy_is_degraded(self):
+        dependencies = [
+            self._check("aws_s3_storage", HealthStatus.HEALTHY),
+            self._check("mistral_ai_ocr", HealthStatus.UNHEALTHY),
+            self._check("external_auth_service", HealthStatus.HEALTHY)
+        ]
+        assert determine_overall_status(dependencies) == HealthStatus.DEGRADED
+
+    def test_all_healthy(self):
+        dependencies = [self._check("mistral_ai_ocr", HealthStatus.HEALTHY)]
+        assert determine_overall_status(dependencies) == HealthStatus.HEALTHY
+
+
+class TestLivenessProbe:
+    """Test cases for the pre-encoded liveness response."""
+
+    def test_body_is_valid_json(self):
+        import json
+
+        response = asyncio.run(health_routes.liveness_probe())
+        body = json.loads(response.body)
+        assert response.media_type == "application/json"
+        assert body["status"] == "alive"
+        assert datetime.fromisoformat(body["timestamp"])
+        assert body["uptime_seconds"] >= 0
+
+
+class TestProbeTimeout:
+    """Test cases for per-probe timeouts."""
+
+    def test_slow_probe_reported_unhealthy(self, monkeypatch):
+        async def probe_hung() -> None:
+            await asyncio.sleep(10)
+
+        settings = health_routes.get_settings()
+        monkeypatch.setitem(health_routes.HEALTH_PROBES, "hung_service", (probe_hung, "Hung service"))
+        monkeypatch.setitem(settings.HEALTH_PROBE_TIMEOUTS, "hung_service", 0.01)
+
+        checks = asyncio.run(run_health_checks(["hung_service"], refresh=True))
+        assert checks[0].status == HealthStatus.UNHEALTHY
+        assert "timed out" in checks[0].error_message
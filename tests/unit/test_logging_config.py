@@ -0,0 +1,187 @@
+"""
+Unit tests for structured logging configuration.
+"""
+
+import asyncio
+import functools
+import logging
+import uuid
+from decimal import Decimal
+
+import orjson
+import pytest
+
+from app.core.logging_config import (
+    JSONFormatter, RequestContextFilter, SensitiveDataFilter, log_function_call, request_id_var
+)
+
+
+class TestJSONFormatter:
+    """Test cases for JSON log record formatting."""
+
+    def _record(self, **extra):
+        record = logging.LogRecord("app.test", logging.INFO, __file__, 10, "hello %s", ("world",), None)
+        record.__dict__.update(extra)
+        return record
+
+    def test_formats_message_and_utc_timestamp(self):
+        entry = orjson.loads(JSONFormatter().format(self._record()))
+
+        assert entry["message"] == "hello world"
+        assert entry["level"] == "INFO"
+        assert entry["timestamp"].endswith("Z")
+        assert "msg" not in entry and "args" not in entry
+
+    def test_extra_fields_fall_back_to_str(self):
+        job_id = uuid.uuid4()
+        entry = orjson.loads(JSONFormatter().format(self._record(job_id=job_id, handler=object)))
+
+        assert entry["job_id"] == str(job_id)
+        assert entry["handler"] == str(object)
+
+    def test_int_keys_and_big_ints_are_encoded(self):
+        entry = orjson.loads(JSONFormatter().format(self._record(by_status={200: 3}, big=2 ** 70)))
+
+        assert entry["by_status"] == {"200": 3}
+        assert entry["big"] == 2 ** 70
+
+    def test_extra_fields_use_type_encoders(self):
+        record = self._record(cost=Decimal("0.10"), raw=b"caf\xc3\xa9", tags=frozenset({"ocr"}))
+        entry = orjson.loads(JSONFormatter().format(record))
+
+        assert entry["cost"] == "0.10"
+        assert entry["raw"] == "caf\u00e9"
+        assert entry["tags"] == ["ocr"]
+
+
+class TestSensitiveDataFilter:
+    """Test cases for log message redaction."""
+
+    def _filtered(self, msg, *args):
+        record = logging.LogRecord("app.test", logging.INFO, __file__, 10, msg, args, None)
+        assert SensitiveDataFilter().filter(record)
+        return record
+
+    def test_redacts_secrets_and_emails_case_insensitively(self):
+        record = self._filtered("Token=%s sent to %s", "abc123", "ops@example.com")
+
+        assert record.getMessage() == "[REDACTED] sent to [REDACTED]"
+
+    def test_message_is_formatted_once(self):
+        record = self._filtered("Processed %d pages", 3)
+
+        assert record.msg == "Processed 3 pages"
+        assert record.args == ()
+        assert record.getMessage() == "Processed 3 pages"
+
+
+class TestUTCTimestamps:
+    """Test cases for the cached-second timestamp formatter."""
+
+    def test_matches_datetime_isoformat(self):
+        from datetime import datetime, timezone
+
+        from app.utils.date_utils import format_utc_timestamp
+
+        epoch = 1751976000.25
+        expected = datetime.fromtimestamp(epoch, timezone.utc).isoformat(timespec="microseconds")
+
+        assert format_utc_timestamp(epoch) == expected.replace("+00:00", "Z")
+
+
+class TestLogFunctionCall:
+    """Test cases for the call-timing decorator."""
+
+    def test_logs_duration_in_milliseconds(self, caplog):
+        @log_function_call
+        def add(a, b):
+            return a + b
+
+        with caplog.at_level(logging.DEBUG, logger=__name__):
+            assert add(1, 2) == 3
+
+        completed = [record for record in caplog.records if record.getMessage() == "Function add completed"]
+        assert completed and 0 <= completed[0].duration_ms < 1000
+
+    def test_wrapped_coroutine_stays_awaitable_and_failures_are_logged(self, caplog):
+        async def fail():
+            raise ValueError("boom")
+
+        @log_function_call
+        @functools.wraps(fail)
+        async def wrapped():
+            return await fail()
+
+        with caplog.at_level(logging.ERROR, logger=__name__):
+            with pytest.raises(ValueError):
+                asyncio.run(wrapped())
+
+        assert [record.getMessage() for record in caplog.records] == ["Function fail failed"]
+
+
+class TestSetupLogging:
+    """Test cases for handler configuration."""
+
+    def test_handlers_share_filters_and_formatter(self, tmp_path):
+        from app.core.logging_config import setup_logging
+
+        root = logging.getLogger()
+        saved_handlers, saved_level = root.handlers[:], root.level
+        try:
+            setup_logging(json_format=True, log_file=str(tmp_path / "logs" / "app.log"))
+            console, file = root.handlers
+
+            assert console.formatter is file.formatter
+            assert [id(f) for f in console.filters] == [id(f) for f in file.filters]
+        finally:
+            for handler in root.handlers:
+                handler.close()
+            root.handlers[:] = saved_handlers
+            root.setLevel(saved_level)
+
+
+class TestRequestContextFilter:
+    """Test cases for context-variable request correlation."""
+
+    def _filtered(self, **extra):
+        record = logging.LogRecord("app.test", logging.INFO, __file__, 10, "hello", (), None)
+        record.__dict__.update(extra)
+        RequestContextFilter().filter(record)
+        return record
+
+    def test_reads_request_id_from_context(self):
+        assert self._filtered().request_id == "unknown"
+
+        token = request_id_var.set("req-1")
+        try:
+            record = self._filtered()
+        finally:
+            request_id_var.reset(token)
+
+        assert record.request_id == "req-1"
+        assert record.user_id == "anonymous"
+
+    def test_explicit_extra_wins(self):
+        token = request_id_var.set("req-1")
+        try:
+            record = self._filtered(request_id="req-2")
+        finally:
+            request_id_var.reset(token)
+
+        assert record.request_id == "req-2"
+
+
+class TestDomainLoggers:
+    """Test cases for level-gated logging helpers."""
+
+    def test_helpers_skip_disabled_levels(self, caplog):
+        from app.core.logging_config import BusinessLogger, SecurityLogger
+
+        business = BusinessLogger("tests.business")
+        security = SecurityLogger("tests.security")
+
+        with caplog.at_level(logging.WARNING, logger="tests"):
+            business.log_ocr_job("job-1", "doc-1", "user-1", "completed")
+            security.log_access_denied("user-1", "doc-1", "read", "10.0.0.1", "not owner")
+
+        assert [record.getMessage() for record in caplog.records] == ["Access denied"]
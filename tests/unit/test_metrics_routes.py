@@ -0,0 +1,123 @@
+"""
+Unit tests for in-memory metrics collection.
+"""
+
+import asyncio
+import threading
+from array import array
+from collections import OrderedDict
+
+import pytest
+
+from app.api import metrics_routes
+from app.api.metrics_routes import StripedCounter
+
+
+class TestStripedCounter:
+    """Test cases for the per-thread striped counter."""
+
+    def test_more_threads_than_cells_lose_no_updates(self):
+        counter = StripedCounter()
+        barrier = threading.Barrier(32)
+
+        def work():
+            barrier.wait()
+            for _ in range(2000):
+                counter.increment()
+
+        threads = [threading.Thread(target=work) for _ in range(32)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert counter.value == 64000
+        assert len(counter._cells) == 32
+
+    def test_counts_across_threads(self):
+        counter = StripedCounter()
+
+        def work():
+            for _ in range(1000):
+                counter.increment()
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert counter.value == 4000
+
+
+class TestBufferedRequestMetrics:
+    """Test cases for per-thread request buffering."""
+
+    def test_records_from_exited_threads_are_flushed(self):
+        before = metrics_routes.metrics_store["requests_total"].value
+        errors_before = metrics_routes.metrics_store["errors_total"].value
+
+        def work():
+            metrics_routes.record_request("/documents", 200, 5.0)
+            metrics_routes.record_request("/documents", 500, 7.0)
+
+        threads = [threading.Thread(target=work) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        metrics_routes.flush_request_metrics()
+        assert metrics_routes.metrics_store["requests_total"].value == before + 6
+        assert metrics_routes.metrics_store["errors_total"].value == errors_before + 3
+        assert all(thread not in dict(metrics_routes._request_buffers) for thread in threads)
+
+
+class TestResponseTimeWindow:
+    """Test cases for the response time ring buffer."""
+
+    @pytest.fixture(autouse=True)
+    def empty_window(self, monkeypatch):
+        window = metrics_routes.RESPONSE_TIME_WINDOW
+        monkeypatch.setitem(metrics_routes.metrics_store, "response_times", array("d", bytes(8 * window)))
+        monkeypatch.setitem(metrics_routes.metrics_store, "response_time_count", 0)
+        monkeypatch.setitem(metrics_routes.metrics_store, "response_time_sum", 0.0)
+
+    def test_average_and_percentiles_cover_last_window(self):
+        window = metrics_routes.RESPONSE_TIME_WINDOW
+        for response_time in range(window + 500):
+            metrics_routes.update_request_metrics("/documents", 200, float(response_time))
+
+        metrics = metrics_routes.calculate_metrics()
+        assert metrics["average_response_time_ms"] == pytest.approx(500 + (window - 1) / 2)
+        assert metrics["p50_response_time_ms"] == 500 + window // 2 - 1
+        assert metrics["p99_response_time_ms"] == 500 + window * 99 // 100 - 1
+
+    def test_percentiles_are_nearest_rank(self):
+        for response_time in range(1, 101):
+            metrics_routes.update_request_metrics("/documents", 200, float(response_time))
+
+        metrics = metrics_routes.calculate_metrics()
+        assert metrics["p50_response_time_ms"] == 50
+        assert metrics["p95_response_time_ms"] == 95
+        assert metrics["p99_response_time_ms"] == 99
+
+    def test_empty_window_reports_zero(self):
+        metrics = metrics_routes.calculate_metrics()
+        assert metrics["average_response_time_ms"] == 0.0
+        assert metrics["p95_response_time_ms"] == 0.0
+
+
+class TestEndpointTracking:
+    """Test cases for the bounded per-endpoint counters."""
+
+    def test_least_recent_endpoint_evicted_into_other(self, monkeypatch):
+        monkeypatch.setattr(metrics_routes, "MAX_TRACKED_ENDPOINTS", 2)
+        monkeypatch.setitem(metrics_routes.metrics_store, "requests_by_endpoint", OrderedDict())
+        monkeypatch.setitem(metrics_routes.metrics_store, "requests_by_endpoint_other", 0)
+
+        for endpoint in ("/a", "/a", "/b", "/a", "/c"):
+            metrics_routes.update_request_metrics(endpoint, 200, 1.0)
+
+        metrics = asyncio.run(metrics_routes.get_document_metrics())
+        assert metrics["requests_by_endpoint"] == {"/a": 3, "/c": 1, "other": 1}
@@ -0,0 +1,232 @@
+"""
+Unit tests for the OCR job queue producer.
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.core.config import settings
+from app.core.exceptions import ValidationError
+from app.services.document_service import DocumentService
+from app.services.ocr_queue_service import OCR_JOB_KEY_PREFIX, OCRQueueService, new_ids
+
+
+class FakePipeline:
+    def __init__(self, redis_client):
+        self.redis = redis_client
+        self.store = redis_client.store
+        self.commands = []
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        self.commands.append(("hset", key, mapping if mapping is not None else (field, value)))
+
+    def expire(self, key, seconds):
+        self.commands.append(("expire", key, seconds))
+
+    def lpush(self, name, *values):
+        self.commands.append(("lpush", name, values))
+
+    def zadd(self, key, mapping):
+        self.commands.append(("zadd", key, mapping))
+
+    def zremrangebylex(self, key, min, max):
+        self.commands.append(("zremrangebylex", key, (min, max)))
+
+    def hgetall(self, key):
+        self.commands.append(("hgetall", key, None))
+
+    def incrby(self, key, amount):
+        self.commands.append(("incrby", key, amount))
+
+    def incr(self, key):
+        self.commands.append(("incrby", key, 1))
+
+    def decr(self, key):
+        self.commands.append(("incrby", key, -1))
+
+    async def execute(self):
+        results = []
+        for command, key, value in self.commands:
+            if command == "hset" and isinstance(value, tuple):
+                self.store.setdefault(key, {})[value[0]] = value[1]
+            elif command == "hset":
+                self.store[key] = {k: str(v) for k, v in value.items()}
+            elif command == "lpush":
+                self.store.setdefault(key, []).extend(value)
+            elif command == "zadd":
+                self.store.setdefault(key, set()).update(value)
+            elif command == "incrby":
+                self.store[key] = str(int(self.store.get(key, 0)) + value)
+            elif command == "hgetall":
+                results.append(await self.redis.hgetall(key))
+        return results
+
+
+def _in_range(member, low, high):
+    def above(bound):
+        return bound == "-" or (member > bound[1:] if bound[0] == "(" else member >= bound)
+
+    def below(bound):
+        return bound == "+" or (member < bound[1:] if bound[0] == "(" else member <= bound)
+
+    return above(low) and below(high)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def hgetall(self, key):
+        return self.store.get(key, {})
+
+    async def zrangebylex(self, key, min, max, start=0, num=None):
+        members = sorted(m for m in self.store.get(key, ()) if _in_range(m, min, max))
+        return members[start:start + num]
+
+    async def zrevrangebylex(self, key, max, min, start=0, num=None):
+        members = sorted((m for m in self.store.get(key, ()) if _in_range(m, min, max)), reverse=True)
+        return members[start:start + num]
+
+    async def mget(self, *keys):
+        return [self.store.get(key) for key in keys]
+
+    async def zcard(self, key):
+        return len(self.store.get(key, ()))
+
+
+class TestNewIds:
+    """Test cases for job id generation."""
+
+    def test_ids_round_trip_through_uuid(self):
+        ids = new_ids(3)
+
+        assert len(set(ids)) == 3
+        assert all(uuid.UUID(job_id).hex == job_id for job_id in ids)
+
+
+class TestOCRQueueService:
+    """Test cases for OCR job queueing."""
+
+    def test_enqueue_records_and_queues_each_job(self):
+        redis_client = FakeRedis()
+        service = OCRQueueService(redis_client)
+
+        jobs = asyncio.run(service.enqueue_jobs(["doc-1", "doc-2"], "user-1", priority=2))
+
+        assert [job["document_id"] for job in jobs] == ["doc-1", "doc-2"]
+        queued = [json.loads(payload) for payload in redis_client.store[settings.OCR_QUEUE_NAME]]
+        assert [job["job_id"] for job in queued] == [job["job_id"] for job in jobs]
+        assert redis_client.store[OCR_JOB_KEY_PREFIX + jobs[0]["job_id"]]["status"] == "pending"
+
+    def test_unknown_job_is_none(self):
+        service = OCRQueueService(FakeRedis())
+        assert asyncio.run(service.get_job("missing")) is None
+
+    def test_batch_queues_one_job_per_chunk(self, monkeypatch):
+        monkeypatch.setitem(settings.__dict__, "OCR_BATCH_SIZE", 10)
+        redis_client = FakeRedis()
+        service = OCRQueueService(redis_client)
+
+        batch = asyncio.run(service.enqueue_batch([f"doc-{i}" for i in range(25)]))
+
+        assert batch["chunk_count"] == 3
+        assert batch["document_count"] == 25
+        queued = [json.loads(payload) for payload in redis_client.store[settings.OCR_QUEUE_NAME]]
+        assert [len(json.loads(job["document_ids"])) for job in queued] == [10, 10, 5]
+
+    def test_user_jobs_paginate_by_cursor(self):
+        service = OCRQueueService(FakeRedis())
+        jobs = asyncio.run(service.enqueue_jobs([f"doc-{i}" for i in range(5)], "user-1"))
+
+        first = asyncio.run(service.list_user_jobs("user-1", limit=2))
+        second = asyncio.run(service.list_user_jobs("user-1", limit=2, cursor=first["next_cursor"]))
+        last = asyncio.run(service.list_user_jobs("user-1", limit=2, cursor=second["next_cursor"]))
+
+        listed = [job["job_id"] for page in (first, second, last) for job in page["jobs"]]
+        assert sorted(listed) == sorted(job["job_id"] for job in jobs)
+        assert len(set(listed)) == 5
+        assert first["total_count"] == 5
+        assert last["next_cursor"] is None
+
+    def test_user_jobs_status_filter_fills_page(self):
+        redis_client = FakeRedis()
+        service = OCRQueueService(redis_client)
+        jobs = asyncio.run(service.enqueue_jobs([f"doc-{i}" for i in range(6)], "user-1"))
+        for job in jobs[::2]:
+            redis_client.store[OCR_JOB_KEY_PREFIX + job["job_id"]]["status"] = "completed"
+
+        page = asyncio.run(service.list_user_jobs("user-1", limit=3, status="completed"))
+
+        assert len(page["jobs"]) == 3
+        assert page["next_cursor"] is None
+        assert page["total_count"] is None
+
+    def test_cursor_for_other_sort_order_rejected(self):
+        service = OCRQueueService(FakeRedis())
+        asyncio.run(service.enqueue_jobs(["doc-1", "doc-2"], "user-1"))
+        page = asyncio.run(service.list_user_jobs("user-1", limit=1))
+
+        with pytest.raises(ValidationError):
+            asyncio.run(service.list_user_jobs("user-1", limit=1, cursor=page["next_cursor"], sort_order="asc"))
+
+    def test_queue_stats_follow_job_lifecycle(self, monkeypatch):
+        redis_client = FakeRedis()
+        service = OCRQueueService(redis_client)
+        jobs = asyncio.run(service.enqueue_jobs(["doc-1", "doc-2", "doc-3"]))
+
+        asyncio.run(service.record_job_started(jobs[0]["job_id"]))
+        asyncio.run(service.record_job_finished(jobs[0]["job_id"]))
+        asyncio.run(service.record_job_started(jobs[1]["job_id"]))
+
+        # Read the stats as of the following minute so the completion counts
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + 60)
+        stats = asyncio.run(service.get_queue_stats())
+
+        assert stats["pending"] == 1
+        assert stats["running"] == 1
+        assert stats["completed_last_minute"] == 1
+        assert stats["estimated_wait_minutes"] == 1.0
+        assert redis_client.store[OCR_JOB_KEY_PREFIX + jobs[0]["job_id"]]["status"] == "completed"
+
+
+class TestUploadTriggeredJobs:
+    """Test cases for OCR jobs queued by document uploads."""
+
+    def _enqueue(self, redis_client, document_ids):
+        service = DocumentService(task_queue=redis_client)
+        return asyncio.run(service._enqueue_ocr_jobs(document_ids, "user-1"))
+
+    def test_upload_jobs_are_visible_through_the_queue_api(self):
+        redis_client = FakeRedis()
+        job_ids = self._enqueue(redis_client, ["doc-1", "doc-2"])
+        service = OCRQueueService(redis_client)
+
+        job = asyncio.run(service.get_job(job_ids["doc-1"]))
+        listed = asyncio.run(service.list_user_jobs("user-1"))
+
+        assert job["document_id"] == "doc-1"
+        assert {job["job_id"] for job in listed["jobs"]} == set(job_ids.values())
+
+    def test_upload_jobs_count_toward_queue_stats(self):
+        async def content():
+            yield b"%PDF-1.4 body"
+
+        redis_client = FakeRedis()
+        storage = AsyncMock()
+        storage.upload_stream.return_value = {"file_id": "uploads/a.pdf", "size": 1024, "file_hash": "abc"}
+        service = DocumentService(storage_service=storage, task_queue=redis_client)
+        service._get_user_storage_usage = AsyncMock(return_value=0)
+
+        asyncio.run(service.upload_document(content(), "a.pdf", "user-1", "application/pdf"))
+        stats = asyncio.run(OCRQueueService(redis_client).get_queue_stats())
+
+        assert stats["pending"] == 1
@@ -0,0 +1,212 @@
+"""
+Unit tests for OCR route handlers.
+"""
+
+import asyncio
+import uuid
+
+import orjson
+import pytest
+from fastapi import FastAPI
+from starlette.requests import Request
+
+from app.api import ocr_routes
+from app.core.exceptions import OCRJobNotFoundError, RateLimitExceededError
+from app.services.rate_limit_service import RateLimitService
+
+
+class TestStaticCatalogResponses:
+    """Test cases for the pre-serialized models and languages payloads."""
+
+    def test_models_served_with_etag(self):
+        response = ocr_routes.list_ocr_models(if_none_match=None)
+
+        assert response.status_code == 200
+        assert response.headers["etag"] == ocr_routes._MODELS_ETAG
+        assert orjson.loads(response.body)["models"][0]["id"] == "mistral-ocr-standard"
+
+    def test_languages_not_modified_on_matching_etag(self):
+        response = ocr_routes.list_supported_languages(if_none_match=ocr_routes._LANGS_ETAG)
+
+        assert response.status_code == 304
+        assert response.body == b""
+        assert response.headers["etag"] == ocr_routes._LANGS_ETAG
+
+    def test_stale_etag_gets_full_body(self):
+        response = ocr_routes.list_supported_languages(if_none_match='"stale"')
+
+        assert response.status_code == 200
+        assert response.body == ocr_routes._LANGS_BYTES
+
+
+class FakeResultCache:
+    def __init__(self):
+        self.store = {}
+        self.invalidated = []
+
+    async def lookup(self, document_id, variant):
+        return self.store.get((document_id, variant)), self.store.get((document_id, "tag"))
+
+    async def get_result_tag(self, document_id):
+        return self.store.setdefault((document_id, "tag"), "tag-1")
+
+    async def set(self, document_id, variant, body):
+        self.store[(document_id, variant)] = body
+
+    async def invalidate(self, *document_ids):
+        self.invalidated.extend(document_ids)
+
+
+class FakeQueue:
+    def __init__(self, job):
+        self.job = job
+
+    async def get_job(self, job_id):
+        return self.job
+
+
+class TestOCRResultCaching:
+    """Test cases for cached OCR result responses."""
+
+    def _get_results(self, cache, document_id, format="json", if_none_match=None):
+        async def fetch():
+            response = await ocr_routes.get_ocr_results(
+                cache, document_id, format=format, include_confidence=True,
+                include_tables=False, include_images=False, if_none_match=if_none_match
+            )
+            if hasattr(response, "body_iterator"):
+                return response, b"".join([part async for part in response.body_iterator])
+            return response, response.body
+
+        return asyncio.run(fetch())
+
+    def test_miss_streams_and_caches_body_and_hit_serves_it(self):
+        cache = FakeResultCache()
+        document_id = uuid.uuid4()
+
+        _, first = self._get_results(cache, document_id)
+        assert cache.store[(str(document_id), "json:1:0:0")] == first
+
+        cache.store[(str(document_id), "json:1:0:0")] = b'{"cached":true}'
+        _, second = self._get_results(cache, document_id)
+
+        result = orjson.loads(first)
+        assert result["document_id"] == str(document_id)
+        assert result["text_content"] == "Sample OCR text content..."
+        assert second == b'{"cached":true}'
+
+    def test_txt_streams_raw_text(self):
+        response, body = self._get_results(FakeResultCache(), uuid.uuid4(), format="txt")
+
+        assert response.media_type.startswith("text/plain")
+        assert body == b"Sample OCR text content..."
+
+    def test_large_body_not_cached(self, monkeypatch):
+        monkeypatch.setitem(ocr_routes.settings.__dict__, "OCR_RESULT_CACHE_MAX_BYTES", 10)
+        cache = FakeResultCache()
+
+        document_id = uuid.uuid4()
+        self._get_results(cache, document_id)
+
+        assert (str(document_id), "json:1:0:0") not in cache.store
+
+    def test_completed_result_is_immutable_and_revalidates(self):
+        cache = FakeResultCache()
+        document_id = uuid.uuid4()
+
+        first, _ = self._get_results(cache, document_id)
+        etag = first.headers["etag"]
+        revalidated, body = self._get_results(cache, document_id, if_none_match=etag)
+
+        assert "immutable" in first.headers["cache-control"]
+        assert revalidated.status_code == 304
+        assert body == b""
+        assert revalidated.headers["etag"] == etag
+
+    def test_retry_invalidates_batch_documents(self):
+        cache = FakeResultCache()
+        queue = FakeQueue({"job_id": "job-1", "document_ids": '["doc-1", "doc-2"]'})
+
+        asyncio.run(ocr_routes.retry_ocr_job(queue, cache, uuid.uuid4()))
+
+        assert cache.invalidated == ["doc-1", "doc-2"]
+
+    def test_retry_unknown_job_raises(self):
+        with pytest.raises(OCRJobNotFoundError):
+            asyncio.run(ocr_routes.retry_ocr_job(FakeQueue(None), FakeResultCache(), uuid.uuid4()))
+
+
+class TestStreamOCRJson:
+    """Test cases for incremental JSON encoding of OCR text."""
+
+    def test_split_multibyte_characters_and_escapes(self):
+        text = 'caf\u00e9 "quoted"\n\u4e2d\u6587'.encode("utf-8")
+
+        async def chunks():
+            for i in range(0, len(text), 3):
+                yield text[i:i + 3]
+
+        async def collect():
+            return b"".join([part async for part in ocr_routes._stream_ocr_json({"status": "completed"}, chunks())])
+
+        result = orjson.loads(asyncio.run(collect()))
+        assert result == {"status": "completed", "text_content": text.decode("utf-8")}
+
+
+class TestOCRQuota:
+    """Test cases for the OCR rate limit dependency."""
+
+    def test_over_quota_raises_with_retry_after(self, monkeypatch):
+        monkeypatch.setitem(ocr_routes.settings.__dict__, "OCR_RATE_LIMIT_PER_HOUR", 1)
+        limiter = RateLimitService()
+        request = Request({"type": "http", "path": "/ocr/batch", "headers": [], "client": ("10.0.0.1", 1234)})
+
+        asyncio.run(ocr_routes.check_ocr_quota(request, limiter))
+        with pytest.raises(RateLimitExceededError) as exc_info:
+            asyncio.run(ocr_routes.check_ocr_quota(request, limiter))
+
+        assert exc_info.value.status_code == 429
+        assert 0 < exc_info.value.extra_data["retry_after"] <= 3600
+
+    def test_batch_is_charged_per_document(self, monkeypatch):
+        monkeypatch.setitem(ocr_routes.settings.__dict__, "OCR_RATE_LIMIT_PER_HOUR", 5)
+        limiter = RateLimitService()
+        request = Request({"type": "http", "path": "/ocr/batch", "headers": [], "client": ("10.0.0.1", 1234)})
+
+        asyncio.run(ocr_routes.charge_ocr_quota(request, limiter, cost=3))
+        with pytest.raises(RateLimitExceededError):
+            asyncio.run(ocr_routes.charge_ocr_quota(request, limiter, cost=3))
+
+
+class TestCancelOCRJob:
+    """Test cases for the cancel endpoint's response."""
+
+    def test_returns_empty_no_content(self):
+        response = ocr_routes.cancel_ocr_job(uuid.uuid4())
+
+        assert response.status_code == 204
+        assert response.body == b""
+
+
+class TestRouterSplit:
+    """Test cases for the read/write router partition."""
+
+    def test_submissions_are_write_routes(self):
+        write = {(route.path, method) for route in ocr_routes.ocr_write_router.routes for method in route.methods}
+
+        assert write == {
+            ("/documents/{document_id}/process", "POST"),
+            ("/batch", "POST"),
+            ("/jobs/{job_id}", "DELETE"),
+            ("/jobs/{job_id}/retry", "POST"),
+        }
+
+    def test_combined_router_serves_all_routes(self):
+        app = FastAPI()
+        app.include_router(ocr_routes.router, prefix="/ocr")
+        served = {
+            (path, method.upper()) for path, operations in app.openapi()["paths"].items() for method in operations
+        }
+
+        routes = list(ocr_routes.ocr_write_router.routes) + list(ocr_routes.ocr_read_router.routes)
+        assert served == {("/ocr" + route.path, method) for route in routes for method in route.methods}
@@ -219,3 +219,49 @@ class TestOCRQualityService:
         """Test OCR issue detection."""
         # TODO: Test issue detection logic
         assert True  # Placeholder
+
+
+class TestMistralKeyRotation:
+    """Test cases for per-request Mistral authentication."""
+    
+    def test_rotated_key_reaches_next_request(self, monkeypatch):
+        """The shared client sends whatever key is current when a request is made."""
+        import asyncio
+        import httpx
+        from app.services import ocr_service
+        
+        seen = []
+        
+        def handler(request):
+            seen.append(request.headers["Authorization"])
+            return httpx.Response(200, json={})
+        
+        async def call_twice():
+            client = httpx.AsyncClient(auth=ocr_service._MistralKeyAuth(), transport=httpx.MockTransport(handler))
+            monkeypatch.setitem(ocr_service.settings.__dict__, "MISTRAL_API_KEY", "key-1")
+            await client.get("https://api.mistral.ai/v1/models")
+            monkeypatch.setitem(ocr_service.settings.__dict__, "MISTRAL_API_KEY", "key-2")
+            await client.get("https://api.mistral.ai/v1/models")
+            await client.aclose()
+        
+        asyncio.run(call_twice())
+        assert seen == ["Bearer key-1", "Bearer key-2"]
+    
+    def test_secrets_key_read_from_cache_and_fallback_logged_once(self, monkeypatch, caplog):
+        """An unloaded secrets cache falls back to the env key with a single warning."""
+        from types import SimpleNamespace
+        from app.services import ocr_service
+        
+        config = SimpleNamespace(cached_mistral_api_key=None)
+        monkeypatch.setattr(ocr_service, "get_config", lambda: config)
+        monkeypatch.setattr(ocr_service, "_warned_key_fallback", False)
+        monkeypatch.setitem(ocr_service.settings.__dict__, "ENABLE_AWS_SECRETS", True)
+        monkeypatch.setitem(ocr_service.settings.__dict__, "MISTRAL_API_KEY", "env-key")
+        
+        with caplog.at_level("WARNING", logger=ocr_service.__name__):
+            assert ocr_service._current_mistral_api_key() == "env-key"
+            assert ocr_service._current_mistral_api_key() == "env-key"
+        config.cached_mistral_api_key = "rotated-key"
+        
+        assert ocr_service._current_mistral_api_key() == "rotated-key"
+        assert len(caplog.records) == 1
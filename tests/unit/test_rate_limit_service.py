@@ -0,0 +1,39 @@
+"""
+Unit tests for the fixed-window rate limiter.
+"""
+
+import asyncio
+
+from app.services.rate_limit_service import RateLimitService
+
+
+class TestMemoryRateLimit:
+    """Test cases for per-worker in-memory windows."""
+
+    def test_allows_up_to_limit_then_reports_wait(self):
+        limiter = RateLimitService()
+
+        async def hits():
+            return [await limiter.hit("user-1", limit=2, window_seconds=60) for _ in range(3)]
+
+        first, second, third = asyncio.run(hits())
+        assert first == 0 and second == 0
+        assert 0 < third <= 60
+
+    def test_keys_are_counted_separately(self):
+        limiter = RateLimitService()
+
+        async def hits():
+            await limiter.hit("user-1", limit=1, window_seconds=60)
+            return await limiter.hit("user-2", limit=1, window_seconds=60)
+
+        assert asyncio.run(hits()) == 0
+
+    def test_window_resets(self):
+        limiter = RateLimitService()
+
+        async def hits():
+            await limiter.hit("user-1", limit=1, window_seconds=0)
+            return await limiter.hit("user-1", limit=1, window_seconds=0)
+
+        assert asyncio.run(hits()) == 0
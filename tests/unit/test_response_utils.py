@@ -0,0 +1,145 @@
+"""
+Unit tests for response utility functions.
+"""
+
+import base64
+import pytest
+from datetime import datetime
+
+from app.utils.response_utils import (
+    encode_cursor, decode_cursor, build_next_link_header, compute_etag, etag_matches,
+    parse_range_header, format_http_date, not_modified_since
+)
+
+
+class TestPaginationCursor:
+    """Test cases for keyset pagination cursors."""
+    
+    def test_cursor_round_trip(self):
+        """Test that a cursor decodes to the sort key it was built from."""
+        cursor = encode_cursor("created_at", "desc", datetime(2025, 7, 9, 12, 0, 0), "doc-1")
+        
+        assert decode_cursor(cursor) == ("created_at", "desc", "2025-07-09T12:00:00", "doc-1")
+    
+    def test_cursor_is_url_safe(self):
+        """Test that cursors need no URL escaping."""
+        cursor = encode_cursor("file_name", "asc", "a/b+c?", "doc-1")
+        
+        assert "=" not in cursor
+        assert "+" not in cursor
+        assert "/" not in cursor
+    
+    def test_malformed_cursor_rejected(self):
+        """Test that garbage cursors raise ValueError."""
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+    
+    def test_tampered_cursor_rejected(self):
+        """Test that editing the payload invalidates the signature."""
+        cursor = encode_cursor("created_at", "desc", "2025-07-09T12:00:00", "doc-1")
+        token = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        forged = token.replace(b"doc-1", b"doc-9")
+        
+        with pytest.raises(ValueError, match="signature"):
+            decode_cursor(base64.urlsafe_b64encode(forged).decode("ascii"))
+    
+    def test_cursor_from_other_secret_rejected(self):
+        """Test that cursors signed with a different key do not verify."""
+        cursor = encode_cursor("created_at", "desc", "2025-07-09T12:00:00", "doc-1", secret="other")
+        
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+    
+    def test_next_link_replaces_page_and_cursor(self):
+        """Test that the Link header drops page/cursor and appends the next cursor."""
+        link = build_next_link_header(
+            "http://testserver/documents/?page=3&cursor=old&page_size=5", "next"
+        )
+        
+        assert link == '<http://testserver/documents/?page_size=5&cursor=next>; rel="next"'
+
+
+class TestETag:
+    """Test cases for ETag helpers."""
+    
+    def test_etag_changes_with_version(self):
+        """Test that a version bump produces a different ETag."""
+        updated_at = datetime(2025, 7, 9, 12, 0, 0)
+        
+        assert compute_etag(updated_at, 1) != compute_etag(updated_at, 2)
+        assert compute_etag(updated_at, 1).startswith('W/"')
+    
+    def test_if_none_match_weak_comparison(self):
+        """Test that weak and strong forms of the same tag match."""
+        etag = compute_etag(b"thumbnail", weak=False)
+        
+        assert etag_matches(f"W/{etag}", etag)
+        assert etag_matches(f'"other", {etag}', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"other"', etag)
+        assert not etag_matches(None, etag)
+    
+    def test_if_match_strong_comparison(self):
+        """Test that If-Match never matches weak validators."""
+        etag = compute_etag(b"document", weak=False)
+        
+        assert etag_matches(f'"other", {etag}', etag, weak=False)
+        assert etag_matches("*", etag, weak=False)
+        assert not etag_matches(f"W/{etag}", etag, weak=False)
+        assert not etag_matches(f"W/{etag}", f"W/{etag}", weak=False)
+
+
+class TestRangeHeader:
+    """Test cases for Range header parsing."""
+    
+    def test_explicit_open_and_suffix_ranges(self):
+        """Test the three single-range forms."""
+        assert parse_range_header("bytes=0-99", 1000) == (0, 99)
+        assert parse_range_header("bytes=900-", 1000) == (900, 999)
+        assert parse_range_header("bytes=-100", 1000) == (900, 999)
+    
+    def test_end_clamped_to_file_size(self):
+        """Test that an end past EOF is clamped."""
+        assert parse_range_header("bytes=500-5000", 1000) == (500, 999)
+    
+    def test_unusable_ranges_fall_back_to_full_content(self):
+        """Test that absent, non-byte and multi-range headers are ignored."""
+        assert parse_range_header(None, 1000) is None
+        assert parse_range_header("items=0-1", 1000) is None
+        assert parse_range_header("bytes=0-1,5-6", 1000) is None
+    
+    def test_unsatisfiable_range(self):
+        """Test that a start past EOF is rejected."""
+        with pytest.raises(ValueError):
+            parse_range_header("bytes=1000-", 1000)
+    
+    def test_malformed_range_is_ignored(self):
+        """Test that unparseable ranges serve the full content instead of 416."""
+        assert parse_range_header("bytes=abc", 1000) is None
+        assert parse_range_header("bytes=5-2", 1000) is None
+        assert parse_range_header("bytes=-", 1000) is None
+    
+    def test_suffix_range_on_empty_file_is_unsatisfiable(self):
+        """Test that no suffix range can be served from a 0-byte file."""
+        with pytest.raises(ValueError):
+            parse_range_header("bytes=-5", 0)
+
+
+class TestConditionalDates:
+    """Test cases for Last-Modified / If-Modified-Since helpers."""
+    
+    def test_format_http_date_treats_naive_as_utc(self):
+        assert format_http_date(datetime(2025, 7, 8, 12, 30, 5)) == "Tue, 08 Jul 2025 12:30:05 GMT"
+    
+    def test_not_modified_since_ignores_subsecond_precision(self):
+        last_modified = datetime(2025, 7, 8, 12, 30, 5, 750000)
+        assert not_modified_since("Tue, 08 Jul 2025 12:30:05 GMT", last_modified)
+    
+    def test_modified_after_header_date(self):
+        last_modified = datetime(2025, 7, 8, 12, 30, 6)
+        assert not not_modified_since("Tue, 08 Jul 2025 12:30:05 GMT", last_modified)
+    
+    def test_invalid_or_missing_header_is_ignored(self):
+        last_modified = datetime(2025, 7, 8, 12, 30, 5)
+        assert not not_modified_since("not a date", last_modified)
+        assert not not_modified_since(None, last_modified)
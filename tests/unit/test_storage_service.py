@@ -165,3 +165,96 @@ class TestS3StorageBackend:
         """Test S3 connection error handling."""
         # TODO: Test S3 connection failures
         assert True  # Placeholder
+
+
+class TestStreamingUpload:
+    """Test cases for chunked upload streaming."""
+    
+    class _FakeUpload:
+        def __init__(self, data: bytes):
+            self._buffer = io.BytesIO(data)
+        
+        async def read(self, size: int = -1) -> bytes:
+            return self._buffer.read(size)
+    
+    def test_store_stream_writes_chunks_and_hashes(self, tmp_path):
+        """Chunks are written incrementally and hashed in the same pass."""
+        import asyncio
+        import hashlib
+        from app.core.storage import LocalStorageBackend
+        from app.utils.file_utils import iter_upload_chunks
+        
+        data = b"%PDF-1.4" + b"x" * 5000
+        backend = LocalStorageBackend(str(tmp_path))
+        chunks = iter_upload_chunks(self._FakeUpload(data), chunk_size=1024)
+        
+        result = asyncio.run(backend.store_stream(chunks, "uploads/a.pdf", "application/pdf"))
+        
+        assert result["size"] == len(data)
+        assert result["file_hash"] == hashlib.sha256(data).hexdigest()
+        assert (tmp_path / "uploads" / "a.pdf").read_bytes() == data
+    
+    def test_oversized_stream_is_rejected_and_removed(self, tmp_path):
+        """Exceeding max_size aborts the write and leaves no partial file."""
+        import asyncio
+        from app.core.exceptions import FileTooLargeError
+        from app.core.storage import LocalStorageBackend
+        from app.utils.file_utils import iter_upload_chunks
+        
+        backend = LocalStorageBackend(str(tmp_path))
+        chunks = iter_upload_chunks(self._FakeUpload(b"x" * 4096), chunk_size=1024, max_size=2048)
+        
+        with pytest.raises(FileTooLargeError):
+            asyncio.run(backend.store_stream(chunks, "uploads/big.bin"))
+        assert not (tmp_path / "uploads" / "big.bin").exists()
+    
+    def test_oversized_stream_upload_keeps_file_too_large(self, tmp_path):
+        """A size error raised mid-stream is not rewrapped as a StorageError."""
+        import asyncio
+        from app.core.exceptions import FileTooLargeError
+        from app.core.storage import LocalStorageBackend
+        from app.services.storage_service import StorageService
+        from app.utils.file_utils import iter_upload_chunks
+        
+        service = StorageService(LocalStorageBackend(str(tmp_path)))
+        chunks = iter_upload_chunks(
+            self._FakeUpload(b"%PDF-1.4" + b"x" * 4096), chunk_size=1024, max_size=2048
+        )
+        
+        with pytest.raises(FileTooLargeError):
+            asyncio.run(service.upload_stream(chunks, "big.pdf", "application/pdf", "user-1"))
+    
+    def test_peek_stream_replays_first_chunk(self):
+        """The peeked chunk is yielded again ahead of the remainder."""
+        import asyncio
+        from app.utils.file_utils import iter_upload_chunks, peek_stream
+        
+        async def _collect():
+            head, chunks = await peek_stream(
+                iter_upload_chunks(self._FakeUpload(b"abcdef"), chunk_size=4)
+            )
+            return head, [chunk async for chunk in chunks]
+        
+        head, chunks = asyncio.run(_collect())
+        assert head == b"abcd"
+        assert chunks == [b"abcd", b"ef"]
+
+
+class TestThumbnails:
+    """Test cases for upload-time thumbnail rendering."""
+    
+    def test_generate_thumbnails_fits_each_size(self):
+        """Each size is a WebP whose longest edge fits the requested bound."""
+        from PIL import Image
+        from app.utils.file_utils import THUMBNAIL_SIZES, generate_thumbnails
+        
+        source = io.BytesIO()
+        Image.new("RGB", (2000, 1000), "white").save(source, format="PNG")
+        
+        thumbnails = generate_thumbnails(source.getvalue())
+        
+        assert set(thumbnails) == set(THUMBNAIL_SIZES)
+        for size, content in thumbnails.items():
+            with Image.open(io.BytesIO(content)) as img:
+                assert img.format == "WEBP"
+                assert max(img.size) == THUMBNAIL_SIZES[size]
@@ -0,0 +1,35 @@
+"""
+Unit tests for system metrics helpers.
+"""
+
+from app.utils import system_utils
+
+
+class TestMemoryUsage:
+    """Test cases for memory usage reads."""
+
+    def test_falls_back_to_psutil_without_proc_meminfo(self, monkeypatch):
+        monkeypatch.setattr(system_utils, "_read_proc_meminfo", lambda: None)
+
+        used, percent = system_utils.get_memory_usage()
+
+        assert used > 0
+        assert 0 < percent <= 100
+
+    def test_uses_proc_meminfo_when_available(self, monkeypatch):
+        monkeypatch.setattr(system_utils, "_read_proc_meminfo", lambda: (1000, 250))
+
+        assert system_utils.get_memory_usage() == (750, 75.0)
+
+
+class TestMetricsSnapshot:
+    """Test cases for the background system metrics snapshot."""
+
+    def test_empty_until_first_sample_without_collecting(self, monkeypatch):
+        def collect():
+            raise AssertionError("collected on the request path")
+
+        monkeypatch.setattr(system_utils, "_metrics_snapshot", {})
+        monkeypatch.setattr(system_utils, "collect_system_metrics", collect)
+
+        assert system_utils.get_system_metrics_snapshot() == system_utils.EMPTY_SYSTEM_METRICS